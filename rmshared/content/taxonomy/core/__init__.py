@@ -3,6 +3,7 @@ from rmshared.content.taxonomy.core import labels
 from rmshared.content.taxonomy.core import ranges
 from rmshared.content.taxonomy.core import fields
 from rmshared.content.taxonomy.core import events
+from rmshared.content.taxonomy.core import interning
 
 from rmshared.content.taxonomy.core import aliases
 
@@ -11,8 +12,17 @@ from rmshared.content.taxonomy.core import protocols
 
 from rmshared.content.taxonomy.core.abc import IEntity
 from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.abc import IOptimizer
+from rmshared.content.taxonomy.core.abc import IPercolator
+from rmshared.content.taxonomy.core.adaptive import AdaptiveMatcher
+from rmshared.content.taxonomy.core.bitsets import BitsetMatcher
+from rmshared.content.taxonomy.core.columns import Columns
+from rmshared.content.taxonomy.core.entities import CachedEntity
 from rmshared.content.taxonomy.core.fakes import Fakes
 from rmshared.content.taxonomy.core.matcher import Matcher
+from rmshared.content.taxonomy.core.optimizer import Optimizer
+from rmshared.content.taxonomy.core.percolator import Percolator
+from rmshared.content.taxonomy.core.tracing import TracingMatcher
 
 
 __all__ = (
@@ -21,14 +31,18 @@ __all__ = (
     'ranges',
     'fields',
     'events',
+    'interning',
 
     'aliases',
 
     'encoders',
     'protocols',
 
-    'IEntity',
-    'IMatcher', 'Matcher',
+    'IEntity', 'CachedEntity',
+    'IMatcher', 'Matcher', 'AdaptiveMatcher', 'BitsetMatcher', 'TracingMatcher',
+    'IOptimizer', 'Optimizer',
+    'IPercolator', 'Percolator',
+    'Columns',
 
     'Fakes',
 )
@@ -3,8 +3,11 @@ from __future__ import annotations
 from abc import ABCMeta
 from abc import abstractmethod
 from typing import AbstractSet
+from typing import Callable
 from typing import Generic
+from typing import Hashable
 from typing import Iterable
+from typing import Sequence
 from typing import TypeVar
 
 from rmshared.content.taxonomy.core import fields
@@ -16,6 +19,7 @@ Range = TypeVar('Range')
 Field = TypeVar('Field')
 Event = TypeVar('Event')
 Value = TypeVar('Value')
+Key = TypeVar('Key', bound=Hashable)
 
 
 class IEntity(Generic[Value], metaclass=ABCMeta):
@@ -28,3 +32,43 @@ class IMatcher(metaclass=ABCMeta):
     @abstractmethod
     def does_entity_match_filters(self, entity: IEntity, filters_: Iterable[filters.Filter]) -> bool:
         ...
+
+    def compile(self, filters_: Iterable[filters.Filter]) -> Callable[[IEntity], bool]:
+        """
+        Override where the filters can be prepared once for matching many entities.
+        """
+        filters_ = tuple(filters_)
+        return lambda entity: self.does_entity_match_filters(entity, filters_)
+
+    def match_many(self, entities: Iterable[IEntity], filters_: Iterable[filters.Filter]) -> Sequence[bool]:
+        """
+        Override where many entities can be matched at once cheaper than one by one.
+        """
+        return list(map(self.compile(filters_), entities))
+
+    def match_many_as_bitmap(self, entities: Iterable[IEntity], filters_: Iterable[filters.Filter]) -> int:
+        bitmap = 0
+        for index, does_entity_match_filters in enumerate(self.match_many(entities, filters_)):
+            if does_entity_match_filters:
+                bitmap |= 1 << index
+        return bitmap
+
+
+class IOptimizer(metaclass=ABCMeta):
+    @abstractmethod
+    def optimize_filters(self, filters_: Iterable[filters.Filter]) -> Sequence[filters.Filter]:
+        ...
+
+
+class IPercolator(Generic[Key], metaclass=ABCMeta):
+    @abstractmethod
+    def add_filters(self, key: Key, filters_: Iterable[filters.Filter]) -> None:
+        ...
+
+    @abstractmethod
+    def remove_filters(self, key: Key) -> None:
+        ...
+
+    @abstractmethod
+    def percolate(self, entity: IEntity) -> AbstractSet[Key]:
+        ...
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Tuple
+from typing import TypeVar
+
+from rmshared.content.taxonomy.core import encoders
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.entities import CachedEntity
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+EntityPredicate = Callable[[IEntity], bool]
+
+
+class AdaptiveMatcher(IMatcher):
+    """
+    Evaluates filters in the order that rejects entities at the lowest cost, as observed at runtime.
+
+    Filters are told apart by their `encoders.keys` strings, so the statistics can be exported from one process
+    and loaded into another to start with a warm ordering.
+
+    Only every `sample_interval`-th evaluation of a plan is timed, and a plan is no longer timed at all once its order
+    survived `STABLE_SORTS_COUNT` reorders unchanged. The plans of `does_entity_match_filters` calls are kept for the
+    `PLANS_CACHE_SIZE` most recently used tuples of filters, so that one-off calls don't encode and compile again.
+    """
+
+    REORDER_INTERVAL = 1000
+    SAMPLE_INTERVAL = 16
+    STABLE_SORTS_COUNT = 3
+    PLANS_CACHE_SIZE = 1024
+
+    def __init__(
+            self,
+            matcher: IMatcher,
+            keys: encoders.IFilters[filters.Filter, str],
+            reorder_interval: int = REORDER_INTERVAL,
+            sample_interval: int = SAMPLE_INTERVAL,
+    ):
+        assert sample_interval > 0, sample_interval
+        self.matcher = matcher
+        self.keys = keys
+        self.reorder_interval = reorder_interval
+        self.sample_interval = sample_interval
+        self.key_to_stats_map: Dict[str, AdaptiveMatcher.Stats] = dict()
+        self.key_to_rank_map: Dict[str, float] = dict()
+        self.filters_to_plan_map: OrderedDict[Tuple[filters.Filter, ...], AdaptiveMatcher.Plan] = OrderedDict()
+        self.evaluations_count = 0
+        self.version = 0
+
+    def does_entity_match_filters(self, entity, filters_):
+        filters_ = tuple(filters_)
+        plan = self.filters_to_plan_map.get(filters_)
+        if plan is None:
+            plan = self.filters_to_plan_map[filters_] = self._make_plan(filters_)
+            if len(self.filters_to_plan_map) > self.PLANS_CACHE_SIZE:
+                self.filters_to_plan_map.popitem(last=False)
+        else:
+            self.filters_to_plan_map.move_to_end(filters_)
+        return self._run_plan(plan, CachedEntity.wrap(entity))
+
+    def compile(self, filters_):
+        plan = self._make_plan(filters_)
+
+        def does_entity_match_filters(entity: IEntity) -> bool:
+            return self._run_plan(plan, CachedEntity.wrap(entity))
+
+        return does_entity_match_filters
+
+    def export_stats(self) -> Mapping[str, Mapping[str, Any]]:
+        return {key: asdict(stats) for key, stats in self.key_to_stats_map.items()}
+
+    def load_stats(self, key_to_stats_map: Mapping[str, Mapping[str, Any]]) -> None:
+        self.key_to_stats_map.update({key: self.Stats(**stats) for key, stats in key_to_stats_map.items()})
+        self.reorder()
+
+    def reorder(self) -> None:
+        self.key_to_rank_map = {key: stats.estimate_rank() for key, stats in self.key_to_stats_map.items()}
+        self.version += 1
+
+    def _make_plan(self, filters_: Iterable[Filter]) -> AdaptiveMatcher.Plan:
+        return self.Plan(checks=list(map(self._make_check, filters_)), version=-1, evaluations_count=0, stable_sorts_count=0)
+
+    def _make_check(self, filter_: Filter) -> AdaptiveMatcher.Check:
+        return self.Check(key=self.keys.encode_filter(filter_), predicate=self.matcher.compile([filter_]))
+
+    def _run_plan(self, plan: AdaptiveMatcher.Plan, entity: IEntity) -> bool:
+        if plan.version != self.version:
+            self._sort_plan(plan)
+
+        is_sampled = not plan.is_stable and plan.evaluations_count % self.sample_interval == 0
+        plan.evaluations_count += 1
+        if not is_sampled:
+            for check in plan.checks:
+                if not check.predicate(entity):
+                    return False
+            else:
+                return True
+
+        for check in plan.checks:
+            started_at = perf_counter()
+            is_passed = check.predicate(entity)
+            self._record(check.key, is_passed, cost=perf_counter() - started_at)
+            if not is_passed:
+                return False
+        else:
+            return True
+
+    def _sort_plan(self, plan: AdaptiveMatcher.Plan) -> None:
+        checks = list(plan.checks)
+        plan.checks.sort(key=self._get_check_rank)
+        if plan.version < 0:  # The first sort only puts the plan in the current order
+            pass
+        elif plan.checks == checks:
+            plan.stable_sorts_count += 1
+        else:
+            plan.stable_sorts_count = 0
+        plan.version = self.version
+
+    def _record(self, key: str, is_passed: bool, cost: float) -> None:
+        stats = self.key_to_stats_map.get(key)
+        if stats is None:
+            stats = self.key_to_stats_map[key] = self.Stats(calls_count=0, passes_count=0, total_cost=0.0)
+        stats.record(is_passed, cost)
+
+        self.evaluations_count += 1
+        if self.evaluations_count % self.reorder_interval == 0:
+            self.reorder()
+
+    def _get_check_rank(self, check: AdaptiveMatcher.Check) -> float:
+        return self.key_to_rank_map.get(check.key, 0.0)  # Filters never seen go first to collect their statistics
+
+    @dataclass(frozen=True)
+    class Check:
+        key: str
+        predicate: EntityPredicate
+
+    @dataclass
+    class Plan:
+        checks: List[AdaptiveMatcher.Check]
+        version: int
+        evaluations_count: int
+        stable_sorts_count: int  # Reorders in a row that left the checks in the same order
+
+        @property
+        def is_stable(self) -> bool:
+            return self.stable_sorts_count >= AdaptiveMatcher.STABLE_SORTS_COUNT
+
+    @dataclass
+    class Stats:
+        calls_count: int
+        passes_count: int
+        total_cost: float  # seconds
+
+        def record(self, is_passed: bool, cost: float) -> None:
+            self.calls_count += 1
+            self.passes_count += int(is_passed)
+            self.total_cost += cost
+
+        def estimate_rank(self) -> float:
+            """
+            The expected cost of evaluating a filter per entity it rejects; evaluating filters with lower ranks first
+            minimizes the total cost of a conjunction.
+            """
+            if self.calls_count == 0:
+                return 0.0
+
+            rejection_rate = 1 - self.passes_count / self.calls_count
+            if rejection_rate == 0:
+                return float('inf')
+            else:
+                return self.total_cost / self.calls_count / rejection_rate
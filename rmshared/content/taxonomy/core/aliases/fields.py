@@ -1,8 +1,13 @@
 from abc import ABCMeta
+from typing import Callable
+from typing import Optional
 from typing import Protocol
 from typing import TypeVar
 
+from rmshared.tools import as_is
+
 from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core.interning import Interner
 
 __all__ = ('System', 'Custom')
 
@@ -10,18 +15,23 @@ Field = TypeVar('Field', bound=fields.Field)
 
 
 class Base(Protocol[Field], metaclass=ABCMeta):
-    def __init__(self, name: str):
+    def __init__(self, name: str, interner: Optional[Interner] = None):
         self.name = name
+        self.intern: Callable[[Field], Field] = as_is if interner is None else interner.intern
 
     def __hash__(self):
         return (self.__class__, self.name).__hash__()
 
 
 class System(Base[fields.System]):
+    def __init__(self, name: str, interner: Optional[Interner] = None):
+        super().__init__(name, interner)
+        self.field = self.intern(fields.System(name=name))
+
     def __call__(self) -> fields.System:
-        return fields.System(name=self.name)
+        return self.field
 
 
 class Custom(Base[fields.Custom]):
     def __call__(self, path: str) -> fields.Custom:
-        return fields.Custom(name=self.name, path=path)
+        return self.intern(fields.Custom(name=self.name, path=path))
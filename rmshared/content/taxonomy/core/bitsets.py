@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from itertools import count
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.entities import CachedEntity
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+Label = TypeVar('Label', bound=labels.Label)
+Value = TypeVar('Value')
+BitsPredicate = Callable[[int], bool]
+
+
+class BitsetMatcher(IMatcher):
+    """
+    Matches labels of fields with tiny value domains (post types, statuses, badges, etc) as bits of an integer.
+
+    Every known value of such a field, as well as its emptiness, gets a bit, so an entity is described by a single
+    bitmask and `AnyLabel`/`NoLabels` filters over those fields reduce to a bitwise AND. Filters referencing anything
+    else are passed to the delegate matcher.
+    """
+
+    def __init__(self, matcher: IMatcher, field_to_values_map: Mapping[fields.Field, Iterable[Any]]):
+        self.matcher = matcher
+        self.field_to_value_to_bit_map: Dict[fields.Field, Dict[Any, int]] = dict()
+        self.field_to_empty_bit_map: Dict[fields.Field, int] = dict()
+        bits = map(lambda index: 1 << index, count())
+        for field, values in field_to_values_map.items():
+            self.field_to_empty_bit_map[field] = next(bits)
+            self.field_to_value_to_bit_map[field] = {value: next(bits) for value in values}
+
+        self.filter_to_compiler_map: Mapping[Type[filters.Filter], Callable[[Filter], Optional[BitsPredicate]]] = {
+            filters.AnyLabel: self._compile_any_label_filter,
+            filters.NoLabels: self._compile_no_labels_filter,
+        }
+        self.label_to_bit_getter_map: Mapping[Type[labels.Label], Callable[[Label], Optional[int]]] = {
+            labels.Value: self._get_value_label_bit,
+            labels.Badge: self._get_badge_label_bit,
+            labels.Empty: self._get_empty_label_bit,
+        }
+
+    def wrap(self, entity: IEntity[Value]) -> BitsetMatcher.Entity[Value]:
+        """
+        Encodes the entity once so that it can be matched against any number of filters.
+        """
+        if isinstance(entity, self.Entity) and entity.matcher is self:
+            return entity
+        else:
+            return self.Entity(entity, matcher=self)
+
+    def encode_entity(self, entity: IEntity) -> int:
+        bits = 0
+        for field, value_to_bit_map in self.field_to_value_to_bit_map.items():
+            values = entity.get_values(field)
+            if len(values) == 0:
+                bits |= self.field_to_empty_bit_map[field]
+            for value in values:
+                bits |= value_to_bit_map.get(value, 0)
+        return bits
+
+    def encode_entities(self, entities: Iterable[IEntity]) -> List[int]:
+        return list(map(self.encode_entity, entities))
+
+    def does_entity_match_filters(self, entity, filters_):
+        entity = self.wrap(entity)
+        other_filters = []
+        for filter_ in filters_:
+            predicate = self._compile_filter(filter_)
+            if predicate is None:
+                other_filters.append(filter_)
+            elif not predicate(entity.bits):
+                return False
+        else:
+            return self.matcher.does_entity_match_filters(entity, other_filters)
+
+    def compile(self, filters_):
+        predicates, filters_ = self._compile_filters(filters_)
+        does_entity_match_other_filters = self.matcher.compile(filters_)
+
+        def does_entity_match_filters(entity: IEntity) -> bool:
+            entity = self.wrap(entity)
+            for predicate in predicates:
+                if not predicate(entity.bits):
+                    return False
+            else:
+                return does_entity_match_other_filters(entity)
+
+        return does_entity_match_filters
+
+    def compile_bits(self, filters_: Iterable[Filter]) -> BitsPredicate:
+        """
+        Compiles filters into a predicate over encoded entities.
+
+        :raise: ValueError
+        """
+        predicates, filters_ = self._compile_filters(filters_)
+        if filters_:
+            raise ValueError(['Filters can not be matched against bits', filters_])
+        else:
+            return lambda bits: all(predicate(bits) for predicate in predicates)
+
+    def _compile_filters(self, filters_: Iterable[Filter]) -> Tuple[Tuple[BitsPredicate, ...], Tuple[Filter, ...]]:
+        predicates = []
+        other_filters = []
+        for filter_ in filters_:
+            predicate = self._compile_filter(filter_)
+            if predicate is None:
+                other_filters.append(filter_)
+            else:
+                predicates.append(predicate)
+        return tuple(predicates), tuple(other_filters)
+
+    def _compile_filter(self, filter_: Filter) -> Optional[BitsPredicate]:
+        compiler = self.filter_to_compiler_map.get(type(filter_))
+        return None if compiler is None else compiler(filter_)
+
+    def _compile_any_label_filter(self, filter_: filters.AnyLabel) -> Optional[BitsPredicate]:
+        mask = self._make_mask(filter_.labels)
+        return None if mask is None else lambda bits: bits & mask != 0
+
+    def _compile_no_labels_filter(self, filter_: filters.NoLabels) -> Optional[BitsPredicate]:
+        mask = self._make_mask(filter_.labels)
+        return None if mask is None else lambda bits: bits & mask == 0
+
+    def _make_mask(self, labels_: Iterable[labels.Label]) -> Optional[int]:
+        mask = 0
+        for label in labels_:
+            bit = self.label_to_bit_getter_map[type(label)](label)
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def _get_value_label_bit(self, label: labels.Value) -> Optional[int]:
+        return self.field_to_value_to_bit_map.get(label.field, dict()).get(label.value)
+
+    def _get_badge_label_bit(self, label: labels.Badge) -> Optional[int]:
+        return self.field_to_value_to_bit_map.get(label.field, dict()).get(True)
+
+    def _get_empty_label_bit(self, label: labels.Empty) -> Optional[int]:
+        return self.field_to_empty_bit_map.get(label.field)
+
+    class Entity(CachedEntity[Value]):
+        def __init__(self, entity: IEntity[Value], matcher: BitsetMatcher):
+            super().__init__(entity)
+            self.matcher = matcher
+            self.bits = matcher.encode_entity(self)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from abc import ABCMeta
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from functools import reduce
+from itertools import chain
+from itertools import islice
+from operator import and_
+from operator import or_
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.tools import as_is
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core.abc import IEntity
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+Label = TypeVar('Label', bound=labels.Label)
+Range = TypeVar('Range', bound=ranges.Range)
+Value = TypeVar('Value')
+ValuePredicate = Callable[[Value], bool]
+Bounds = Tuple[Optional[Value], Optional[Value]]
+
+
+class Columns:
+    """
+    Holds the values of many entities column by column and selects the ones matching filters in bulk.
+
+    Every field is a column of values with offsets of every entity's values (CSR), so multivalued fields take no extra
+    space. Integers and floats are stored in typed arrays, anything else is dictionary-encoded. Selections are integer
+    bitmaps with the bit `i` set for the entity `i`, the same as `IMatcher.match_many_as_bitmap` returns.
+    """
+
+    INT64_MIN = -2 ** 63
+    INT64_MAX = 2 ** 63 - 1
+
+    def __init__(self, fields_: Iterable[fields.Field], entities: Iterable[IEntity]):
+        fields_ = tuple(fields_)
+        field_to_rows_map: Dict[fields.Field, List[Sequence[Any]]] = {field: [] for field in fields_}
+        self.size = 0
+        for entity in entities:
+            for field in fields_:
+                field_to_rows_map[field].append(tuple(entity.get_values(field)))
+            self.size += 1
+
+        self.all_rows_mask = (1 << self.size) - 1
+        self.field_to_column_map: Mapping[fields.Field, Columns.IColumn] = {
+            field: self._make_column(rows) for field, rows in field_to_rows_map.items()
+        }
+        self.filter_to_selector_map: Mapping[Type[filters.Filter], Callable[[Filter], int]] = {
+            filters.AnyLabel: self._select_any_label_filter,
+            filters.NoLabels: self._select_no_labels_filter,
+            filters.AnyRange: self._select_any_range_filter,
+            filters.NoRanges: self._select_no_ranges_filter,
+        }
+        self.label_to_selector_map: Mapping[Type[labels.Label], Callable[[Label], int]] = {
+            labels.Value: self._select_value_label,
+            labels.Badge: self._select_badge_label,
+            labels.Empty: self._select_empty_label,
+        }
+        self.range_to_bounds_map: Mapping[Type[ranges.Range], Callable[[Range], Bounds]] = {
+            ranges.Between: self._get_between_range_bounds,
+            ranges.LessThan: self._get_less_than_range_bounds,
+            ranges.MoreThan: self._get_more_than_range_bounds,
+        }
+
+    def _make_column(self, rows: Sequence[Sequence[Any]]) -> Columns.IColumn:
+        offsets = array('q', [0])
+        for values in rows:
+            offsets.append(offsets[-1] + len(values))
+
+        values = [value for values in rows for value in values]
+        if all(type(value) is int for value in values) and all(self.INT64_MIN <= value <= self.INT64_MAX for value in values):
+            return self.Numbers(offsets, array('q', values))
+        elif all(type(value) is float for value in values):
+            return self.Numbers(offsets, array('d', values))
+        else:
+            return self.Dictionary(offsets, values)
+
+    def select(self, filters_: Iterable[Filter]) -> int:
+        """
+        :raise: LookupError when a filter references a field missing from the columns
+        """
+        return reduce(and_, map(self._select_filter, filters_), self.all_rows_mask)
+
+    @staticmethod
+    def stream_rows(mask: int) -> Iterator[int]:
+        return (row for row, bit in enumerate(reversed(bin(mask)[2:])) if bit == '1')
+
+    def _select_filter(self, filter_: Filter) -> int:
+        return self.filter_to_selector_map[type(filter_)](filter_)
+
+    def _select_any_label_filter(self, filter_: filters.AnyLabel) -> int:
+        return reduce(or_, map(self._select_label, filter_.labels), 0)
+
+    def _select_no_labels_filter(self, filter_: filters.NoLabels) -> int:
+        return self.all_rows_mask ^ reduce(or_, map(self._select_label, filter_.labels), 0)
+
+    def _select_label(self, label: Label) -> int:
+        return self.label_to_selector_map[type(label)](label)
+
+    def _select_value_label(self, label: labels.Value) -> int:
+        return self.field_to_column_map[label.field].select_value(label.value)
+
+    def _select_badge_label(self, label: labels.Badge) -> int:
+        return self.field_to_column_map[label.field].select_value(True)
+
+    def _select_empty_label(self, label: labels.Empty) -> int:
+        return self.field_to_column_map[label.field].select_empty()
+
+    def _select_any_range_filter(self, filter_: filters.AnyRange) -> int:
+        return reduce(or_, map(self._select_range, filter_.ranges), 0)
+
+    def _select_no_ranges_filter(self, filter_: filters.NoRanges) -> int:
+        return self.all_rows_mask ^ reduce(or_, map(self._select_range, filter_.ranges), 0)
+
+    def _select_range(self, range_: Range) -> int:
+        min_value, max_value = self.range_to_bounds_map[type(range_)](range_)
+        return self.field_to_column_map[range_.field].select_between(min_value, max_value)
+
+    @staticmethod
+    def _get_between_range_bounds(range_: ranges.Between[Any, Value]) -> Bounds:
+        return range_.min_value, range_.max_value
+
+    @staticmethod
+    def _get_less_than_range_bounds(range_: ranges.LessThan[Any, Value]) -> Bounds:
+        return None, range_.value
+
+    @staticmethod
+    def _get_more_than_range_bounds(range_: ranges.MoreThan[Any, Value]) -> Bounds:
+        return range_.value, None
+
+    class IColumn(metaclass=ABCMeta):
+        @abstractmethod
+        def select_value(self, value: Any) -> int:
+            ...
+
+        @abstractmethod
+        def select_between(self, min_value: Optional[Value], max_value: Optional[Value]) -> int:
+            """
+            Selects the rows with any value within the bounds, inclusive, where `None` is unbounded.
+            """
+
+        @abstractmethod
+        def select_empty(self) -> int:
+            ...
+
+    class Base(IColumn, metaclass=ABCMeta):
+        def __init__(self, offsets: array):
+            self.offsets = offsets
+            self.empty_mask: Optional[int] = None
+            self.key_to_rows_map: Optional[Dict[Any, List[int]]] = None
+            self.sorted_keys: Optional[List[Any]] = None
+            self.sorted_values: List[Any] = []
+
+        def select_empty(self):
+            if self.empty_mask is None:
+                offsets = self.offsets
+                self.empty_mask = self._make_mask(row for row in range(len(offsets) - 1) if offsets[row] == offsets[row + 1])
+            return self.empty_mask
+
+        def _select_key(self, keys: Sequence[Any], key: Any) -> int:
+            rows = self._get_key_to_rows_map(keys).get(key)
+            return 0 if rows is None else self._make_mask(rows)
+
+        def _select_keys(self, keys: Sequence[Any], predicate: ValuePredicate) -> int:
+            key_to_rows_map = self._get_key_to_rows_map(keys)
+            return self._make_mask(chain.from_iterable(rows for key, rows in key_to_rows_map.items() if predicate(key)))
+
+        def _select_keys_between(self, keys: Sequence[Any], get_value: Callable[[Any], Value], min_value: Optional[Value], max_value: Optional[Value]) -> int:
+            """
+            Bisects the distinct keys sorted by their values once, instead of checking every one of them.
+
+            :raise: TypeError when the values can't be ordered or compared with the bounds
+            """
+            key_to_rows_map = self._get_key_to_rows_map(keys)
+            if self.sorted_keys is None:
+                sorted_keys = sorted(filter(lambda key: get_value(key) == get_value(key), key_to_rows_map.keys()), key=get_value)  # NaN is within no bounds
+                self.sorted_keys, self.sorted_values = sorted_keys, list(map(get_value, sorted_keys))
+
+            start = 0 if min_value is None else bisect_left(self.sorted_values, min_value)
+            stop = len(self.sorted_values) if max_value is None else bisect_right(self.sorted_values, max_value)
+            return self._make_mask(chain.from_iterable(map(key_to_rows_map.__getitem__, islice(self.sorted_keys, start, stop))))
+
+        def _get_key_to_rows_map(self, keys: Sequence[Any]) -> Dict[Any, List[int]]:
+            """
+            Indexes the rows of every distinct key once, so that selections look the keys up instead of scanning the rows.
+            """
+            if self.key_to_rows_map is None:
+                self.key_to_rows_map = dict()
+                offsets = self.offsets
+                for row in range(len(offsets) - 1):
+                    for key in keys[offsets[row]:offsets[row + 1]]:
+                        rows = self.key_to_rows_map.get(key)
+                        if rows is None:
+                            self.key_to_rows_map[key] = [row]
+                        elif rows[-1] != row:
+                            rows.append(row)
+            return self.key_to_rows_map
+
+        def _make_mask(self, rows: Iterable[int]) -> int:
+            size = len(self.offsets) - 1
+            if size == 0:
+                return 0
+
+            bits = bytearray(b'0' * size)  # Most significant first, the same way `int` parses it
+            for row in rows:
+                bits[size - 1 - row] = ord('1')
+            return int(bits, 2)
+
+    class Numbers(Base):
+        def __init__(self, offsets: array, values: array):
+            super().__init__(offsets)
+            self.values = values
+
+        def select_value(self, value):
+            return self._select_key(self.values, value)
+
+        def select_between(self, min_value, max_value):
+            return self._select_keys_between(self.values, as_is, min_value, max_value)
+
+    class Dictionary(Base):
+        def __init__(self, offsets: array, values: Sequence[Any]):
+            super().__init__(offsets)
+            self.value_to_code_map: Dict[Any, int] = dict()
+            self.codes = array('q', map(lambda value: self.value_to_code_map.setdefault(value, len(self.value_to_code_map)), values))
+            self.dictionary = list(self.value_to_code_map.keys())
+            self.code_to_mask_map: Dict[int, int] = dict()
+
+        def select_value(self, value):
+            code = self.value_to_code_map.get(value)
+            if code is None:
+                return 0
+
+            mask = self.code_to_mask_map.get(code)
+            if mask is None:
+                mask = self.code_to_mask_map[code] = self._select_key(self.codes, code)
+            return mask
+
+        def select_between(self, min_value, max_value):
+            dictionary = self.dictionary
+            try:
+                return self._select_keys_between(self.codes, dictionary.__getitem__, min_value, max_value)
+            except TypeError:  # Values of different types can't be ordered, fall back to checking every value
+                return self._select_keys(self.codes, lambda code: self._is_between(dictionary[code], min_value, max_value))
+
+        @staticmethod
+        def _is_between(value: Value, min_value: Optional[Value], max_value: Optional[Value]) -> bool:
+            return (min_value is None or min_value <= value) and (max_value is None or value <= max_value)
@@ -0,0 +1,33 @@
+from typing import AbstractSet
+from typing import Dict
+from typing import TypeVar
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core.abc import IEntity
+
+Value = TypeVar('Value')
+MISSING = object()
+
+
+class CachedEntity(IEntity[Value]):
+    """
+    Materializes the values of every field at most once. Compiled matchers wrap entities only when their filters share
+    fields; wrap them explicitly to reuse the values across calls for as long as the entity does not change.
+    """
+
+    @classmethod
+    def wrap(cls, entity: IEntity[Value]) -> 'CachedEntity[Value]':
+        if isinstance(entity, cls):
+            return entity
+        else:
+            return cls(entity)
+
+    def __init__(self, entity: IEntity[Value]):
+        self.entity = entity
+        self.field_to_values_map: Dict[fields.Field, AbstractSet[Value]] = dict()
+
+    def get_values(self, field):
+        values = self.field_to_values_map.get(field, MISSING)
+        if values is MISSING:
+            values = self.field_to_values_map[field] = frozenset(self.entity.get_values(field))
+        return values
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Hashable
+from typing import Mapping
+from typing import Tuple
+from typing import TypeVar
+from weakref import WeakValueDictionary
+
+Object = TypeVar('Object')
+
+
+class Interner:
+    """
+    Shares equal immutable objects (fields, labels, ranges, filters) instead of keeping a copy per parse or resolution.
+    Objects are held weakly, so the pool only keeps the ones still in use elsewhere. Scalars are told apart by their
+    types as well, at every level of nesting, so `Value(field, 1)` and `Value(field, True)` remain different objects and
+    so do the filters holding them.
+
+    Interning costs about as much as hashing the object, so it pays off for long-lived objects, see
+    `protocols.interning.Builder` and the `interner` of `variables.Resolver`.
+    """
+
+    SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+    def __init__(self):
+        self.key_to_object_map: WeakValueDictionary[Hashable, Object] = WeakValueDictionary()
+
+    def intern(self, object_: Object) -> Object:
+        try:
+            key = self._make_key(object_)
+            interned = self.key_to_object_map.get(key)
+            if interned is None:
+                interned = self.key_to_object_map.setdefault(key, object_)
+        except TypeError:  # Unhashable or not weakly referable
+            return object_
+        else:
+            return interned
+
+    @classmethod
+    def _make_key(cls, object_: Object) -> Tuple[Hashable, ...]:  # Must not reference the object itself, otherwise it is never released
+        return type(object_), tuple(map(cls.make_component_key, vars(object_).values()))
+
+    @classmethod
+    def make_component_key(cls, component: Any) -> Hashable:
+        """
+        :raise: TypeError
+        """
+        type_ = type(component)
+        if type_ in cls.SCALAR_TYPES:
+            return type_, component
+        elif type_ is tuple:
+            return type_, tuple(map(cls.make_component_key, component))
+        elif type_ is list or type_ is dict:
+            raise TypeError(component)  # Mutable
+        elif isinstance(component, Mapping):
+            return type_, frozenset((cls.make_component_key(key), cls.make_component_key(value)) for key, value in component.items())
+        elif hasattr(component, '__dict__') and not isinstance(component, type):
+            return cls._make_key(component)
+        else:
+            return type_, component
+
+    def __len__(self) -> int:
+        return len(self.key_to_object_map)
@@ -1,21 +1,37 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import AbstractSet
 from typing import Any
 from typing import Callable
 from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Mapping
+from typing import Optional
+from typing import Sequence
 from typing import Type
 from typing import TypeVar
 
+from rmshared.tools import group_to_mapping
+
+from rmshared.content.taxonomy.core import fields
 from rmshared.content.taxonomy.core import filters
 from rmshared.content.taxonomy.core import labels
 from rmshared.content.taxonomy.core import ranges
 
 from rmshared.content.taxonomy.core.abc import IEntity
 from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.entities import CachedEntity
 
 Filter = TypeVar('Filter', bound=filters.Filter)
 Label = TypeVar('Label', bound=labels.Label)
 Range = TypeVar('Range', bound=ranges.Range)
 Value = TypeVar('Value')
+EntityPredicate = Callable[[IEntity], bool]
+ValuePredicate = Callable[[Value], bool]
 
 
 class Matcher(IMatcher):
@@ -36,6 +52,33 @@ class Matcher(IMatcher):
             ranges.LessThan: self._does_value_match_less_than_range,
             ranges.MoreThan: self._does_value_match_more_than_range,
         }
+        self.filter_to_compiler_map: Mapping[Type[filters.Filter], Callable[[Filter], EntityPredicate]] = {
+            filters.AnyLabel: self._compile_any_label_filter,
+            filters.NoLabels: self._compile_no_labels_filter,
+            filters.AnyRange: self._compile_any_range_filter,
+            filters.NoRanges: self._compile_no_ranges_filter,
+        }
+        self.label_to_compiler_map: Mapping[Type[labels.Label], Callable[[Label], Matcher.LabelCheck]] = {
+            labels.Value: self._compile_value_label,
+            labels.Badge: self._compile_badge_label,
+            labels.Empty: self._compile_empty_label,
+        }
+        self.range_to_compiler_map: Mapping[Type[ranges.Range], Callable[[Range], ValuePredicate]] = {
+            ranges.Between: self._compile_between_range,
+            ranges.LessThan: self._compile_less_than_range,
+            ranges.MoreThan: self._compile_more_than_range,
+        }
+        self.range_to_interval_map: Mapping[Type[ranges.Range], Callable[[Range], Matcher.Interval]] = {
+            ranges.Between: self._make_between_interval,
+            ranges.LessThan: self._make_less_than_interval,
+            ranges.MoreThan: self._make_more_than_interval,
+        }
+        self.filter_to_fields_streamer_map: Mapping[Type[filters.Filter], Callable[[Filter], Iterator[fields.Field]]] = {
+            filters.AnyLabel: self._stream_labels_filter_fields,
+            filters.NoLabels: self._stream_labels_filter_fields,
+            filters.AnyRange: self._stream_ranges_filter_fields,
+            filters.NoRanges: self._stream_ranges_filter_fields,
+        }
 
     def does_entity_match_filters(self, entity, filters_):
         for filter_ in filters_:
@@ -103,3 +146,211 @@ class Matcher(IMatcher):
     @staticmethod
     def _does_value_match_more_than_range(value: Value, range_: ranges.MoreThan[Any, Value]) -> bool:
         return value >= range_.value
+
+    def compile(self, filters_):
+        filters_ = tuple(filters_)
+        predicates = tuple(map(self._compile_filter, filters_))
+
+        def does_entity_match_filters(entity: IEntity) -> bool:
+            for predicate in predicates:
+                if not predicate(entity):
+                    return False
+            else:
+                return True
+
+        if self._do_filters_share_fields(filters_):  # Otherwise every field is fetched once anyway
+            return lambda entity: does_entity_match_filters(CachedEntity.wrap(entity))
+        else:
+            return does_entity_match_filters
+
+    def _do_filters_share_fields(self, filters_: Iterable[Filter]) -> bool:
+        fields_ = set()
+        for filter_ in filters_:
+            filter_fields = frozenset(self.filter_to_fields_streamer_map[type(filter_)](filter_))
+            if not fields_.isdisjoint(filter_fields):
+                return True
+            fields_.update(filter_fields)
+        else:
+            return False
+
+    @staticmethod
+    def _stream_labels_filter_fields(filter_: filters.AnyLabel | filters.NoLabels) -> Iterator[fields.Field]:
+        return map(attrgetter('field'), filter_.labels)
+
+    @staticmethod
+    def _stream_ranges_filter_fields(filter_: filters.AnyRange | filters.NoRanges) -> Iterator[fields.Field]:
+        return map(attrgetter('field'), filter_.ranges)
+
+    def _compile_filter(self, filter_: Filter) -> EntityPredicate:
+        return self.filter_to_compiler_map[type(filter_)](filter_)
+
+    def _compile_any_label_filter(self, filter_: filters.AnyLabel) -> EntityPredicate:
+        return self._compile_any_label(filter_.labels)
+
+    def _compile_no_labels_filter(self, filter_: filters.NoLabels) -> EntityPredicate:
+        does_entity_match_any_label = self._compile_any_label(filter_.labels)
+        return lambda entity: not does_entity_match_any_label(entity)
+
+    def _compile_any_label(self, labels_: Iterable[labels.Label]) -> EntityPredicate:
+        field_to_checks_map = group_to_mapping(map(self._compile_label, labels_), key_func=attrgetter('field'))
+        checks = tuple(map(self.LabelCheck.merge, field_to_checks_map.values()))
+
+        def does_entity_match_any_label(entity: IEntity) -> bool:
+            for check in checks:
+                values_ = entity.get_values(check.field)
+                if not check.values.isdisjoint(values_) or (check.does_match_empty and len(values_) == 0):
+                    return True
+            else:
+                return False
+
+        return does_entity_match_any_label
+
+    def _compile_label(self, label: Label) -> Matcher.LabelCheck:
+        return self.label_to_compiler_map[type(label)](label)
+
+    def _compile_value_label(self, label: labels.Value) -> Matcher.LabelCheck:
+        return self.LabelCheck(field=label.field, values=frozenset({label.value}), does_match_empty=False)
+
+    def _compile_badge_label(self, label: labels.Badge) -> Matcher.LabelCheck:
+        return self.LabelCheck(field=label.field, values=frozenset({True}), does_match_empty=False)
+
+    def _compile_empty_label(self, label: labels.Empty) -> Matcher.LabelCheck:
+        return self.LabelCheck(field=label.field, values=frozenset(), does_match_empty=True)
+
+    def _compile_any_range_filter(self, filter_: filters.AnyRange) -> EntityPredicate:
+        return self._compile_any_range(filter_.ranges)
+
+    def _compile_no_ranges_filter(self, filter_: filters.NoRanges) -> EntityPredicate:
+        does_entity_match_any_range = self._compile_any_range(filter_.ranges)
+        return lambda entity: not does_entity_match_any_range(entity)
+
+    def _compile_any_range(self, ranges_: Iterable[ranges.Range]) -> EntityPredicate:
+        field_to_ranges_map = group_to_mapping(ranges_, key_func=attrgetter('field'))
+        checks = tuple(map(lambda item: (item[0], self._compile_ranges(item[1])), field_to_ranges_map.items()))
+
+        def does_entity_match_any_range(entity: IEntity) -> bool:
+            for field, does_value_match_any_range in checks:
+                for value in entity.get_values(field):
+                    if does_value_match_any_range(value):
+                        return True
+            else:
+                return False
+
+        return does_entity_match_any_range
+
+    def merge_ranges(self, ranges_: Iterable[ranges.Range]) -> Sequence[Matcher.Interval]:
+        """
+        :raise: TypeError when bounds of different types can't be ordered
+        """
+        return self.Interval.merge(map(self._make_interval, ranges_))
+
+    def _compile_ranges(self, ranges_: Iterable[ranges.Range]) -> ValuePredicate:
+        try:
+            intervals = self.merge_ranges(ranges_)
+        except TypeError:  # Bounds of different types can't be ordered, fall back to checking every range
+            predicates = tuple(map(self._compile_range, ranges_))
+            return lambda value: any(predicate(value) for predicate in predicates)
+        else:
+            return self._compile_intervals(intervals)
+
+    @staticmethod
+    def _compile_intervals(intervals: Sequence[Matcher.Interval]) -> ValuePredicate:
+        if intervals and intervals[0].min_value is None:
+            head_max_value, intervals = intervals[0].max_value, intervals[1:]
+            has_head = True
+        else:
+            head_max_value = None
+            has_head = False
+
+        min_values = list(map(attrgetter('min_value'), intervals))
+        max_values = list(map(attrgetter('max_value'), intervals))
+
+        def does_value_match_any_interval(value: Value) -> bool:
+            index = bisect_right(min_values, value)
+            if index > 0:
+                max_value = max_values[index - 1]
+                return max_value is None or value <= max_value
+            else:
+                return has_head and (head_max_value is None or value <= head_max_value)
+
+        return does_value_match_any_interval
+
+    def _make_interval(self, range_: Range) -> Matcher.Interval:
+        return self.range_to_interval_map[type(range_)](range_)
+
+    @staticmethod
+    def _make_between_interval(range_: ranges.Between[Any, Value]) -> Matcher.Interval:
+        return Matcher.Interval(min_value=range_.min_value, max_value=range_.max_value)
+
+    @staticmethod
+    def _make_less_than_interval(range_: ranges.LessThan[Any, Value]) -> Matcher.Interval:
+        return Matcher.Interval(min_value=None, max_value=range_.value)
+
+    @staticmethod
+    def _make_more_than_interval(range_: ranges.MoreThan[Any, Value]) -> Matcher.Interval:
+        return Matcher.Interval(min_value=range_.value, max_value=None)
+
+    def _compile_range(self, range_: Range) -> ValuePredicate:
+        return self.range_to_compiler_map[type(range_)](range_)
+
+    @staticmethod
+    def _compile_between_range(range_: ranges.Between[Any, Value]) -> ValuePredicate:
+        min_value, max_value = range_.min_value, range_.max_value
+        return lambda value: min_value <= value <= max_value
+
+    @staticmethod
+    def _compile_less_than_range(range_: ranges.LessThan[Any, Value]) -> ValuePredicate:
+        max_value = range_.value
+        return lambda value: value <= max_value
+
+    @staticmethod
+    def _compile_more_than_range(range_: ranges.MoreThan[Any, Value]) -> ValuePredicate:
+        min_value = range_.value
+        return lambda value: value >= min_value
+
+    @dataclass(frozen=True)
+    class Interval:
+        min_value: Optional[Any]  # `None` stands for no lower bound
+        max_value: Optional[Any]  # `None` stands for no upper bound
+
+        @classmethod
+        def merge(cls, intervals: Iterable[Matcher.Interval]) -> Sequence[Matcher.Interval]:
+            """
+            :raise: TypeError
+            """
+            intervals = tuple(intervals)
+            heads = tuple(filter(lambda interval: interval.min_value is None, intervals))
+            others = filter(lambda interval: interval.min_value is not None, intervals)
+            others = filter(lambda interval: interval.max_value is None or interval.min_value <= interval.max_value, others)
+
+            merged: List[Matcher.Interval] = []
+            if heads:
+                merged.append(cls(min_value=None, max_value=cls._get_max_value(heads)))
+
+            for interval in sorted(others, key=attrgetter('min_value')):
+                if merged and (merged[-1].max_value is None or interval.min_value <= merged[-1].max_value):
+                    merged[-1] = cls(min_value=merged[-1].min_value, max_value=cls._get_max_value((merged[-1], interval)))
+                else:
+                    merged.append(interval)
+
+            return merged
+
+        @staticmethod
+        def _get_max_value(intervals: Iterable[Matcher.Interval]) -> Optional[Any]:
+            max_values = tuple(map(attrgetter('max_value'), intervals))
+            return None if None in max_values else max(max_values)
+
+    @dataclass(frozen=True)
+    class LabelCheck:
+        field: fields.Field
+        values: AbstractSet[Any]
+        does_match_empty: bool
+
+        @classmethod
+        def merge(cls, checks: Iterable[Matcher.LabelCheck]) -> Matcher.LabelCheck:
+            checks = tuple(checks)
+            return cls(
+                field=checks[0].field,
+                values=frozenset().union(*map(attrgetter('values'), checks)),
+                does_match_empty=any(map(attrgetter('does_match_empty'), checks)),
+            )
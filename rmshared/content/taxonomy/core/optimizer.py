@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from itertools import chain
+from operator import attrgetter
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Iterable
+from typing import Mapping
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+from typing import Union
+
+from rmshared.tools import ensure_map_is_complete
+from rmshared.tools import group_to_mapping
+
+from rmshared.content.taxonomy.core import encoders
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core.abc import IOptimizer
+from rmshared.content.taxonomy.core.matcher import Matcher
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+Label = TypeVar('Label', bound=labels.Label)
+Range = TypeVar('Range', bound=ranges.Range)
+Item = Union[labels.Label, ranges.Range]
+
+
+class Optimizer(IOptimizer):
+    """
+    Rewrites filters into a canonical form that matches exactly the same entities:
+    - labels and ranges are deduplicated and sorted, overlapping ranges on the same field are merged;
+    - `NoLabels` filters are merged into one, and so are `NoRanges` filters;
+    - filters that never reject anything are dropped, and so are `AnyLabel`/`AnyRange` filters implied by narrower ones;
+    - filters are ordered by their estimated selectivity (`AnyLabel` with fewer labels first).
+
+    Filters that can't match anything are replaced with `NEVER`.
+    """
+
+    NEVER: Tuple[filters.Filter, ...] = (filters.AnyLabel(labels=()), )
+
+    def __init__(self, keys: encoders.IComposite):
+        self.keys = keys
+        self.filter_to_normalizer_map: Mapping[Type[Filter], Callable[[Filter], Filter]] = ensure_map_is_complete(filters.Filter, {
+            filters.AnyLabel: self._normalize_labels_filter,
+            filters.NoLabels: self._normalize_labels_filter,
+            filters.AnyRange: self._normalize_ranges_filter,
+            filters.NoRanges: self._normalize_ranges_filter,
+        })
+        self.filter_to_items_getter_map: Mapping[Type[Filter], Callable[[Filter], Collection[Item]]] = ensure_map_is_complete(filters.Filter, {
+            filters.AnyLabel: attrgetter('labels'),
+            filters.NoLabels: attrgetter('labels'),
+            filters.AnyRange: attrgetter('ranges'),
+            filters.NoRanges: attrgetter('ranges'),
+        })
+        self.filter_to_rank_map: Mapping[Type[Filter], int] = ensure_map_is_complete(filters.Filter, {
+            filters.AnyLabel: 0,
+            filters.AnyRange: 1,
+            filters.NoLabels: 2,
+            filters.NoRanges: 3,
+        })
+        self.matcher = Matcher()
+
+    @classmethod
+    def is_never(cls, filters_: Iterable[Filter]) -> bool:
+        return tuple(filters_) == cls.NEVER
+
+    def optimize_filters(self, filters_):
+        type_to_filters_map = group_to_mapping(set(map(self._normalize_filter, filters_)), key_func=type)
+        any_label_filters = self._drop_implied_filters(type_to_filters_map.get(filters.AnyLabel, []))
+        any_range_filters = self._drop_implied_filters(type_to_filters_map.get(filters.AnyRange, []))
+        no_labels_filters = self._merge_filters(type_to_filters_map.get(filters.NoLabels, []))
+        no_ranges_filters = self._merge_filters(type_to_filters_map.get(filters.NoRanges, []))
+
+        if self._is_contradiction(any_label_filters, any_range_filters, no_labels_filters):
+            return self.NEVER
+        else:
+            filters_ = chain(any_label_filters, any_range_filters, no_labels_filters, no_ranges_filters)
+            return tuple(sorted(filters_, key=self._get_filter_order_key))
+
+    def _normalize_filter(self, filter_: Filter) -> Filter:
+        return self.filter_to_normalizer_map[type(filter_)](filter_)
+
+    def _normalize_labels_filter(self, filter_: Union[filters.AnyLabel, filters.NoLabels]) -> Filter:
+        return type(filter_)(labels=tuple(sorted(set(filter_.labels), key=self.keys.encode_label)))
+
+    def _normalize_ranges_filter(self, filter_: Union[filters.AnyRange, filters.NoRanges]) -> Filter:
+        field_to_ranges_map = group_to_mapping(set(filter_.ranges), key_func=attrgetter('field'))
+        ranges_ = chain.from_iterable(map(self._merge_ranges, field_to_ranges_map.values()))
+        return type(filter_)(ranges=tuple(sorted(ranges_, key=self.keys.encode_range)))
+
+    def _merge_ranges(self, ranges_: Sequence[Range]) -> Sequence[Range]:
+        try:
+            intervals = self.matcher.merge_ranges(ranges_)
+        except TypeError:  # Bounds of different types can't be ordered, the ranges are kept as they are
+            return ranges_
+
+        if Matcher.Interval(min_value=None, max_value=None) in intervals:
+            return ranges_
+        else:
+            field = ranges_[0].field
+            return tuple(map(lambda interval: self._make_range(field, interval), intervals))
+
+    @staticmethod
+    def _make_range(field: Any, interval: Matcher.Interval) -> Range:
+        if interval.min_value is None:
+            return ranges.LessThan(field=field, value=interval.max_value)
+        elif interval.max_value is None:
+            return ranges.MoreThan(field=field, value=interval.min_value)
+        else:
+            return ranges.Between(field=field, min_value=interval.min_value, max_value=interval.max_value)
+
+    def _drop_implied_filters(self, filters_: Sequence[Filter]) -> Sequence[Filter]:
+        def is_implied(filter_: Filter) -> bool:
+            items = frozenset(self._get_filter_items(filter_))
+            return any(map(lambda other: frozenset(self._get_filter_items(other)) < items, filters_))
+
+        return tuple(filter(lambda filter_: not is_implied(filter_), filters_))
+
+    def _merge_filters(self, filters_: Sequence[Filter]) -> Sequence[Filter]:
+        if len(filters_) > 1:
+            filters_ = [type(filters_[0])(tuple(chain.from_iterable(map(self._get_filter_items, filters_))))]
+        return tuple(map(self._normalize_filter, filter(self._get_filter_items, filters_)))
+
+    def _is_contradiction(self, any_label_filters: Sequence[Filter], any_range_filters: Sequence[Filter], no_labels_filters: Sequence[Filter]) -> bool:
+        excluded_labels = frozenset(chain.from_iterable(map(self._get_filter_items, no_labels_filters)))
+        return any(map(lambda filter_: frozenset(self._get_filter_items(filter_)) <= excluded_labels, chain(any_label_filters, any_range_filters)))
+
+    def _get_filter_order_key(self, filter_: Filter) -> Tuple[int, int, str]:
+        return self.filter_to_rank_map[type(filter_)], len(self._get_filter_items(filter_)), self.keys.encode_filter(filter_)
+
+    def _get_filter_items(self, filter_: Filter) -> Collection[Item]:
+        return self.filter_to_items_getter_map[type(filter_)](filter_)
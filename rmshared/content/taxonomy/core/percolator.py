@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+from abc import ABCMeta
+from abc import abstractmethod
+from bisect import bisect_left
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.abc import IPercolator
+from rmshared.content.taxonomy.core.abc import Key
+from rmshared.content.taxonomy.core.entities import CachedEntity
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+Label = TypeVar('Label', bound=labels.Label)
+Range = TypeVar('Range', bound=ranges.Range)
+Entry = TypeVar('Entry')
+
+
+class Percolator(IPercolator[Key]):
+    """
+    Finds the stored filter sets an entity matches without testing each one of them.
+
+    Every filter set is indexed by a single positive filter (`AnyLabel` or `AnyRange`) the entity must match anyway,
+    so only the sets whose anchor filter matches the entity are passed to the exact matching.
+    """
+
+    def __init__(self, matcher: IMatcher):
+        self.matcher = matcher
+        self.filter_to_index_map: Mapping[Type[Filter], Percolator.IIndex[Filter]] = {
+            filters.AnyLabel: self.Labels(),
+            filters.AnyRange: self.Ranges(),
+        }
+        self.key_to_predicate_map: Dict[Key, Callable[[IEntity], bool]] = dict()
+        self.key_to_anchor_map: Dict[Key, Optional[Filter]] = dict()
+        self.unindexed_keys: Set[Key] = set()
+
+    def add_filters(self, key, filters_):
+        filters_ = tuple(filters_)
+        self.remove_filters(key)
+
+        anchor = self._find_anchor(filters_)
+        if anchor is None:
+            self.unindexed_keys.add(key)
+        else:
+            self.filter_to_index_map[type(anchor)].add_filter(key, anchor)
+
+        self.key_to_anchor_map[key] = anchor
+        self.key_to_predicate_map[key] = self.matcher.compile(filters_)
+
+    def remove_filters(self, key):
+        if key not in self.key_to_predicate_map:
+            return
+
+        anchor = self.key_to_anchor_map.pop(key)
+        if anchor is None:
+            self.unindexed_keys.discard(key)
+        else:
+            self.filter_to_index_map[type(anchor)].remove_filter(key, anchor)
+
+        del self.key_to_predicate_map[key]
+
+    def percolate(self, entity):
+        entity = CachedEntity.wrap(entity)
+        candidate_keys = set(self.unindexed_keys)
+        for index in self.filter_to_index_map.values():
+            candidate_keys.update(index.stream_keys(entity))
+        return set(filter(lambda key: self.key_to_predicate_map[key](entity), candidate_keys))
+
+    def _find_anchor(self, filters_: Iterable[Filter]) -> Optional[Filter]:
+        anchors = filter(lambda filter_: type(filter_) in self.filter_to_index_map, filters_)
+        return min(anchors, key=self._estimate_anchor_cost, default=None)
+
+    def _estimate_anchor_cost(self, filter_: Filter) -> int:
+        return self.filter_to_index_map[type(filter_)].estimate_filter_cost(filter_)
+
+    class IIndex(Generic[Filter], metaclass=ABCMeta):
+        @abstractmethod
+        def add_filter(self, key: Key, filter_: Filter) -> None:
+            ...
+
+        @abstractmethod
+        def remove_filter(self, key: Key, filter_: Filter) -> None:
+            ...
+
+        @abstractmethod
+        def stream_keys(self, entity: IEntity) -> Iterator[Key]:
+            ...
+
+        @abstractmethod
+        def estimate_filter_cost(self, filter_: Filter) -> int:
+            ...
+
+    class Labels(IIndex[filters.AnyLabel]):
+        EMPTY = object()
+        EMPTY_LABEL_COST = 100
+
+        def __init__(self):
+            self.field_to_value_to_keys_map: Dict[fields.Field, Dict[Any, Set[Key]]] = dict()
+            self.label_to_value_getter_map: Mapping[Type[Label], Callable[[Label], Any]] = {
+                labels.Value: self._get_value_label_value,
+                labels.Badge: self._get_badge_label_value,
+                labels.Empty: self._get_empty_label_value,
+            }
+
+        def add_filter(self, key, filter_):
+            for label in filter_.labels:
+                value_to_keys_map = self.field_to_value_to_keys_map.setdefault(label.field, dict())
+                value_to_keys_map.setdefault(self._get_label_value(label), set()).add(key)
+
+        def remove_filter(self, key, filter_):
+            for label in filter_.labels:
+                value_to_keys_map = self.field_to_value_to_keys_map.get(label.field, dict())
+                value = self._get_label_value(label)
+                keys = value_to_keys_map.get(value, set())
+                keys.discard(key)
+                if not keys:
+                    value_to_keys_map.pop(value, None)
+                if not value_to_keys_map:
+                    self.field_to_value_to_keys_map.pop(label.field, None)
+
+        def stream_keys(self, entity):
+            for field, value_to_keys_map in self.field_to_value_to_keys_map.items():
+                values = entity.get_values(field)
+                if len(values) == 0:
+                    yield from value_to_keys_map.get(self.EMPTY, ())
+                for value in values:
+                    yield from value_to_keys_map.get(value, ())
+
+        def estimate_filter_cost(self, filter_):
+            return sum(map(lambda label: self.EMPTY_LABEL_COST if isinstance(label, labels.Empty) else 1, filter_.labels))
+
+        def _get_label_value(self, label: Label) -> Any:
+            return self.label_to_value_getter_map[type(label)](label)
+
+        @staticmethod
+        def _get_value_label_value(label: labels.Value) -> Any:
+            return label.value
+
+        @staticmethod
+        def _get_badge_label_value(_: labels.Badge) -> Any:
+            return True
+
+        def _get_empty_label_value(self, _: labels.Empty) -> Any:
+            return self.EMPTY
+
+    class Ranges(IIndex[filters.AnyRange]):
+        RANGE_COST = 10
+
+        def __init__(self):
+            self.field_to_intervals_map: Dict[fields.Field, Percolator.Intervals] = dict()
+
+        def add_filter(self, key, filter_):
+            for range_ in filter_.ranges:
+                self.field_to_intervals_map.setdefault(range_.field, Percolator.Intervals()).add_range(key, range_)
+
+        def remove_filter(self, key, filter_):
+            for range_ in filter_.ranges:
+                intervals = self.field_to_intervals_map.get(range_.field, Percolator.Intervals())
+                intervals.remove_range(key, range_)
+                if intervals.is_empty():
+                    self.field_to_intervals_map.pop(range_.field, None)
+
+        def stream_keys(self, entity):
+            for field, intervals in self.field_to_intervals_map.items():
+                for value in entity.get_values(field):
+                    yield from intervals.stream_keys(value)
+
+        def estimate_filter_cost(self, filter_):
+            return self.RANGE_COST * len(filter_.ranges)
+
+    class Intervals:
+        def __init__(self):
+            self.between: Percolator.IntervalTree[Key] = Percolator.IntervalTree()
+            self.less_than: Percolator.Bounds[Key] = Percolator.Bounds()
+            self.more_than: Percolator.Bounds[Key] = Percolator.Bounds()
+            self.range_to_adder_map: Mapping[Type[Range], Callable[[Key, Range], None]] = {
+                ranges.Between: self._add_between_range,
+                ranges.LessThan: self._add_less_than_range,
+                ranges.MoreThan: self._add_more_than_range,
+            }
+            self.range_to_remover_map: Mapping[Type[Range], Callable[[Key, Range], None]] = {
+                ranges.Between: self._remove_between_range,
+                ranges.LessThan: self._remove_less_than_range,
+                ranges.MoreThan: self._remove_more_than_range,
+            }
+
+        def add_range(self, key: Key, range_: Range) -> None:
+            self.range_to_adder_map[type(range_)](key, range_)
+
+        def remove_range(self, key: Key, range_: Range) -> None:
+            self.range_to_remover_map[type(range_)](key, range_)
+
+        def is_empty(self) -> bool:
+            return not (self.between.intervals or self.less_than.bounds or self.more_than.bounds)
+
+        def stream_keys(self, value: Any) -> Iterator[Key]:
+            yield from self.between.stream_entries_containing(value)
+            yield from self.less_than.stream_entries_down_to(value)
+            yield from self.more_than.stream_entries_up_to(value)
+
+        def _add_between_range(self, key: Key, range_: ranges.Between) -> None:
+            self.between.add_interval(range_.min_value, range_.max_value, key)
+
+        def _add_less_than_range(self, key: Key, range_: ranges.LessThan) -> None:
+            self.less_than.add_entry(range_.value, key)
+
+        def _add_more_than_range(self, key: Key, range_: ranges.MoreThan) -> None:
+            self.more_than.add_entry(range_.value, key)
+
+        def _remove_between_range(self, key: Key, range_: ranges.Between) -> None:
+            self.between.remove_interval(range_.min_value, range_.max_value, key)
+
+        def _remove_less_than_range(self, key: Key, range_: ranges.LessThan) -> None:
+            self.less_than.remove_entry(range_.value, key)
+
+        def _remove_more_than_range(self, key: Key, range_: ranges.MoreThan) -> None:
+            self.more_than.remove_entry(range_.value, key)
+
+    class Bounds(Generic[Entry]):
+        def __init__(self):
+            self.bounds: List[Any] = []
+            self.entries: List[Entry] = []
+
+        def add_entry(self, bound: Any, entry: Entry) -> None:
+            index = bisect_right(self.bounds, bound)
+            self.bounds.insert(index, bound)
+            self.entries.insert(index, entry)
+
+        def remove_entry(self, bound: Any, entry: Entry) -> None:
+            for index in range(bisect_left(self.bounds, bound), bisect_right(self.bounds, bound)):
+                if self.entries[index] == entry:
+                    del self.bounds[index]
+                    del self.entries[index]
+                    return
+
+        def stream_entries_up_to(self, value: Any) -> Iterator[Entry]:
+            return islice(self.entries, bisect_right(self.bounds, value))
+
+        def stream_entries_down_to(self, value: Any) -> Iterator[Entry]:
+            return map(self.entries.__getitem__, range(bisect_left(self.bounds, value), len(self.entries)))
+
+    class IntervalTree(Generic[Entry]):
+        """
+        Finds the intervals containing a value in logarithmic time plus the number of the intervals found. It is a
+        centered interval tree, rebuilt by the first lookup after intervals were added or removed.
+        """
+
+        def __init__(self):
+            self.intervals: List[Tuple[Any, Any, Entry]] = []
+            self.root: Optional[Percolator.IntervalTree.Node[Entry]] = None
+            self.is_stale = False
+
+        def add_interval(self, min_value: Any, max_value: Any, entry: Entry) -> None:
+            self.intervals.append((min_value, max_value, entry))
+            self.is_stale = True
+
+        def remove_interval(self, min_value: Any, max_value: Any, entry: Entry) -> None:
+            try:
+                self.intervals.remove((min_value, max_value, entry))
+            except ValueError:
+                pass
+            else:
+                self.is_stale = True
+
+        def stream_entries_containing(self, value: Any) -> Iterator[Entry]:
+            if self.is_stale:
+                self.root = self._make_node(list(filter(lambda interval: interval[0] <= interval[1], self.intervals)))
+                self.is_stale = False
+
+            node = self.root
+            while node is not None:
+                if value < node.center:
+                    for min_value, _, entry in node.by_min_value:
+                        if min_value > value:
+                            break
+                        yield entry
+                    node = node.left
+                elif value > node.center:
+                    for _, max_value, entry in node.by_max_value:
+                        if max_value < value:
+                            break
+                        yield entry
+                    node = node.right
+                else:
+                    yield from map(lambda interval: interval[2], node.by_min_value)
+                    break
+
+        @classmethod
+        def _make_node(cls, intervals: Sequence[Tuple[Any, Any, Entry]]) -> Optional[Percolator.IntervalTree.Node[Entry]]:
+            if not intervals:
+                return None
+
+            center = sorted(bound for interval in intervals for bound in interval[:2])[len(intervals)]
+            left_intervals = list(filter(lambda interval: interval[1] < center, intervals))
+            right_intervals = list(filter(lambda interval: interval[0] > center, intervals))
+            center_intervals = list(filter(lambda interval: interval[0] <= center <= interval[1], intervals))
+            return cls.Node(
+                center=center,
+                by_min_value=sorted(center_intervals, key=lambda interval: interval[0]),
+                by_max_value=sorted(center_intervals, key=lambda interval: interval[1], reverse=True),
+                left=cls._make_node(left_intervals),
+                right=cls._make_node(right_intervals),
+            )
+
+        @dataclass(frozen=True)
+        class Node(Generic[Entry]):
+            center: Any
+            by_min_value: Sequence[Tuple[Any, Any, Entry]]  # Intervals containing the center
+            by_max_value: Sequence[Tuple[Any, Any, Entry]]
+            left: Optional[Percolator.IntervalTree.Node[Entry]]  # Intervals below the center
+            right: Optional[Percolator.IntervalTree.Node[Entry]]  # Intervals above the center
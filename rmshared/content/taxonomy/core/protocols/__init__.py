@@ -1,5 +1,9 @@
+from rmshared.content.taxonomy.core.protocols import binary
+from rmshared.content.taxonomy.core.protocols import caching
 from rmshared.content.taxonomy.core.protocols import db
 from rmshared.content.taxonomy.core.protocols import ui
+from rmshared.content.taxonomy.core.protocols import interning
+from rmshared.content.taxonomy.core.protocols import jsonl
 from rmshared.content.taxonomy.core.protocols.abc import IBuilder
 from rmshared.content.taxonomy.core.protocols.abc import IComposite
 from rmshared.content.taxonomy.core.protocols.abc import IFilters
@@ -10,14 +14,20 @@ from rmshared.content.taxonomy.core.protocols.abc import IEvents
 from rmshared.content.taxonomy.core.protocols.abc import IValues
 from rmshared.content.taxonomy.core.protocols.factory import Factory
 from rmshared.content.taxonomy.core.protocols.composite import Composite
+from rmshared.content.taxonomy.core.protocols.decoder import Decoder
 
 __all__ = (
+    'binary',
+    'caching',
     'db',
     'ui',
+    'interning',
+    'jsonl',
 
     'IBuilder',
 
     'Factory',
+    'Decoder',
 
     'IFilters',
     'ILabels',
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Tuple
+from typing import TypeVar
+from weakref import ref
+
+from orjson import orjson
+
+from rmshared.content.taxonomy.core.protocols.abc import IBuilder
+from rmshared.content.taxonomy.core.protocols.abc import IFilters
+from rmshared.content.taxonomy.core.protocols.abc import ILabels
+from rmshared.content.taxonomy.core.protocols.abc import IRanges
+from rmshared.content.taxonomy.core.protocols.abc import IFields
+
+Object = TypeVar('Object')
+
+
+class Cache:
+    """
+    Remembers the objects made of sub-documents by their canonical JSON bytes, keeping the `max_size` least recently
+    used ones. The objects are immutable, so the same one is returned for every equal sub-document. Data that can't be
+    serialized (e.g. with non-string keys) is made every time and counted as skipped.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        assert max_size > 0, max_size
+        self.max_size = max_size
+        self.key_to_object_map: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skips = 0
+
+    def get_or_make(self, kind: str, data: Any, make_object: Callable[[Any], Object]) -> Object:
+        try:
+            key = self._make_key(kind, data)
+        except TypeError:
+            self.skips += 1
+            return make_object(data)
+
+        object_ = self.key_to_object_map.get(key)
+        if object_ is not None:
+            self.hits += 1
+            self.key_to_object_map.move_to_end(key)
+            return object_
+
+        self.misses += 1
+        object_ = self.key_to_object_map[key] = make_object(data)
+        if len(self.key_to_object_map) > self.max_size:
+            self.key_to_object_map.popitem(last=False)
+            self.evictions += 1
+        return object_
+
+    @staticmethod
+    def _make_key(kind: str, data: Any) -> Tuple[str, bytes]:
+        return kind, orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+    def clear(self) -> None:
+        self.key_to_object_map.clear()
+
+    @property
+    def metrics(self) -> Cache.Metrics:
+        return self.Metrics(size=len(self), hits=self.hits, misses=self.misses, evictions=self.evictions, skips=self.skips)
+
+    def __len__(self) -> int:
+        return len(self.key_to_object_map)
+
+    @dataclass(frozen=True)
+    class Metrics:
+        size: int
+        hits: int
+        misses: int
+        evictions: int
+        skips: int
+
+        @property
+        def hit_ratio(self) -> float:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else 0.0
+
+
+class Dumper:
+    """
+    Remembers the JSON bytes of every filter it dumped for as long as the filter is alive, so that filters served over
+    and over are jsonified and dumped once. Filters are looked up by identity rather than equality, because equal
+    filters may still be dumped differently, e.g. `Value(field, 1)` and `Value(field, True)`.
+    """
+
+    def __init__(self, filters: IFilters):
+        self.filters = filters
+        self.id_to_entry_map: Dict[int, Tuple[ref, bytes]] = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def dumps_filter(self, filter_: Any) -> bytes:
+        entry = self.id_to_entry_map.get(id(filter_))
+        if entry is not None and entry[0]() is filter_:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        buf = orjson.dumps(self.filters.jsonify_filter(filter_))
+        try:
+            self.id_to_entry_map[id(filter_)] = ref(filter_, partial(self._forget, id(filter_))), buf
+        except TypeError:  # Not weakly referable
+            pass
+        return buf
+
+    def dumps_filters(self, filters: Iterable[Any]) -> bytes:
+        return b'[' + b','.join(map(self.dumps_filter, filters)) + b']'
+
+    def _forget(self, id_: int, ref_: ref) -> None:
+        entry = self.id_to_entry_map.get(id_)
+        if entry is not None and entry[0] is ref_:
+            del self.id_to_entry_map[id_]
+
+    def __len__(self) -> int:
+        return len(self.id_to_entry_map)
+
+
+class Builder(IBuilder):
+    """
+    Caches the fields, labels and ranges the delegate makes, so that repeated sub-documents are parsed once and the
+    filters share the objects made of them.
+    """
+
+    def __init__(self, delegate: IBuilder, cache: Cache):
+        self.delegate = delegate
+        self.cache = cache
+
+    def make_filters(self, labels, ranges):
+        return self.delegate.make_filters(labels, ranges)
+
+    def make_labels(self, fields, values):
+        return Labels(self.delegate.make_labels(fields, values), self.cache)
+
+    def make_ranges(self, fields, values):
+        return Ranges(self.delegate.make_ranges(fields, values), self.cache)
+
+    def make_fields(self):
+        return Fields(self.delegate.make_fields(), self.cache)
+
+    def make_events(self):
+        return self.delegate.make_events()
+
+    def make_values(self):
+        return self.delegate.make_values()
+
+
+class Labels(ILabels):
+    def __init__(self, delegate: ILabels, cache: Cache):
+        self.delegate = delegate
+        self.cache = cache
+
+    def make_label(self, data):
+        return self.cache.get_or_make('label', data, self.delegate.make_label)
+
+    def jsonify_label(self, label):
+        return self.delegate.jsonify_label(label)
+
+
+class Ranges(IRanges):
+    def __init__(self, delegate: IRanges, cache: Cache):
+        self.delegate = delegate
+        self.cache = cache
+
+    def make_range(self, data):
+        return self.cache.get_or_make('range', data, self.delegate.make_range)
+
+    def jsonify_range(self, range_):
+        return self.delegate.jsonify_range(range_)
+
+
+class Fields(IFields):
+    def __init__(self, delegate: IFields, cache: Cache):
+        self.delegate = delegate
+        self.cache = cache
+
+    def make_field(self, data):
+        return self.cache.get_or_make('field', data, self.delegate.make_field)
+
+    def jsonify_field(self, field):
+        return self.delegate.jsonify_field(field)
@@ -28,7 +28,7 @@ class Fields(IFields[fields.Field]):
         )
 
     def make_field(self, data):
-        return self.field_type_to_delegate_map[str(data['type'])].make_field(dict(data['info']))
+        return self.field_type_to_delegate_map[str(data['type'])].make_field(data['info'])
 
     def jsonify_field(self, field):
         delegate = self.field_to_delegate_map[type(field)]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from abc import ABCMeta
+from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+
+from orjson import orjson
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core.protocols import ui
+from rmshared.content.taxonomy.core.protocols import db
+from rmshared.content.taxonomy.core.protocols import jsonl
+from rmshared.content.taxonomy.core.protocols.abc import IFilters
+from rmshared.content.taxonomy.core.protocols.factory import Factory
+from rmshared.content.taxonomy.core.protocols.ui.values import Values
+
+
+class Decoder:
+    """
+    Makes filters in a single pass over the data with one flat dispatch table per level, instead of going through the
+    delegates of the protocol. Data the decoder doesn't recognize, such as variables or malformed data, is handed over
+    to the `fallback` protocol, which makes the same filters or raises the same errors as it would on its own.
+
+    System fields are a closed set of names, so they are made once per decoder and shared between the filters.
+    """
+
+    VALUE_TYPES = Values.types
+
+    @classmethod
+    def make_instance_for_ui(cls, fallback: Optional[IFilters] = None) -> Decoder:
+        return cls(cls.UiFields(), fallback or Factory(builder=ui.Builder()).make_filters())
+
+    @classmethod
+    def make_instance_for_db(cls, fallback: Optional[IFilters] = None) -> Decoder:
+        return cls(cls.DbFields(), fallback or Factory(builder=db.Builder()).make_filters())
+
+    def __init__(self, fields_: Decoder.IFields, fallback: IFilters):
+        self.make_field = fields_.make_field
+        self.fallback = fallback
+        self.name_to_filter_maker_map: Mapping[str, Callable[[Any], filters.Filter]] = {
+            'any_label': lambda info: filters.AnyLabel(labels=tuple(map(self._make_label, info))),
+            'no_labels': lambda info: filters.NoLabels(labels=tuple(map(self._make_label, info))),
+            'any_range': lambda info: filters.AnyRange(ranges=tuple(map(self._make_range, info))),
+            'no_ranges': lambda info: filters.NoRanges(ranges=tuple(map(self._make_range, info))),
+        }
+        self.name_to_label_maker_map: Mapping[str, Callable[[Any], labels.Label]] = {
+            'value': lambda info: labels.Value(field=self.make_field(info['field']), value=self._make_value(info['value'])),
+            'badge': lambda info: labels.Badge(field=self.make_field(info['field'])),
+            'empty': lambda info: labels.Empty(field=self.make_field(info['field'])),
+        }
+
+    def make_filter(self, data: Mapping[str, Any]) -> filters.Filter:
+        try:
+            (name, info), = data.items()
+            return self.name_to_filter_maker_map[name](info)
+        except (LookupError, TypeError, ValueError, AttributeError):
+            return self.fallback.make_filter(data)
+
+    def make_filters(self, data: Iterable[Mapping[str, Any]]) -> Iterator[filters.Filter]:
+        return map(self.make_filter, data)
+
+    def make_filters_from_bytes(self, buf: bytes | str) -> Iterator[filters.Filter]:
+        return self.make_filters(orjson.loads(buf))
+
+    def iter_filters_from_jsonl(self, fileobj: Iterable[bytes | str]) -> Iterator[jsonl.Record]:
+        return jsonl.iter_records(fileobj, make_filters=self.make_filters)
+
+    def _make_label(self, data: Mapping[str, Any]) -> labels.Label:
+        (name, info), = data.items()
+        return self.name_to_label_maker_map[name](info)
+
+    def _make_range(self, data: Mapping[str, Any]) -> ranges.Range:
+        keys_count = len(data)
+        if keys_count == 3:
+            return ranges.Between(field=self.make_field(data['field']), min_value=self._make_value(data['min']), max_value=self._make_value(data['max']))
+        elif keys_count == 2 and 'min' in data:
+            return ranges.MoreThan(field=self.make_field(data['field']), value=self._make_value(data['min']))
+        elif keys_count == 2:
+            return ranges.LessThan(field=self.make_field(data['field']), value=self._make_value(data['max']))
+        else:
+            raise ValueError(data)
+
+    def _make_value(self, data: Any) -> str | int | float:
+        if isinstance(data, self.VALUE_TYPES):
+            return data
+        else:
+            raise ValueError(data)
+
+    class IFields(metaclass=ABCMeta):
+        @abstractmethod
+        def make_field(self, data: Any) -> fields.Field:
+            ...
+
+    class Fields(IFields, metaclass=ABCMeta):
+        def __init__(self):
+            self.name_to_system_field_map: Dict[str, fields.System] = dict()
+
+        def _make_system_field(self, name: str) -> fields.System:
+            field = self.name_to_system_field_map.get(name)
+            if field is None:
+                field = self.name_to_system_field_map[name] = fields.System(name=str(name))
+            return field
+
+    class UiFields(Fields):
+        def make_field(self, data):
+            (name, info), = data.items()
+            if type(info) is not dict:
+                raise TypeError(info)
+            elif not info:
+                return self._make_system_field(name)
+            elif len(info) == 1:
+                return fields.Custom(name=str(name), path=str(info['path']))
+            else:
+                raise ValueError(info)
+
+    class DbFields(Fields):
+        def make_field(self, data):
+            type_, info = data['type'], data['info']
+            if type_ == 'system':
+                return self._make_system_field(info['name'])
+            elif type_ == 'custom':
+                return fields.Custom(name=str(info['name']), path=str(info['path']))
+            else:
+                raise ValueError(type_)
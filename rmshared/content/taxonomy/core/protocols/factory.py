@@ -1,4 +1,16 @@
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from orjson import orjson
+
+from rmshared.content.taxonomy.core.interning import Interner
+from rmshared.content.taxonomy.core.protocols import binary
+from rmshared.content.taxonomy.core.protocols import caching
 from rmshared.content.taxonomy.core.protocols import db
+from rmshared.content.taxonomy.core.protocols import interning
+from rmshared.content.taxonomy.core.protocols import jsonl
 from rmshared.content.taxonomy.core.protocols import ui
 from rmshared.content.taxonomy.core.protocols.abc import IBuilder
 from rmshared.content.taxonomy.core.protocols.abc import IComposite
@@ -13,12 +25,17 @@ from rmshared.content.taxonomy.core.protocols.composite import Composite
 
 class Factory:
     @classmethod
-    def make_instance_for_ui(cls) -> 'Factory':
-        return cls(builder=ui.Builder())
+    def make_instance_for_ui(cls, interner: Optional[Interner] = None, cache: Optional[caching.Cache] = None) -> 'Factory':
+        return cls(builder=cls._make_builder(ui.Builder(), interner, cache))
 
     @classmethod
-    def make_instance_for_db(cls) -> 'Factory':
-        return cls(builder=db.Builder())
+    def make_instance_for_db(cls, interner: Optional[Interner] = None, cache: Optional[caching.Cache] = None) -> 'Factory':
+        return cls(builder=cls._make_builder(db.Builder(), interner, cache))
+
+    @staticmethod
+    def _make_builder(builder: IBuilder, interner: Optional[Interner], cache: Optional[caching.Cache]) -> IBuilder:
+        builder = builder if cache is None else caching.Builder(builder, cache)
+        return builder if interner is None else interning.Builder(builder, interner)
 
     def __init__(self, builder: IBuilder):
         self.builder = builder
@@ -32,6 +49,9 @@ class Factory:
         filters = self.builder.make_filters(labels, ranges)
         return Composite(filters, labels, ranges, fields, events, values)
 
+    def make_binary(self) -> binary.Protocol:
+        return binary.Protocol(self.make_composite(), binary.Codec())
+
     def make_filters(self) -> IFilters:
         values = self.builder.make_values()
         fields = self.builder.make_fields()
@@ -39,6 +59,20 @@ class Factory:
         ranges = self.builder.make_ranges(fields, values)
         return self.builder.make_filters(labels, ranges)
 
+    def make_dumper(self) -> caching.Dumper:
+        return caching.Dumper(self.make_filters())
+
+    def make_filters_from_bytes(self, buf: bytes | str) -> Iterator[Any]:
+        return map(self.make_filters().make_filter, orjson.loads(buf))
+
+    def iter_filters_from_jsonl(self, fileobj: Iterable[bytes | str]) -> Iterator[jsonl.Record]:
+        """
+        Makes the filters of every line of `fileobj`, each line being a JSON array of filters. A bad line doesn't stop
+        the iteration, it is yielded as a record with the error, the line number and the offset.
+        """
+        filters = self.make_filters()
+        return jsonl.iter_records(fileobj, make_filters=lambda data: map(filters.make_filter, data))
+
     def make_labels(self) -> ILabels:
         values = self.builder.make_values()
         fields = self.builder.make_fields()
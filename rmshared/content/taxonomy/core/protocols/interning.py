@@ -0,0 +1,83 @@
+from rmshared.content.taxonomy.core.interning import Interner
+from rmshared.content.taxonomy.core.protocols.abc import IBuilder
+from rmshared.content.taxonomy.core.protocols.abc import IFilters
+from rmshared.content.taxonomy.core.protocols.abc import ILabels
+from rmshared.content.taxonomy.core.protocols.abc import IRanges
+from rmshared.content.taxonomy.core.protocols.abc import IFields
+
+
+class Builder(IBuilder):
+    """
+    Interns the fields, labels, ranges and filters the delegate makes, so that equal ones parsed from different
+    documents are the same objects.
+    """
+
+    def __init__(self, delegate: IBuilder, interner: Interner):
+        self.delegate = delegate
+        self.interner = interner
+
+    def make_filters(self, labels, ranges):
+        return Filters(self.delegate.make_filters(labels, ranges), self.interner)
+
+    def make_labels(self, fields, values):
+        return Labels(self.delegate.make_labels(fields, values), self.interner)
+
+    def make_ranges(self, fields, values):
+        return Ranges(self.delegate.make_ranges(fields, values), self.interner)
+
+    def make_fields(self):
+        return Fields(self.delegate.make_fields(), self.interner)
+
+    def make_events(self):
+        return self.delegate.make_events()
+
+    def make_values(self):
+        return self.delegate.make_values()
+
+
+class Filters(IFilters):
+    def __init__(self, delegate: IFilters, interner: Interner):
+        self.delegate = delegate
+        self.interner = interner
+
+    def make_filter(self, data):
+        return self.interner.intern(self.delegate.make_filter(data))
+
+    def jsonify_filter(self, filter_):
+        return self.delegate.jsonify_filter(filter_)
+
+
+class Labels(ILabels):
+    def __init__(self, delegate: ILabels, interner: Interner):
+        self.delegate = delegate
+        self.interner = interner
+
+    def make_label(self, data):
+        return self.interner.intern(self.delegate.make_label(data))
+
+    def jsonify_label(self, label):
+        return self.delegate.jsonify_label(label)
+
+
+class Ranges(IRanges):
+    def __init__(self, delegate: IRanges, interner: Interner):
+        self.delegate = delegate
+        self.interner = interner
+
+    def make_range(self, data):
+        return self.interner.intern(self.delegate.make_range(data))
+
+    def jsonify_range(self, range_):
+        return self.delegate.jsonify_range(range_)
+
+
+class Fields(IFields):
+    def __init__(self, delegate: IFields, interner: Interner):
+        self.delegate = delegate
+        self.interner = interner
+
+    def make_field(self, data):
+        return self.interner.intern(self.delegate.make_field(data))
+
+    def jsonify_field(self, field):
+        return self.delegate.jsonify_field(field)
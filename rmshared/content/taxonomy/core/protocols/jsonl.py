@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from orjson import orjson
+
+
+@dataclass(frozen=True)
+class Record:
+    """
+    One line of a JSON lines dump, where every line is a JSON array of filters. A line that failed to parse or to make
+    filters has no filters and the `error` instead, so the caller decides whether to skip, log or re-raise it.
+    """
+    number: int  # Starts at 1
+    offset: int  # Of the first character of the line, in bytes for binary files
+    filters: Tuple[Any, ...]
+    error: Optional[Exception] = None
+
+
+def iter_records(lines: Iterable[bytes | str], make_filters: Callable[[Any], Iterable[Any]]) -> Iterator[Record]:
+    offset = 0
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            try:
+                filters_ = tuple(make_filters(orjson.loads(line)))
+            except (ValueError, TypeError, AttributeError, LookupError, AssertionError) as e:
+                yield Record(number, offset, filters=tuple(), error=e)
+            else:
+                yield Record(number, offset, filters=filters_)
+        offset += len(line)
@@ -0,0 +1,39 @@
+from io import BytesIO
+
+from orjson import orjson
+
+from rmshared.content.taxonomy.core import protocols
+from rmshared.content.taxonomy.core.fakes import Fakes
+
+
+class TestJsonl:
+    def test_it_should_make_filters_from_bytes(self):
+        factory = protocols.Factory.make_instance_for_db()
+        composite = factory.make_composite()
+        filters_ = tuple(Fakes().sample_filters(min_size=20, max_size=20))
+        buf = orjson.dumps(list(map(composite.jsonify_filter, filters_)))
+        assert tuple(factory.make_filters_from_bytes(buf)) == filters_
+        assert tuple(factory.make_filters_from_bytes(buf.decode())) == filters_
+
+    def test_it_should_report_bad_lines(self):
+        factory = protocols.Factory.make_instance_for_ui()
+        decoder = protocols.Decoder.make_instance_for_ui()
+        composite = factory.make_composite()
+        filters_1 = tuple(Fakes().sample_filters(min_size=5, max_size=5))
+        filters_2 = tuple(Fakes().sample_filters(min_size=3, max_size=3))
+        lines = [
+            orjson.dumps(list(map(composite.jsonify_filter, filters_1))) + b'\n',
+            b'[{"any_label": [\n',
+            b'\n',
+            b'[{"no_filter": []}]\n',
+            orjson.dumps(list(map(composite.jsonify_filter, filters_2))),
+        ]
+
+        for records in (factory.iter_filters_from_jsonl(BytesIO(b''.join(lines))), decoder.iter_filters_from_jsonl(lines)):
+            record_1, record_2, record_4, record_5 = records
+            assert (record_1.number, record_1.offset, record_1.filters, record_1.error) == (1, 0, filters_1, None)
+            assert (record_2.number, record_2.offset, record_2.filters) == (2, len(lines[0]), tuple())
+            assert isinstance(record_2.error, ValueError)
+            assert (record_4.number, record_4.offset, record_4.filters) == (4, sum(map(len, lines[:3])), tuple())
+            assert isinstance(record_4.error, KeyError)
+            assert (record_5.number, record_5.offset, record_5.filters, record_5.error) == (5, sum(map(len, lines[:4])), filters_2, None)
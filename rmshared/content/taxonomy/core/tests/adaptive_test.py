@@ -0,0 +1,115 @@
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import encoders
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.adaptive import AdaptiveMatcher
+from rmshared.content.taxonomy.core.matcher import Matcher
+
+
+class TestAdaptiveMatcher:
+    @fixture
+    def keys(self) -> encoders.IFilters:
+        return encoders.Factory.make_instance_for_keys().make_filters()
+
+    @fixture
+    def matcher(self, keys: encoders.IFilters) -> AdaptiveMatcher:
+        return AdaptiveMatcher(matcher=self.CountingMatcher(Matcher()), keys=keys, reorder_interval=10, sample_interval=1)
+
+    def test_it_should_match_filters(self, matcher: AdaptiveMatcher):
+        entities = [self.Entity({self.FIELD_A: {1}, self.FIELD_B: {2}}), self.Entity({self.FIELD_A: {1}}), self.Entity({})]
+        assert matcher.match_many(entities, [self.FILTER_A, self.FILTER_B]) == [True, False, False]
+        assert matcher.match_many_as_bitmap(entities, [self.FILTER_A]) == 0b011
+        assert matcher.does_entity_match_filters(entities[0], [self.FILTER_A, self.FILTER_B]) is True
+        assert matcher.does_entity_match_filters(entities[2], []) is True
+
+    def test_it_should_evaluate_most_rejecting_filters_first(self, matcher: AdaptiveMatcher):
+        does_entity_match_filters = matcher.compile([self.FILTER_A, self.FILTER_B])
+        entity = self.Entity({self.FIELD_A: {1}})
+        for _ in range(20):
+            assert does_entity_match_filters(entity) is False
+
+        matcher.matcher.filter_to_calls_count_map.clear()
+        for _ in range(10):
+            assert does_entity_match_filters(entity) is False
+        assert matcher.matcher.filter_to_calls_count_map == {self.FILTER_B: 10}
+
+    def test_it_should_time_every_nth_evaluation(self, keys: encoders.IFilters):
+        matcher = AdaptiveMatcher(matcher=Matcher(), keys=keys, sample_interval=4)
+        does_entity_match_filters = matcher.compile([self.FILTER_A, self.FILTER_B])
+        entity = self.Entity({self.FIELD_A: {1}, self.FIELD_B: {2}})
+        for _ in range(9):
+            assert does_entity_match_filters(entity) is True
+        assert matcher.export_stats()[keys.encode_filter(self.FILTER_A)]['calls_count'] == 3
+
+    def test_it_should_stop_timing_stable_plans(self, matcher: AdaptiveMatcher, keys: encoders.IFilters):
+        does_entity_match_filters = matcher.compile([self.FILTER_A, self.FILTER_B])
+        entity = self.Entity({self.FIELD_A: {1}})
+        for _ in range(100):
+            assert does_entity_match_filters(entity) is False
+
+        calls_count = matcher.export_stats()[keys.encode_filter(self.FILTER_B)]['calls_count']
+        assert calls_count < 100
+        for _ in range(100):
+            assert does_entity_match_filters(entity) is False
+        assert matcher.export_stats()[keys.encode_filter(self.FILTER_B)]['calls_count'] == calls_count
+
+    def test_it_should_reuse_plans_of_one_off_calls(self, matcher: AdaptiveMatcher):
+        entity = self.Entity({self.FIELD_A: {1}})
+        for _ in range(5):
+            assert matcher.does_entity_match_filters(entity, [self.FILTER_A, self.FILTER_B]) is False
+            assert matcher.does_entity_match_filters(entity, iter([self.FILTER_B])) is False
+        assert matcher.matcher.compiles_count == 3  # A check per filter
+        assert len(matcher.filters_to_plan_map) == 2
+
+    def test_it_should_export_and_load_stats(self, matcher: AdaptiveMatcher, keys: encoders.IFilters):
+        entity = self.Entity({self.FIELD_A: {1}})
+        for _ in range(5):
+            matcher.does_entity_match_filters(entity, [self.FILTER_A, self.FILTER_B])
+
+        stats = matcher.export_stats()
+        assert stats[keys.encode_filter(self.FILTER_A)]['calls_count'] == 5
+        assert stats[keys.encode_filter(self.FILTER_A)]['passes_count'] == 5
+        assert stats[keys.encode_filter(self.FILTER_B)]['passes_count'] == 0
+
+        warm_matcher = AdaptiveMatcher(matcher=self.CountingMatcher(Matcher()), keys=keys)
+        warm_matcher.load_stats(stats)
+        assert warm_matcher.export_stats() == stats
+        assert warm_matcher.does_entity_match_filters(entity, [self.FILTER_A, self.FILTER_B]) is False
+        assert warm_matcher.matcher.filter_to_calls_count_map == {self.FILTER_B: 1}
+
+    FIELD_A = fields.System(name='field-a')
+    FIELD_B = fields.System(name='field-b')
+    FILTER_A = filters.AnyLabel(labels=(labels.Value(field=FIELD_A, value=1),))
+    FILTER_B = filters.AnyLabel(labels=(labels.Value(field=FIELD_B, value=2),))
+
+    class CountingMatcher(IMatcher):
+        def __init__(self, matcher: IMatcher):
+            self.matcher = matcher
+            self.filter_to_calls_count_map = dict()
+            self.compiles_count = 0
+
+        def does_entity_match_filters(self, entity, filters_):
+            raise NotImplementedError
+
+        def compile(self, filters_):
+            filters_ = tuple(filters_)
+            predicate = self.matcher.compile(filters_)
+            self.compiles_count += 1
+
+            def does_entity_match_filters(entity):
+                for filter_ in filters_:
+                    self.filter_to_calls_count_map[filter_] = self.filter_to_calls_count_map.get(filter_, 0) + 1
+                return predicate(entity)
+
+            return does_entity_match_filters
+
+    class Entity(IEntity[int]):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return frozenset(self.field_to_values_map.get(field, frozenset()))
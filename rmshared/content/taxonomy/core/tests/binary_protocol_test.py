@@ -0,0 +1,91 @@
+from orjson import orjson
+from pytest import fixture
+from pytest import raises
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import protocols
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core.fakes import Fakes
+from rmshared.content.taxonomy.core.protocols.binary import Codec
+
+
+class TestCodec:
+    @fixture
+    def codec(self) -> Codec:
+        return Codec()
+
+    def test_it_should_round_trip_data(self, codec: Codec):
+        data = {
+            'value': [None, True, False, 0, 63, 64, 300, -1, -65, 2 ** 70, -2 ** 70, 1.5, -0.0, 1e300],
+            'strings': ['', 'post-id', 'post-id', 'ünïcödé', 'field', 'field'],
+            'nested': {'a': [{'b': {}}, []]},
+        }
+        assert codec.decode(codec.encode(data)) == data
+        assert list(map(type, codec.decode(codec.encode([1, 1.0, True])))) == [int, float, bool]
+        assert codec.decode(codec.encode((1, (2, )))) == [1, [2]]
+
+    def test_it_should_encode_compactly(self, codec: Codec):
+        assert codec.encode(63) == b'\x01\xbf'
+        assert codec.encode(300) == b'\x01\x03\xac\x02'
+        assert codec.encode(['field', 'post-id', 'post-id']) == b'\x01\x08\x03\xc7\x06\x07post-id\x07\x00'
+
+    def test_it_should_reject_unsupported_data(self, codec: Codec):
+        with raises(TypeError):
+            codec.encode({1: 'a'})
+        with raises(TypeError):
+            codec.encode({'a': {1, 2}})
+
+    def test_it_should_reject_malformed_messages(self, codec: Codec):
+        buf = codec.encode({'value': ['post-id', 1.5]})
+        for malformed in (b'', b'\x02' + buf[1:], buf[:-1], buf + b'\x00', b'\x01\x0a', b'\x01\xff', b'\x01\x07\x00', b'\x01\x08\xff\xff\xff\x7f'):
+            with raises(ValueError):
+                codec.decode(malformed)
+
+
+    def test_it_should_decode_deeply_nested_data(self, codec: Codec):
+        data = codec.decode(bytes([Codec.VERSION]) + bytes([Codec.TAG_ARRAY, 1]) * 10000 + bytes([Codec.TAG_NULL]))
+        for _ in range(10000):
+            data, = data
+        assert data is None
+
+    def test_it_should_round_trip_deeply_nested_data(self, codec: Codec):
+        data = ['leaf', {'key': 1}]
+        for index in range(10000):
+            data = [data] if index % 2 else {'key': data, 'other': index}
+        buf = codec.encode(data)
+
+        data = codec.decode(buf)
+        for index in reversed(range(10000)):  # Compared level by level, comparing the whole data recurses
+            if index % 2:
+                data, = data
+            else:
+                assert data.keys() == {'key', 'other'} and data['other'] == index
+                data = data['key']
+        assert data == ['leaf', {'key': 1}]
+
+
+class TestProtocol:
+    @fixture
+    def protocol(self) -> protocols.binary.Protocol:
+        return protocols.Factory.make_instance_for_db().make_binary()
+
+    def test_it_should_round_trip_filters(self, protocol: protocols.binary.Protocol):
+        db = protocols.Factory.make_instance_for_db().make_composite()
+        filters_ = tuple(Fakes().sample_filters(min_size=50, max_size=50))
+        for filter_ in filters_:
+            assert protocol.loads_filter(protocol.dumps_filter(filter_)) == filter_
+            assert protocol.codec.decode(protocol.dumps_filter(filter_)) == orjson.loads(orjson.dumps(db.jsonify_filter(filter_)))
+
+        buf = protocol.dumps_filters(filters_)
+        assert tuple(protocol.loads_filters(buf)) == filters_
+        assert len(buf) < len(orjson.dumps(list(map(db.jsonify_filter, filters_)))) / 2
+
+    def test_it_should_round_trip_parts(self, protocol: protocols.binary.Protocol):
+        field = fields.Custom(name='extras', path='a.b')
+        label = labels.Value(field=fields.System('post-id'), value=-123)
+        range_ = ranges.Between(field=field, min_value=1.5, max_value='z')
+        assert protocol.loads_field(protocol.dumps_field(field)) == field
+        assert protocol.loads_label(protocol.dumps_label(label)) == label
+        assert protocol.loads_range(protocol.dumps_range(range_)) == range_
+        assert protocol.loads_value(protocol.dumps_value(True)) is True
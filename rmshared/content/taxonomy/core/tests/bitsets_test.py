@@ -0,0 +1,79 @@
+from pytest import fixture
+from pytest import raises
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.bitsets import BitsetMatcher
+from rmshared.content.taxonomy.core.matcher import Matcher
+
+
+class TestBitsetMatcher:
+    @fixture
+    def matcher(self) -> BitsetMatcher:
+        return BitsetMatcher(matcher=Matcher(), field_to_values_map={
+            self.FIELDS.POST_TYPE: ('page', 'video'),
+            self.FIELDS.POST_PRIVATE: (True, ),
+        })
+
+    def test_it_should_encode_entities(self, matcher: BitsetMatcher):
+        assert matcher.encode_entities([
+            self.Entity({self.FIELDS.POST_TYPE: {'page'}}),
+            self.Entity({self.FIELDS.POST_TYPE: {'video', 'unknown'}, self.FIELDS.POST_PRIVATE: {True}}),
+        ]) == [0b01000 | 0b00010, 0b10000 | 0b00100]
+
+    def test_it_should_match_filters(self, matcher: BitsetMatcher):
+        entities = [
+            self.Entity({self.FIELDS.POST_TYPE: {'page'}, self.FIELDS.POST_TAG: {'tag-1'}}),
+            self.Entity({self.FIELDS.POST_TYPE: {'video'}, self.FIELDS.POST_PRIVATE: {True}, self.FIELDS.POST_TAG: {'tag-1'}}),
+            self.Entity({self.FIELDS.POST_TYPE: {'video'}, self.FIELDS.POST_MODIFIED_AT: {100}}),
+            self.Entity({self.FIELDS.POST_TYPE: {'image'}}),
+        ]
+        for filters_ in self.FILTERS:
+            assert matcher.match_many(entities, filters_) == Matcher().match_many(entities, filters_)
+            assert [matcher.does_entity_match_filters(entity, iter(filters_)) for entity in entities] == Matcher().match_many(entities, filters_)
+
+    def test_it_should_compile_filters_into_bits_predicates(self, matcher: BitsetMatcher):
+        does_bits_match_filters = matcher.compile_bits(self.FILTERS[0])
+        assert list(map(does_bits_match_filters, matcher.encode_entities([
+            self.Entity({self.FIELDS.POST_TYPE: {'page'}}),
+            self.Entity({self.FIELDS.POST_TYPE: {'video'}, self.FIELDS.POST_PRIVATE: {True}}),
+            self.Entity({}),
+        ]))) == [True, False, False]
+
+        with raises(ValueError):
+            matcher.compile_bits(self.FILTERS[2])
+
+    class FIELDS:
+        POST_TYPE = fields.System(name='post-type')
+        POST_PRIVATE = fields.System(name='post-private')
+        POST_TAG = fields.System(name='post-tag')
+        POST_MODIFIED_AT = fields.System(name='post-modified-at')
+
+    FILTERS = (
+        (
+            filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_TYPE, value='page'), labels.Value(field=FIELDS.POST_TYPE, value='video'))),
+            filters.NoLabels(labels=(labels.Badge(field=FIELDS.POST_PRIVATE),)),
+        ),
+        (
+            filters.AnyLabel(labels=(labels.Empty(field=FIELDS.POST_PRIVATE),)),
+            filters.NoLabels(labels=(labels.Value(field=FIELDS.POST_TYPE, value='page'),)),
+        ),
+        (
+            filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_TYPE, value='image'), labels.Value(field=FIELDS.POST_TAG, value='tag-1'))),
+            filters.NoRanges(ranges=(ranges.MoreThan(field=FIELDS.POST_MODIFIED_AT, value=50),)),
+        ),
+        (
+            filters.AnyLabel(labels=()),
+        ),
+        (),
+    )
+
+    class Entity(IEntity[str | int | bool]):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return frozenset(self.field_to_values_map.get(field, frozenset()))
@@ -0,0 +1,87 @@
+from gc import collect
+
+from orjson import orjson
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import protocols
+from rmshared.content.taxonomy.core.fakes import Fakes
+from rmshared.content.taxonomy.core.protocols.caching import Cache
+from rmshared.content.taxonomy.core.protocols.caching import Dumper
+
+
+class TestCache:
+    @fixture
+    def cache(self) -> Cache:
+        return Cache(max_size=2)
+
+    def test_it_should_return_made_objects(self, cache: Cache):
+        field_1 = cache.get_or_make('field', {'b': 2, 'a': 1}, lambda _: fields.System('post-id'))
+        field_2 = cache.get_or_make('field', {'a': 1, 'b': 2}, lambda _: fields.System('post-title'))
+        label = cache.get_or_make('label', {'a': 1, 'b': 2}, lambda _: labels.Badge(field=fields.System('post-id')))
+        assert field_1 is field_2
+        assert label is not field_1
+        assert cache.metrics == Cache.Metrics(size=2, hits=1, misses=2, evictions=0, skips=0)
+        assert cache.metrics.hit_ratio == 1 / 3
+
+    def test_it_should_tell_values_apart_by_type(self, cache: Cache):
+        assert cache.get_or_make('value', 1, lambda value: value) == 1
+        assert cache.get_or_make('value', 1.0, lambda value: value) == 1.0
+        assert cache.get_or_make('value', True, lambda value: value) is True
+        assert cache.metrics.misses == 3
+
+    def test_it_should_evict_least_recently_used_objects(self, cache: Cache):
+        cache.get_or_make('value', 1, str)
+        cache.get_or_make('value', 2, str)
+        cache.get_or_make('value', 1, str)
+        cache.get_or_make('value', 3, str)
+        assert cache.metrics == Cache.Metrics(size=2, hits=1, misses=3, evictions=1, skips=0)
+        cache.get_or_make('value', 1, str)
+        cache.get_or_make('value', 2, str)
+        assert cache.metrics == Cache.Metrics(size=2, hits=2, misses=4, evictions=2, skips=0)
+
+    def test_it_should_skip_unserializable_data(self, cache: Cache):
+        assert cache.get_or_make('value', {1: 'a'}, len) == 1
+        assert cache.metrics == Cache.Metrics(size=0, hits=0, misses=0, evictions=0, skips=1)
+
+    def test_it_should_cache_parsed_sub_documents(self):
+        cache = Cache()
+        protocol = protocols.Factory.make_instance_for_db(cache=cache).make_composite()
+        for filter_ in Fakes().sample_filters(min_size=10, max_size=10):
+            data = protocol.jsonify_filter(filter_)
+            assert protocol.make_filter(data) == protocol.make_filter(data) == filter_
+
+        label_1 = protocol.make_label({'value': {'field': {'type': 'system', 'info': {'name': 'post-id'}}, 'value': 1}})
+        label_2 = protocol.make_label({'value': {'value': 1, 'field': {'info': {'name': 'post-id'}, 'type': 'system'}}})
+        assert label_1 is label_2
+        assert cache.hits > 0
+
+
+class TestDumper:
+    @fixture
+    def dumper(self) -> Dumper:
+        return protocols.Factory.make_instance_for_ui().make_dumper()
+
+    def test_it_should_dump_filters_once(self, dumper: Dumper):
+        protocol = protocols.Factory.make_instance_for_ui().make_composite()
+        filters_ = tuple(Fakes().sample_filters(min_size=10, max_size=10))
+        buf = orjson.dumps(list(map(protocol.jsonify_filter, filters_)))
+        assert dumper.dumps_filters(filters_) == buf
+        assert dumper.dumps_filters(filters_) == buf
+        assert (dumper.hits, dumper.misses, len(dumper)) == (10, 10, 10)
+
+    def test_it_should_tell_equal_filters_apart(self, dumper: Dumper):
+        filter_1 = filters.AnyLabel(labels=(labels.Value(field=fields.System('post-id'), value=1), ))
+        filter_2 = filters.AnyLabel(labels=(labels.Value(field=fields.System('post-id'), value=True), ))
+        assert filter_1 == filter_2
+        assert dumper.dumps_filter(filter_1) != dumper.dumps_filter(filter_2)
+
+    def test_it_should_forget_released_filters(self, dumper: Dumper):
+        filter_ = filters.AnyLabel(labels=(labels.Badge(field=fields.System('post-id')), ))
+        dumper.dumps_filter(filter_)
+        assert len(dumper) == 1
+        del filter_
+        collect()
+        assert len(dumper) == 0
@@ -0,0 +1,97 @@
+from pytest import fixture
+from pytest import raises
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.columns import Columns
+from rmshared.content.taxonomy.core.matcher import Matcher
+
+
+class TestColumns:
+    NOW = 1440000000
+
+    @fixture
+    def columns(self) -> Columns:
+        return Columns(fields_=vars(self.FIELDS).values(), entities=iter(self.ENTITIES))
+
+    def test_it_should_make_typed_columns(self, columns: Columns):
+        assert columns.size == 5
+        assert isinstance(columns.field_to_column_map[self.FIELDS.POST_ID], Columns.Numbers)
+        assert isinstance(columns.field_to_column_map[self.FIELDS.POST_SCORE], Columns.Numbers)
+        assert isinstance(columns.field_to_column_map[self.FIELDS.POST_TAG], Columns.Dictionary)
+        assert isinstance(columns.field_to_column_map[self.FIELDS.POST_PRIVATE], Columns.Dictionary)
+        assert list(columns.field_to_column_map[self.FIELDS.POST_TAG].offsets) == [0, 2, 3, 3, 4, 4]
+        assert columns.field_to_column_map[self.FIELDS.POST_TAG].dictionary == ['tag-1', 'tag-2', 'tag-3']
+
+    def test_it_should_select_entities(self, columns: Columns):
+        for filters_ in self.FILTERS:
+            mask = columns.select(filters_)
+            assert mask == Matcher().match_many_as_bitmap(self.ENTITIES, filters_)
+            assert list(columns.stream_rows(mask)) == [index for index, is_matching in enumerate(Matcher().match_many(self.ENTITIES, filters_)) if is_matching]
+
+    def test_it_should_select_ranges_of_ordered_values(self):
+        entities = [self.Entity({self.FIELDS.POST_MODIFIED_AT: [self.NOW + index * 10], self.FIELDS.POST_SCORE: [index / 2]}) for index in range(50)]
+        entities += [self.Entity({})]
+        columns = Columns(fields_=vars(self.FIELDS).values(), entities=iter(entities))
+        for filters_ in (
+            (filters.AnyRange(ranges=(ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=self.NOW + 100, max_value=self.NOW + 200), )), ),
+            (filters.AnyRange(ranges=(ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=self.NOW + 105, max_value=self.NOW + 195.5), )), ),
+            (filters.AnyRange(ranges=(ranges.LessThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW), )), ),
+            (filters.AnyRange(ranges=(ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW + 1000), )), ),
+            (filters.NoRanges(ranges=(ranges.MoreThan(field=self.FIELDS.POST_SCORE, value=3), ranges.LessThan(field=self.FIELDS.POST_SCORE, value=1))), ),
+            (filters.AnyRange(ranges=(ranges.Between(field=self.FIELDS.POST_SCORE, min_value=30, max_value=40), )), ),
+        ):
+            assert columns.select(filters_) == Matcher().match_many_as_bitmap(entities, filters_)
+        assert columns.field_to_column_map[self.FIELDS.POST_SCORE].sorted_keys == [index / 2 for index in range(50)]
+
+        columns = Columns(fields_=[self.FIELDS.POST_SCORE], entities=[self.Entity({self.FIELDS.POST_SCORE: [value]}) for value in (1.5, float('nan'), 0.5)])
+        assert columns.select([filters.AnyRange(ranges=(ranges.MoreThan(field=self.FIELDS.POST_SCORE, value=float('-inf')), ))]) == 0b101
+        assert columns.select([filters.NoRanges(ranges=(ranges.LessThan(field=self.FIELDS.POST_SCORE, value=1), ))]) == 0b011
+
+    def test_it_should_fail_on_unknown_fields(self, columns: Columns):
+        with raises(LookupError):
+            columns.select([filters.AnyLabel(labels=(labels.Empty(field=fields.System(name='unknown')),))])
+
+    def test_it_should_select_from_no_entities(self):
+        columns = Columns(fields_=[self.FIELDS.POST_ID], entities=[])
+        assert columns.select([filters.NoLabels(labels=(labels.Empty(field=self.FIELDS.POST_ID),))]) == 0
+        assert list(columns.stream_rows(0)) == []
+
+    class FIELDS:
+        POST_ID = fields.System(name='post-id')
+        POST_PRIVATE = fields.System(name='post-private')
+        POST_TAG = fields.System(name='post-tag')
+        POST_SCORE = fields.System(name='post-score')
+        POST_MODIFIED_AT = fields.System(name='post-modified-at')
+
+    class Entity(IEntity[str | int | float | bool]):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return tuple(self.field_to_values_map.get(field, ()))
+
+    ENTITIES = (
+        Entity({FIELDS.POST_ID: [1], FIELDS.POST_TAG: ['tag-1', 'tag-2'], FIELDS.POST_SCORE: [0.5], FIELDS.POST_MODIFIED_AT: [NOW]}),
+        Entity({FIELDS.POST_ID: [2], FIELDS.POST_PRIVATE: [True], FIELDS.POST_TAG: ['tag-2'], FIELDS.POST_MODIFIED_AT: [NOW - 100.5]}),
+        Entity({FIELDS.POST_ID: [3], FIELDS.POST_PRIVATE: [False], FIELDS.POST_SCORE: [1.5], FIELDS.POST_MODIFIED_AT: [NOW + 100]}),
+        Entity({FIELDS.POST_ID: [4], FIELDS.POST_TAG: ['tag-3'], FIELDS.POST_SCORE: [2.5, 3.5]}),
+        Entity({FIELDS.POST_ID: [5], FIELDS.POST_PRIVATE: [True]}),
+    )
+
+    FILTERS = (
+        (),
+        (filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_TAG, value='tag-2'), labels.Value(field=FIELDS.POST_TAG, value='tag-3'))), ),
+        (filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_TAG, value='unknown'), labels.Empty(field=FIELDS.POST_TAG))), ),
+        (filters.NoLabels(labels=(labels.Badge(field=FIELDS.POST_PRIVATE), labels.Value(field=FIELDS.POST_ID, value=4))), ),
+        (filters.AnyLabel(labels=()), ),
+        (filters.NoLabels(labels=()), ),
+        (
+            filters.AnyRange(ranges=(ranges.Between(field=FIELDS.POST_MODIFIED_AT, min_value=NOW - 200, max_value=NOW), )),
+            filters.NoRanges(ranges=(ranges.LessThan(field=FIELDS.POST_SCORE, value=1), )),
+        ),
+        (filters.AnyRange(ranges=(ranges.MoreThan(field=FIELDS.POST_SCORE, value=3), ranges.LessThan(field=FIELDS.POST_ID, value=2))), ),
+    )
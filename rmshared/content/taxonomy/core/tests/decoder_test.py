@@ -0,0 +1,36 @@
+from orjson import orjson
+from pytest import raises
+
+from rmshared.content.taxonomy.core import protocols
+from rmshared.content.taxonomy.core.fakes import Fakes
+from rmshared.content.taxonomy.core.tests.ui_protocol_test import TestProtocol as TestUiProtocol
+
+
+class TestDecoder:
+    def test_it_should_make_filters_like_ui_protocol(self):
+        protocol = protocols.Factory.make_instance_for_ui().make_composite()
+        decoder = protocols.Decoder.make_instance_for_ui()
+        assert tuple(decoder.make_filters(TestUiProtocol.FILTERS_DATA)) == TestUiProtocol.FILTERS
+
+        filters_ = tuple(Fakes().sample_filters(min_size=50, max_size=50))
+        data = list(map(protocol.jsonify_filter, filters_))
+        assert tuple(decoder.make_filters(data)) == tuple(map(protocol.make_filter, data)) == filters_
+        assert tuple(decoder.make_filters_from_bytes(orjson.dumps(data))) == filters_
+
+    def test_it_should_make_filters_like_db_protocol(self):
+        protocol = protocols.Factory.make_instance_for_db().make_composite()
+        decoder = protocols.Decoder.make_instance_for_db()
+        filters_ = tuple(Fakes().sample_filters(min_size=50, max_size=50))
+        data = list(map(protocol.jsonify_filter, filters_))
+        assert tuple(decoder.make_filters(data)) == tuple(map(protocol.make_filter, data)) == filters_
+
+    def test_it_should_fall_back_on_unknown_data(self):
+        decoder = protocols.Decoder.make_instance_for_ui()
+        with raises(ValueError):
+            decoder.make_filter({'any_label': [{'value': {'field': {'post-id': {}}, 'value': [123]}}]})
+        with raises(KeyError):
+            decoder.make_filter({'any_range': [{'field': {'post-id': {}}, 'min': 1, 'to': 2}]})
+        with raises(AssertionError):
+            decoder.make_filter({'no_labels': [{'empty': {'field': {'post-id': []}}}]})
+        with raises(KeyError):
+            decoder.make_filter({'no_filter': []})
@@ -0,0 +1,26 @@
+from unittest.mock import Mock
+from unittest.mock import call
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.entities import CachedEntity
+
+
+class TestCachedEntity:
+    def test_it_should_get_values_once_per_field(self):
+        entity = Mock(spec=IEntity)
+        entity.get_values = Mock(side_effect=[['tag-1', 'tag-2', 'tag-1'], iter([123])])
+        cached_entity = CachedEntity(entity)
+
+        assert cached_entity.get_values(fields.System('post-regular-tag')) == frozenset({'tag-1', 'tag-2'})
+        assert cached_entity.get_values(fields.System('post-id')) == frozenset({123})
+        assert cached_entity.get_values(fields.System('post-regular-tag')) == frozenset({'tag-1', 'tag-2'})
+        assert cached_entity.get_values(fields.System('post-id')) == frozenset({123})
+        assert entity.get_values.call_args_list == [call(fields.System('post-regular-tag')), call(fields.System('post-id'))]
+
+    def test_it_should_wrap_entities_once(self):
+        entity = Mock(spec=IEntity)
+        cached_entity = CachedEntity.wrap(entity)
+        assert isinstance(cached_entity, CachedEntity)
+        assert cached_entity.entity is entity
+        assert CachedEntity.wrap(cached_entity) is cached_entity
@@ -0,0 +1,80 @@
+from gc import collect
+
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import aliases
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import protocols
+from rmshared.content.taxonomy.core.fakes import Fakes
+from rmshared.content.taxonomy.core.interning import Interner
+
+
+class TestInterner:
+    @fixture
+    def interner(self) -> Interner:
+        return Interner()
+
+    def test_it_should_share_equal_objects(self, interner: Interner):
+        label_1 = interner.intern(labels.Value(field=fields.System('post-id'), value=1))
+        label_2 = interner.intern(labels.Value(field=fields.System('post-id'), value=1))
+        label_3 = interner.intern(labels.Value(field=fields.System('post-id'), value=True))
+        assert label_1 is label_2
+        assert label_3 is not label_1
+        assert label_3.value is True
+
+    def test_it_should_tell_nested_scalars_apart(self, interner: Interner):
+        field = interner.intern(fields.System('post-id'))
+        filters_ = tuple(
+            interner.intern(filters.AnyLabel(labels=(interner.intern(labels.Value(field=field, value=value)), )))
+            for value in (1, True, 1.0)
+        )
+        assert len(set(map(id, filters_))) == 3
+        assert tuple(type(filter_.labels[0].value) for filter_ in filters_) == (int, bool, float)
+
+        protocol = protocols.Factory.make_instance_for_ui(interner).make_composite()
+        for value in (1, True, 1.0, 1, True):
+            data = {'any_label': [{'value': {'field': {'post-id': {}}, 'value': value}}]}
+            assert type(protocol.jsonify_filter(protocol.make_filter(data))['any_label'][0]['value']['value']) is type(value)
+
+    def test_it_should_release_unused_objects(self, interner: Interner):
+        field = interner.intern(fields.System('post-id'))
+        assert len(interner) == 1
+        del field
+        collect()
+        assert len(interner) == 0
+
+    def test_it_should_skip_unhashable_objects(self, interner: Interner):
+        label = labels.Value(field=fields.System('post-id'), value=[1, 2])
+        assert interner.intern(label) is label
+        assert len(interner) == 0
+
+    def test_it_should_intern_parsed_filters(self, interner: Interner):
+        protocol = protocols.Factory.make_instance_for_ui(interner).make_composite()
+        for filter_ in Fakes().sample_filters(min_size=10, max_size=10):
+            data = protocol.jsonify_filter(filter_)
+            filter_1 = protocol.make_filter(data)
+            filter_2 = protocol.make_filter(data)
+            assert filter_1 == filter_
+            assert filter_1 is filter_2
+
+        protocol = protocols.Factory.make_instance_for_db(interner).make_composite()
+        label_1 = protocol.make_label({'value': {'field': {'type': 'system', 'info': {'name': 'post-id'}}, 'value': 1}})
+        label_2 = protocol.make_label({'value': {'field': {'type': 'system', 'info': {'name': 'post-id'}}, 'value': 1}})
+        assert label_1 is label_2
+
+    def test_it_should_intern_aliases(self, interner: Interner):
+        assert aliases.fields.System('post-id', interner)() is interner.intern(fields.System('post-id'))
+        assert aliases.fields.Custom('extras', interner)('path') is aliases.fields.Custom('extras', interner)('path')
+
+        label = aliases.labels.SystemFieldValue(aliases.fields.System('post-id', interner), interner=interner)
+        assert filters.AnyLabel(labels=(label(1), )).labels[0] is label(1)
+        assert label(True) is not label(1)
+
+    def test_it_should_not_intern_aliases_by_default(self):
+        assert aliases.fields.Custom('extras')('path') is not aliases.fields.Custom('extras')('path')
+
+        label = aliases.labels.SystemFieldValue(aliases.fields.System('post-id'))
+        assert label(1) == label(1)
+        assert label(1) is not label(1)
@@ -8,6 +8,8 @@ from rmshared.content.taxonomy.core import labels
 from rmshared.content.taxonomy.core import ranges
 from rmshared.content.taxonomy.core import filters
 from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.entities import CachedEntity
 from rmshared.content.taxonomy.core.matcher import Matcher
 
 
@@ -93,13 +95,151 @@ class TestMatcher:
             filters.AnyRange(ranges=(ranges.Between(field=self.FIELDS.POST_PUBLISHED_AT, min_value=week_ago - Hours(1), max_value=week_ago + Hours(2)),)),
         }))
 
+    def test_it_should_compile_filters(self, matcher: Matcher):
+        entity = self.Entity()
+        week_ago: int = self.NOW - Days(7)
+
+        does_entity_match_filters = matcher.compile(filters_=iter([
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.USER_ID, value=123456), labels.Value(field=self.FIELDS.POST_ID, value=123456))),
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_TYPE, value='post'), labels.Badge(field=self.FIELDS.POST_PRIVATE))),
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_STAGE, value=123), labels.Empty(field=self.FIELDS.POST_STAGE))),
+            filters.NoLabels(labels=(labels.Value(field=self.FIELDS.POST_REGULAR_TAG, value='tag-3'), labels.Empty(field=self.FIELDS.POST_PRIMARY_TAG))),
+            filters.AnyRange(ranges=(
+                ranges.LessThan(field=self.FIELDS.POST_PUBLISHED_AT, value=week_ago - Hours(1)),
+                ranges.Between(field=self.FIELDS.POST_PUBLISHED_AT, min_value=week_ago - Hours(1), max_value=week_ago + Hours(2)),
+            )),
+            filters.NoRanges(ranges=(ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=week_ago + Days(5)),)),
+        ]))
+        assert does_entity_match_filters(entity)
+        assert does_entity_match_filters(self.Entity())
+
+        assert matcher.compile(filters_=[])(entity)
+        assert not matcher.compile(filters_=[filters.AnyLabel(labels=())])(entity)
+        assert matcher.compile(filters_=[filters.NoRanges(ranges=())])(entity)
+        assert not matcher.compile(filters_=[
+            filters.AnyLabel(labels=(labels.Badge(field=self.FIELDS.POST_ID), labels.Empty(field=self.FIELDS.POST_TYPE))),
+        ])(entity)
+        assert not matcher.compile(filters_=[
+            filters.NoLabels(labels=(labels.Value(field=self.FIELDS.POST_REGULAR_TAG, value='tag-3'), labels.Value(field=self.FIELDS.POST_REGULAR_TAG, value='tag-2'))),
+        ])(entity)
+        assert not matcher.compile(filters_=[
+            filters.AnyRange(ranges=(ranges.LessThan(field=self.FIELDS.POST_PUBLISHED_AT, value=week_ago - Hours(1)),)),
+        ])(entity)
+        assert not matcher.compile(filters_=[
+            filters.NoRanges(ranges=(ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=week_ago, max_value=self.NOW),)),
+        ])(entity)
+
+    def test_it_should_match_many_entities(self, matcher: Matcher):
+        entity_1 = self.Entity()
+        entity_2 = self.Entity(post_id=654321)
+        entity_3 = self.Entity(post_id=123456, is_private=False)
+        filters_ = (
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_ID, value=123456),)),
+            filters.AnyLabel(labels=(labels.Badge(field=self.FIELDS.POST_PRIVATE),)),
+            filters.AnyRange(ranges=(ranges.MoreThan(field=self.FIELDS.POST_PUBLISHED_AT, value=0),)),
+        )
+
+        assert matcher.match_many(entities=iter([entity_1, entity_2, entity_3, entity_1]), filters_=iter(filters_)) == [True, False, False, True]
+        assert matcher.match_many(entities=iter([]), filters_=iter(filters_)) == []
+        assert matcher.match_many_as_bitmap(entities=iter([entity_1, entity_2, entity_3, entity_1]), filters_=iter(filters_)) == 0b1001
+        assert matcher.match_many_as_bitmap(entities=iter([entity_2, entity_3]), filters_=iter(filters_)) == 0
+
+        entity_4 = self.Entity()
+        filters_ += (filters.NoLabels(labels=(labels.Value(field=self.FIELDS.POST_ID, value=654321), labels.Empty(field=self.FIELDS.POST_PRIVATE))),)
+        assert matcher.match_many(entities=iter([entity_4]), filters_=iter(filters_)) == [True]
+        assert entity_4.get_values_calls_count == 3
+
+    def test_it_should_merge_ranges(self, matcher: Matcher):
+        assert Matcher.Interval.merge([
+            Matcher.Interval(min_value=30, max_value=40),
+            Matcher.Interval(min_value=10, max_value=20),
+            Matcher.Interval(min_value=15, max_value=25),
+            Matcher.Interval(min_value=25, max_value=28),
+            Matcher.Interval(min_value=50, max_value=45),
+            Matcher.Interval(min_value=None, max_value=5),
+            Matcher.Interval(min_value=None, max_value=0),
+            Matcher.Interval(min_value=60, max_value=None),
+            Matcher.Interval(min_value=70, max_value=80),
+        ]) == [
+            Matcher.Interval(min_value=None, max_value=5),
+            Matcher.Interval(min_value=10, max_value=28),
+            Matcher.Interval(min_value=30, max_value=40),
+            Matcher.Interval(min_value=60, max_value=None),
+        ]
+        assert Matcher.Interval.merge([
+            Matcher.Interval(min_value=None, max_value=10),
+            Matcher.Interval(min_value=5, max_value=None),
+        ]) == [
+            Matcher.Interval(min_value=None, max_value=None),
+        ]
+
+        ranges_ = (
+            ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=30, max_value=40),
+            ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=10, max_value=20),
+            ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=15, max_value=25),
+            ranges.LessThan(field=self.FIELDS.POST_MODIFIED_AT, value=5),
+            ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=60),
+            ranges.Between(field=self.FIELDS.POST_PUBLISHED_AT, min_value='a', max_value='c'),
+            ranges.Between(field=self.FIELDS.POST_PUBLISHED_AT, min_value=1.5, max_value=2.5),
+        )
+        for value in (-1, 5, 6, 10, 12.5, 25, 26, 29, 30, 40, 41, 60, 100, 'b', 'd', 2):
+            entity = self.Entity()
+            entity.field_to_values_map = {self.FIELDS.POST_MODIFIED_AT: frozenset({value}), self.FIELDS.POST_PUBLISHED_AT: frozenset({value})}
+            for filters_ in ([filters.AnyRange(ranges=ranges_[:5])], [filters.NoRanges(ranges=ranges_[:5])], [filters.AnyRange(ranges=ranges_[5:])]):
+                try:
+                    expected = matcher.does_entity_match_filters(entity, filters_)
+                except TypeError:
+                    continue
+                assert matcher.compile(filters_)(entity) is expected, [value, filters_]
+
+    def test_it_should_get_entity_values_once_per_call(self, matcher: Matcher):
+        entity = self.Entity()
+        filters_ = (
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_ID, value=123456),)),
+            filters.NoLabels(labels=(labels.Value(field=self.FIELDS.POST_ID, value=654321), labels.Empty(field=self.FIELDS.POST_ID))),
+            filters.AnyRange(ranges=(ranges.MoreThan(field=self.FIELDS.POST_ID, value=0),)),
+        )
+
+        assert matcher.compile(filters_)(entity)
+        assert entity.get_values_calls_count == 1
+
+        entity = self.Entity()
+        assert matcher.does_entity_match_filters(entity, filters_)
+        assert entity.get_values_calls_count == 4  # Walking doesn't cache unless the entity is wrapped
+
+        cached_entity = CachedEntity(entity)
+        assert matcher.does_entity_match_filters(cached_entity, filters_)
+        assert matcher.compile(filters_)(cached_entity)
+        assert matcher.match_many([cached_entity, cached_entity], filters_) == [True, True]
+        assert entity.get_values_calls_count == 5
+
+    def test_it_should_compile_filters_of_walking_matchers(self, matcher: Matcher):
+        walking_matcher = self.WalkingMatcher(matcher)
+        filters_ = (
+            filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_ID, value=123456),)),
+            filters.AnyLabel(labels=(labels.Badge(field=self.FIELDS.POST_PRIVATE),)),
+        )
+
+        does_entity_match_filters = walking_matcher.compile(filters_=iter(filters_))
+        assert does_entity_match_filters(self.Entity())
+        assert not does_entity_match_filters(self.Entity(is_private=False))
+        assert walking_matcher.match_many(entities=iter([self.Entity(), self.Entity(post_id=654321)]), filters_=iter(filters_)) == [True, False]
+
+    class WalkingMatcher(IMatcher):
+        def __init__(self, matcher: IMatcher):
+            self.matcher = matcher
+
+        def does_entity_match_filters(self, entity, filters_):
+            return self.matcher.does_entity_match_filters(entity, filters_)
+
     class Entity(IEntity[str | int | float | bool]):
-        def __init__(self):
+        def __init__(self, post_id: int = 123456, is_private: bool = True):
+            self.get_values_calls_count = 0
             self.field_to_values_map = {
-                TestMatcher.FIELDS.POST_ID: frozenset({123456}),
+                TestMatcher.FIELDS.POST_ID: frozenset({post_id}),
                 TestMatcher.FIELDS.POST_TYPE: frozenset({'page'}),
                 TestMatcher.FIELDS.POST_STATUS: frozenset({'published-to-site(promoted=false)'}),
-                TestMatcher.FIELDS.POST_PRIVATE: frozenset({True}),
+                TestMatcher.FIELDS.POST_PRIVATE: frozenset({is_private}),
                 TestMatcher.FIELDS.POST_PRIMARY_TAG: frozenset({'tag-1'}),
                 TestMatcher.FIELDS.POST_REGULAR_TAG: frozenset({'tag-1', 'tag-2'}),
                 TestMatcher.FIELDS.POST_PRIMARY_SECTION: frozenset({123}),
@@ -110,6 +250,7 @@ class TestMatcher:
             }
 
         def get_values(self, field):
+            self.get_values_calls_count += 1
             return frozenset(self.field_to_values_map.get(field, frozenset()))
 
     class FIELDS:
@@ -0,0 +1,79 @@
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import encoders
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.optimizer import Optimizer
+
+
+class TestOptimizer:
+    NOW = 1440000000
+
+    @fixture
+    def optimizer(self) -> Optimizer:
+        return Optimizer(keys=encoders.Factory.make_instance_for_keys().make_composite())
+
+    def test_it_should_normalize_filters(self, optimizer: Optimizer):
+        assert optimizer.optimize_filters(iter([
+            filters.NoLabels(labels=(self.LABELS.PRIVATE,)),
+            filters.AnyRange(ranges=(
+                ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW),
+                ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=self.NOW - 100, max_value=self.NOW + 100),
+                ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=self.NOW - 50, max_value=self.NOW - 200),
+            )),
+            filters.AnyLabel(labels=(self.LABELS.TAG_2, self.LABELS.TAG_1, self.LABELS.TAG_2)),
+            filters.NoLabels(labels=(self.LABELS.TAG_3,)),
+            filters.NoRanges(ranges=()),
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+        ])) == (
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+            filters.AnyRange(ranges=(ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW - 100),)),
+            filters.NoLabels(labels=(self.LABELS.PRIVATE, self.LABELS.TAG_3)),
+        )
+
+    def test_it_should_drop_implied_filters(self, optimizer: Optimizer):
+        assert optimizer.optimize_filters([
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2, self.LABELS.TAG_3)),
+            filters.AnyLabel(labels=(self.LABELS.PRIVATE,)),
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+        ]) == (
+            filters.AnyLabel(labels=(self.LABELS.PRIVATE,)),
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+        )
+
+    def test_it_should_keep_ranges_covering_all_values(self, optimizer: Optimizer):
+        ranges_ = (
+            ranges.LessThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW),
+            ranges.MoreThan(field=self.FIELDS.POST_MODIFIED_AT, value=self.NOW - 100),
+        )
+        filters_ = optimizer.optimize_filters([filters.NoRanges(ranges=ranges_)])
+        assert len(filters_) == 1
+        assert set(filters_[0].ranges) == set(ranges_)
+
+    def test_it_should_detect_contradictions(self, optimizer: Optimizer):
+        assert optimizer.optimize_filters([
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+            filters.NoLabels(labels=(self.LABELS.TAG_1,)),
+            filters.NoLabels(labels=(self.LABELS.TAG_2,)),
+        ]) == Optimizer.NEVER
+        assert optimizer.optimize_filters([
+            filters.AnyRange(ranges=(ranges.Between(field=self.FIELDS.POST_MODIFIED_AT, min_value=self.NOW, max_value=self.NOW - 1),)),
+        ]) == Optimizer.NEVER
+        assert optimizer.optimize_filters([filters.AnyLabel(labels=())]) == Optimizer.NEVER
+        assert Optimizer.is_never(optimizer.optimize_filters([
+            filters.AnyLabel(labels=(self.LABELS.TAG_1, self.LABELS.TAG_2)),
+            filters.NoLabels(labels=(self.LABELS.TAG_1,)),
+        ])) is False
+
+    class FIELDS:
+        POST_PRIVATE = fields.System(name='post-private')
+        POST_REGULAR_TAG = fields.System(name='post-regular-tag')
+        POST_MODIFIED_AT = fields.System(name='post-modified-at')
+
+    class LABELS:
+        PRIVATE = labels.Badge(field=fields.System(name='post-private'))
+        TAG_1 = labels.Value(field=fields.System(name='post-regular-tag'), value='tag-1')
+        TAG_2 = labels.Value(field=fields.System(name='post-regular-tag'), value='tag-2')
+        TAG_3 = labels.Value(field=fields.System(name='post-regular-tag'), value='tag-3')
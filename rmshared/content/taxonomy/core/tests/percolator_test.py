@@ -0,0 +1,117 @@
+from random import Random
+
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.matcher import Matcher
+from rmshared.content.taxonomy.core.percolator import Percolator
+
+
+class TestPercolator:
+    NOW = 1440000000
+
+    @fixture
+    def percolator(self) -> Percolator:
+        percolator = Percolator(matcher=Matcher())
+        for key, filters_ in self.KEY_TO_FILTERS_MAP.items():
+            percolator.add_filters(key, filters_=iter(filters_))
+        return percolator
+
+    def test_it_should_percolate_entities(self, percolator: Percolator):
+        assert percolator.percolate(self.Entity({
+            self.FIELDS.POST_ID: {123},
+            self.FIELDS.POST_REGULAR_TAG: {'tag-1', 'tag-2'},
+            self.FIELDS.POST_MODIFIED_AT: {self.NOW},
+        })) == {'tag-1', 'tag-1-or-2', 'recent', 'not-private', 'everything'}
+        assert percolator.percolate(self.Entity({
+            self.FIELDS.POST_ID: {234},
+            self.FIELDS.POST_PRIVATE: {True},
+            self.FIELDS.POST_REGULAR_TAG: {'tag-2'},
+            self.FIELDS.POST_MODIFIED_AT: {self.NOW - 1000},
+        })) == {'tag-1-or-2', 'private-or-untagged', 'old-or-future', 'everything'}
+        assert percolator.percolate(self.Entity({
+            self.FIELDS.POST_ID: {345},
+            self.FIELDS.POST_MODIFIED_AT: {self.NOW + 1000},
+        })) == {'private-or-untagged', 'old-or-future', 'not-private', 'everything'}
+        assert percolator.percolate(self.Entity({
+            self.FIELDS.POST_ID: {456},
+            self.FIELDS.POST_REGULAR_TAG: {'tag-1'},
+            self.FIELDS.POST_MODIFIED_AT: {self.NOW - 50},
+        })) == {'tag-1', 'tag-1-or-2', 'recent', 'not-private', 'everything'}
+
+    def test_it_should_remove_filters(self, percolator: Percolator):
+        entity = self.Entity({
+            self.FIELDS.POST_ID: {123},
+            self.FIELDS.POST_REGULAR_TAG: {'tag-1', 'tag-2'},
+            self.FIELDS.POST_MODIFIED_AT: {self.NOW},
+        })
+
+        for key in ('tag-1', 'recent', 'everything', 'unknown'):
+            percolator.remove_filters(key)
+        assert percolator.percolate(entity) == {'tag-1-or-2', 'not-private'}
+
+        percolator.add_filters('tag-1-or-2', filters_=[filters.AnyLabel(labels=(labels.Value(field=self.FIELDS.POST_REGULAR_TAG, value='tag-3'),))])
+        assert percolator.percolate(entity) == {'not-private'}
+
+        for key in self.KEY_TO_FILTERS_MAP.keys():
+            percolator.remove_filters(key)
+        assert percolator.percolate(entity) == set()
+        assert percolator.filter_to_index_map[filters.AnyLabel].field_to_value_to_keys_map == {}
+        assert percolator.filter_to_index_map[filters.AnyRange].field_to_intervals_map == {}
+
+    def test_it_should_find_intervals_containing_values(self):
+        random = Random(42)
+        intervals = [(random.randint(0, 100), random.randint(0, 100), key) for key in range(200)]
+        tree = Percolator.IntervalTree()
+        for interval in intervals:
+            tree.add_interval(*interval)
+        for interval in intervals[::3]:
+            tree.remove_interval(*interval)
+        tree.remove_interval(0, 100, 'unknown')
+
+        for value in range(-1, 102):
+            expected_keys = sorted(key for index, (min_value, max_value, key) in enumerate(intervals) if index % 3 and min_value <= value <= max_value)
+            assert sorted(tree.stream_entries_containing(value)) == expected_keys
+
+    class FIELDS:
+        POST_ID = fields.System(name='post-id')
+        POST_PRIVATE = fields.System(name='post-private')
+        POST_REGULAR_TAG = fields.System(name='post-regular-tag')
+        POST_MODIFIED_AT = fields.System(name='post-modified-at')
+
+    KEY_TO_FILTERS_MAP = {
+        'tag-1': (
+            filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_REGULAR_TAG, value='tag-1'),)),
+        ),
+        'tag-1-or-2': (
+            filters.AnyLabel(labels=(labels.Value(field=FIELDS.POST_REGULAR_TAG, value='tag-1'), labels.Value(field=FIELDS.POST_REGULAR_TAG, value='tag-2'))),
+        ),
+        'private-or-untagged': (
+            filters.AnyLabel(labels=(labels.Badge(field=FIELDS.POST_PRIVATE), labels.Empty(field=FIELDS.POST_REGULAR_TAG))),
+        ),
+        'recent': (
+            filters.AnyRange(ranges=(ranges.Between(field=FIELDS.POST_MODIFIED_AT, min_value=NOW - 100, max_value=NOW + 100),)),
+            filters.NoLabels(labels=(labels.Badge(field=FIELDS.POST_PRIVATE),)),
+        ),
+        'old-or-future': (
+            filters.AnyRange(ranges=(ranges.LessThan(field=FIELDS.POST_MODIFIED_AT, value=NOW - 100), ranges.MoreThan(field=FIELDS.POST_MODIFIED_AT, value=NOW + 100))),
+        ),
+        'not-private': (
+            filters.NoLabels(labels=(labels.Badge(field=FIELDS.POST_PRIVATE),)),
+        ),
+        'everything': (),
+        'nothing': (
+            filters.AnyLabel(labels=()),
+        ),
+    }
+
+    class Entity(IEntity[str | int | float | bool]):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return frozenset(self.field_to_values_map.get(field, frozenset()))
@@ -0,0 +1,96 @@
+from pytest import fixture
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import labels
+from rmshared.content.taxonomy.core import ranges
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+from rmshared.content.taxonomy.core.matcher import Matcher
+from rmshared.content.taxonomy.core.tracing import TracingMatcher
+
+
+class TestTracingMatcher:
+    @fixture
+    def matcher(self) -> TracingMatcher:
+        return TracingMatcher(matcher=Matcher(), traces_limit=2)
+
+    def test_it_should_trace_matching(self, matcher: TracingMatcher):
+        entities = [
+            self.Entity({self.FIELD_TAG: {'tag-1'}, self.FIELD_SCORE: {1}}),
+            self.Entity({self.FIELD_TAG: {'tag-1'}, self.FIELD_SCORE: {5}}),
+            self.Entity({self.FIELD_SCORE: {1}}),
+        ]
+        assert matcher.match_many(entities, self.FILTERS) == [True, False, False]
+
+        assert len(matcher.traces) == 2
+        assert matcher.traces[0].rejecting_filter == self.FILTERS[1]
+        assert matcher.traces[0].get_values_calls_count == 2
+        assert set(matcher.traces[0].filter_type_to_ns_map.keys()) == {filters.AnyLabel, filters.AnyRange}
+        assert matcher.traces[1].rejecting_filter == self.FILTERS[0]
+        assert matcher.traces[1].get_values_calls_count == 1
+        assert set(matcher.traces[1].filter_type_to_ns_map.keys()) == {filters.AnyLabel}
+
+        assert matcher.counters.calls_count == 3
+        assert matcher.counters.matches_count == 1
+        assert matcher.counters.get_values_calls_count == 5
+        assert matcher.counters.filter_type_to_rejections_count_map == {filters.AnyLabel: 1, filters.AnyRange: 1}
+        assert set(matcher.counters.filter_type_to_ns_map.keys()) == {filters.AnyLabel, filters.AnyRange}
+
+        matcher.reset()
+        assert len(matcher.traces) == 0
+        assert matcher.counters == TracingMatcher.Counters()
+
+    def test_it_should_not_trace_when_disabled(self, matcher: TracingMatcher):
+        entity = self.Entity({self.FIELD_TAG: {'tag-1'}, self.FIELD_SCORE: {1}})
+        does_entity_match_filters = matcher.compile(self.FILTERS)
+
+        matcher.is_enabled = False
+        assert does_entity_match_filters(entity) is True
+        assert matcher.does_entity_match_filters(entity, self.FILTERS) is True
+        assert matcher.match_many_as_bitmap([entity, entity], self.FILTERS) == 0b11
+        assert len(matcher.traces) == 0
+        assert matcher.counters.calls_count == 0
+
+        matcher.is_enabled = True
+        assert does_entity_match_filters(entity) is True
+        assert matcher.counters.calls_count == 1
+
+    def test_it_should_count_values_fetched_by_matcher(self):
+        walking_matcher = self.WalkingMatcher(Matcher())
+        matcher = TracingMatcher(matcher=walking_matcher)
+        entity = self.Entity({self.FIELD_TAG: {'tag-1'}, self.FIELD_SCORE: {1}})
+        filters_ = self.FILTERS + (filters.NoLabels(labels=(labels.Value(field=self.FIELD_TAG, value='tag-2'),)),)
+
+        for _ in range(3):
+            assert matcher.does_entity_match_filters(entity, iter(filters_)) is True
+            assert matcher.traces[-1].get_values_calls_count == 3  # The matcher fetches the tags twice, once per filter
+        assert walking_matcher.compiles_count == 1 + len(filters_)
+        assert matcher.counters.get_values_calls_count == 9
+        assert matcher.counters.ns > 0
+
+    FIELD_TAG = fields.System(name='post-tag')
+    FIELD_SCORE = fields.System(name='post-score')
+    FILTERS = (
+        filters.AnyLabel(labels=(labels.Value(field=FIELD_TAG, value='tag-1'),)),
+        filters.AnyRange(ranges=(ranges.LessThan(field=FIELD_SCORE, value=3),)),
+    )
+
+    class WalkingMatcher(IMatcher):
+        def __init__(self, matcher: IMatcher):
+            self.matcher = matcher
+            self.compiles_count = 0
+
+        def does_entity_match_filters(self, entity, filters_):
+            return self.matcher.does_entity_match_filters(entity, filters_)
+
+        def compile(self, filters_):
+            self.compiles_count += 1
+            return super().compile(filters_)
+
+    class Entity(IEntity[str | int]):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return frozenset(self.field_to_values_map.get(field, frozenset()))
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from time import perf_counter_ns
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.content.taxonomy.core import fields
+from rmshared.content.taxonomy.core import filters
+from rmshared.content.taxonomy.core.abc import IEntity
+from rmshared.content.taxonomy.core.abc import IMatcher
+
+Filter = TypeVar('Filter', bound=filters.Filter)
+Value = TypeVar('Value')
+EntityPredicate = Callable[[IEntity], bool]
+
+
+class TracingMatcher(IMatcher):
+    """
+    Records what happens inside another matcher: which filter rejected an entity, how many times the matcher fetched
+    the values of the entity, how long it took and how long every type of filter took on its own. The most recent
+    traces are kept in `traces`, while `counters` aggregate all of them. Disabled tracing costs a single attribute check
+    per call. The filters are compiled once per tuple of them, keeping the `CHECKS_CACHE_SIZE` most recently used ones.
+    """
+
+    TRACES_LIMIT = 1000
+    CHECKS_CACHE_SIZE = 1024
+
+    def __init__(self, matcher: IMatcher, is_enabled: bool = True, traces_limit: int = TRACES_LIMIT):
+        self.matcher = matcher
+        self.is_enabled = is_enabled
+        self.traces: Deque[TracingMatcher.Trace] = deque(maxlen=traces_limit)
+        self.counters = self.Counters()
+        self.filters_to_checks_map: OrderedDict[Tuple[filters.Filter, ...], TracingMatcher.Checks] = OrderedDict()
+
+    def does_entity_match_filters(self, entity, filters_):
+        if self.is_enabled:
+            filters_ = tuple(filters_)
+            checks = self.filters_to_checks_map.get(filters_)
+            if checks is None:
+                checks = self.filters_to_checks_map[filters_] = self._make_checks(filters_)
+                if len(self.filters_to_checks_map) > self.CHECKS_CACHE_SIZE:
+                    self.filters_to_checks_map.popitem(last=False)
+            else:
+                self.filters_to_checks_map.move_to_end(filters_)
+            return self._trace(filters_, checks, entity)
+        else:
+            return self.matcher.does_entity_match_filters(entity, filters_)
+
+    def compile(self, filters_):
+        filters_ = tuple(filters_)
+        checks = self._make_checks(filters_)
+
+        def does_entity_match_filters(entity: IEntity) -> bool:
+            if self.is_enabled:
+                return self._trace(filters_, checks, entity)
+            else:
+                return checks.does_entity_match_filters(entity)
+
+        return does_entity_match_filters
+
+    def reset(self) -> None:
+        self.traces.clear()
+        self.counters = self.Counters()
+
+    def _make_checks(self, filters_: Tuple[Filter, ...]) -> TracingMatcher.Checks:
+        return self.Checks(
+            does_entity_match_filters=self.matcher.compile(filters_),
+            filter_checks=tuple(map(lambda filter_: (filter_, self.matcher.compile([filter_])), filters_)),
+        )
+
+    def _trace(self, filters_: Tuple[Filter, ...], checks: TracingMatcher.Checks, entity: IEntity) -> bool:
+        counting_entity = self.CountingEntity(entity)
+        started_at = perf_counter_ns()
+        is_matching = checks.does_entity_match_filters(counting_entity)
+        ns = perf_counter_ns() - started_at
+
+        filter_type_to_ns_map: Dict[Type[Filter], int] = dict()
+        rejecting_filter = None
+        for filter_, does_entity_match_filter in checks.filter_checks:  # Attributes the time and the rejection, not counted
+            started_at = perf_counter_ns()
+            is_matching_filter = does_entity_match_filter(entity)
+            filter_type_to_ns_map[type(filter_)] = filter_type_to_ns_map.get(type(filter_), 0) + perf_counter_ns() - started_at
+            if not is_matching_filter:
+                rejecting_filter = filter_
+                break
+
+        trace = self.Trace(
+            filters=filters_,
+            rejecting_filter=rejecting_filter,
+            get_values_calls_count=counting_entity.get_values_calls_count,
+            ns=ns,
+            filter_type_to_ns_map=filter_type_to_ns_map,
+        )
+        self.traces.append(trace)
+        self.counters.add_trace(trace)
+        return is_matching
+
+    @dataclass(frozen=True)
+    class Checks:
+        does_entity_match_filters: EntityPredicate
+        filter_checks: Tuple[Tuple[filters.Filter, EntityPredicate], ...]
+
+    @dataclass(frozen=True)
+    class Trace:
+        filters: Tuple[filters.Filter, ...]
+        rejecting_filter: Optional[filters.Filter]
+        get_values_calls_count: int
+        ns: int
+        filter_type_to_ns_map: Dict[Type[filters.Filter], int]
+
+        @property
+        def is_matching(self) -> bool:
+            return self.rejecting_filter is None
+
+    @dataclass
+    class Counters:
+        calls_count: int = 0
+        matches_count: int = 0
+        get_values_calls_count: int = 0
+        ns: int = 0
+        filter_type_to_rejections_count_map: Dict[Type[filters.Filter], int] = field(default_factory=dict)
+        filter_type_to_ns_map: Dict[Type[filters.Filter], int] = field(default_factory=dict)
+
+        def add_trace(self, trace: TracingMatcher.Trace) -> None:
+            self.calls_count += 1
+            self.matches_count += int(trace.is_matching)
+            self.get_values_calls_count += trace.get_values_calls_count
+            self.ns += trace.ns
+            if trace.rejecting_filter is not None:
+                filter_type = type(trace.rejecting_filter)
+                self.filter_type_to_rejections_count_map[filter_type] = self.filter_type_to_rejections_count_map.get(filter_type, 0) + 1
+            for filter_type, ns in trace.filter_type_to_ns_map.items():
+                self.filter_type_to_ns_map[filter_type] = self.filter_type_to_ns_map.get(filter_type, 0) + ns
+
+    class CountingEntity(IEntity[Value]):
+        def __init__(self, entity: IEntity[Value]):
+            self.entity = entity
+            self.get_values_calls_count = 0
+
+        def get_values(self, field_: fields.Field):
+            self.get_values_calls_count += 1
+            return self.entity.get_values(field_)
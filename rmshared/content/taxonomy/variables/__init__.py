@@ -6,7 +6,11 @@ from rmshared.content.taxonomy.variables.abc import Argument
 from rmshared.content.taxonomy.variables.abc import IResolver
 from rmshared.content.taxonomy.variables.abc import Operator
 from rmshared.content.taxonomy.variables.abc import Reference
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.caching import CachingResolver
 from rmshared.content.taxonomy.variables.resolver import Resolver
+from rmshared.content.taxonomy.variables.slots import SlottedArguments
+from rmshared.content.taxonomy.variables.slots import SlottedPlan
 from rmshared.content.taxonomy.variables.fakes import Fakes
 
 
@@ -17,7 +21,9 @@ __all__ = (
     'Operator', 'operators',
     'Reference',
 
-    'IResolver', 'Resolver',
+    'IResolver', 'Resolver', 'CachingResolver',
+    'Analyzer',
+    'SlottedPlan', 'SlottedArguments',
 
     'protocols',
 
@@ -12,6 +12,7 @@ from typing import TypeVar
 Case = TypeVar('Case')
 Scalar = TypeVar('Scalar')
 Filter = TypeVar('Filter')
+Default = TypeVar('Default')
 
 
 @dataclass(frozen=True)
@@ -37,10 +38,43 @@ class IResolver(metaclass=ABCMeta):
     def dereference_filters_partially(
             self, operators_: Iterable[Operator[Filter]], arguments_: IArguments) -> Tuple[Iterable[Filter], Iterable[Operator[Filter]]]: ...
 
+    def specialize_filters(self, operators_: Iterable[Operator[Filter]], arguments_: IArguments) -> Iterator[Operator[Filter]]:
+        """
+        Override where the operators can be pruned for the known arguments, by default they are kept as they are.
+        """
+        return iter(operators_)
+
+    def compile(self, operators_: Iterable[Operator[Filter]]) -> IPlan[Filter]:
+        """
+        Override where the operators can be prepared once for resolving them against many arguments.
+        """
+        return self.DereferencingPlan(self, tuple(operators_))
+
+    class IPlan(Generic[Filter], metaclass=ABCMeta):
+        @abstractmethod
+        def resolve(self, arguments_: IResolver.IArguments) -> Iterator[Filter]: ...
+
+    class DereferencingPlan(IPlan[Filter]):
+        def __init__(self, resolver: IResolver, operators_: Tuple[Operator[Filter], ...]):
+            self.resolver = resolver
+            self.operators = operators_
+
+        def resolve(self, arguments_):
+            return self.resolver.dereference_filters(self.operators, arguments_)
+
     class IArguments(metaclass=ABCMeta):
         @abstractmethod
         def get_argument(self, alias: str) -> Argument:  # :raises: ArgumentNotFoundException
             ...
 
+        def get_argument_or(self, alias: str, default: Default) -> Argument | Default:
+            """
+            Override along with `get_argument` where missing arguments can be told apart without raising.
+            """
+            try:
+                return self.get_argument(alias)
+            except self.ArgumentNotFoundException:
+                return default
+
         class ArgumentNotFoundException(LookupError):
             ...
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter
+from typing import AbstractSet
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+
+from rmshared.tools import ensure_map_is_complete
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import values
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import Case
+from rmshared.content.taxonomy.variables.abc import IResolver
+
+Operator = TypeVar('Operator', bound=operators.Operator)
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+Label = TypeVar('Label', bound=core.labels.Label)
+Range = TypeVar('Range', bound=core.ranges.Range)
+Value = TypeVar('Value', bound=values.Value)
+OptionalArguments = Optional[IResolver.IArguments]
+CaseStreamer = Callable[[Case, OptionalArguments], Iterator['Analyzer.Usage']]
+OperatorStreamer = Callable[[Operator, CaseStreamer, OptionalArguments], Iterator['Analyzer.Usage']]
+FilterStreamer = Callable[[Filter, OptionalArguments], Iterator['Analyzer.Usage']]
+
+
+class Analyzer:
+    """
+    Walks operators without resolving them.
+    """
+
+    def __init__(self):
+        self.operator_to_streamer_map: Mapping[Type[Operator], OperatorStreamer] = ensure_map_is_complete(operators.Operator, {
+            operators.Switch: self._stream_switch_usages,
+            operators.Return: self._stream_return_usages,
+        })
+        self.filter_to_streamer_map: Mapping[Type[Filter], FilterStreamer] = ensure_map_is_complete(core.filters.Filter, {
+            core.filters.AnyLabel: self._stream_labels_filter_usages,
+            core.filters.NoLabels: self._stream_labels_filter_usages,
+            core.filters.AnyRange: self._stream_ranges_filter_usages,
+            core.filters.NoRanges: self._stream_ranges_filter_usages,
+        })
+        self.label_to_values_getter_map: Mapping[Type[Label], Callable[[Label], Iterable[values.Value]]] = ensure_map_is_complete(core.labels.Label, {
+            core.labels.Value: lambda label: [label.value],
+            core.labels.Badge: lambda _: [],
+            core.labels.Empty: lambda _: [],
+        })
+        self.range_to_values_getter_map: Mapping[Type[Range], Callable[[Range], Iterable[values.Value]]] = ensure_map_is_complete(core.ranges.Range, {
+            core.ranges.Between: lambda range_: [range_.min_value, range_.max_value],
+            core.ranges.LessThan: lambda range_: [range_.value],
+            core.ranges.MoreThan: lambda range_: [range_.value],
+        })
+        self.value_to_streamer_map: Mapping[Type[Value], Callable[[Value], Iterator[Analyzer.Usage]]] = ensure_map_is_complete(values.Value, {
+            values.Variable: lambda value: iter([self.VariableUsage(alias=value.ref.alias, index=value.index)]),
+            values.Constant: lambda _: iter([]),
+        })
+
+    def analyze(self, operators_: Iterable[operators.Operator[core.filters.Filter]]) -> Analyzer.Schema:
+        """
+        Describes all the arguments the operators reference.
+        """
+        alias_to_argument_types_map: Dict[str, AbstractSet[Type[Argument]]] = dict()
+        alias_to_max_index_map: Dict[str, int] = dict()
+        for usage in self._stream_usages(operators_, arguments_=None):
+            if isinstance(usage, self.SwitchUsage):
+                alias_to_argument_types_map[usage.alias] = alias_to_argument_types_map.get(usage.alias, frozenset()) | usage.argument_types
+            else:
+                alias_to_max_index_map[usage.alias] = max(alias_to_max_index_map.get(usage.alias, 0), usage.index)
+        return self.Schema(alias_to_argument_types_map, alias_to_max_index_map)
+
+    def validate_arguments(self, operators_: Iterable[operators.Operator[core.filters.Filter]], arguments_: IResolver.IArguments) -> None:
+        """
+        Checks that the arguments are enough to dereference the operators, following only the switch cases chosen by
+        the arguments at hand.
+
+        :raise: InvalidArgumentsException
+        """
+        for usage in self._stream_usages(operators_, arguments_):
+            argument = arguments_.get_argument_or(usage.alias, None)
+            if argument is None:
+                raise self.InvalidArgumentsException(['Missing argument', usage.alias])
+            if isinstance(usage, self.VariableUsage):
+                if not isinstance(argument, arguments.Value):
+                    raise self.InvalidArgumentsException(['Argument is not a value', usage.alias, argument])
+                if len(argument.values) < usage.index:
+                    raise self.InvalidArgumentsException(['Argument has too few values', usage.alias, argument, usage.index])
+
+    def stream_aliases(self, operators_: Iterable[operators.Operator[core.filters.Filter]]) -> Iterator[str]:
+        """
+        Streams the aliases of all the arguments the operators reference.
+        """
+        return map(attrgetter('alias'), self._stream_usages(operators_, arguments_=None))
+
+    def stream_required_aliases(self, operators_: Iterable[operators.Operator[core.filters.Filter]], arguments_: IResolver.IArguments) -> Iterator[str]:
+        """
+        Streams the aliases of the arguments dereferencing the operators needs, following only the switch cases chosen
+        by the arguments at hand.
+        """
+        return map(attrgetter('alias'), self._stream_usages(operators_, arguments_))
+
+    def _stream_usages(self, operators_: Iterable[Operator], arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(lambda operator_: self._stream_operator_usages(operator_, self._stream_filter_usages, arguments_), operators_))
+
+    def _stream_operator_usages(self, operator_: Operator, stream_case_usages: CaseStreamer, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return self.operator_to_streamer_map[type(operator_)](operator_, stream_case_usages, arguments_)
+
+    def _stream_switch_usages(self, operator_: operators.Switch, stream_case_usages: CaseStreamer, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        yield self.SwitchUsage(alias=operator_.ref.alias, argument_types=frozenset(operator_.cases.keys()))
+        for case in self._choose_switch_cases(operator_, arguments_):
+            yield from self._stream_operator_usages(case, stream_case_usages, arguments_)
+
+    @staticmethod
+    def _choose_switch_cases(operator_: operators.Switch, arguments_: OptionalArguments) -> Iterable[Operator]:
+        if arguments_ is None:
+            return operator_.cases.values()
+
+        argument = arguments_.get_argument_or(operator_.ref.alias, None)
+        if argument is None or type(argument) not in operator_.cases:
+            return ()
+        else:
+            return operator_.cases[type(argument)],
+
+    @staticmethod
+    def _stream_return_usages(operator_: operators.Return, stream_case_usages: CaseStreamer, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(lambda case: stream_case_usages(case, arguments_), operator_.cases))
+
+    def _stream_filter_usages(self, filter_: Filter, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return self.filter_to_streamer_map[type(filter_)](filter_, arguments_)
+
+    def _stream_labels_filter_usages(self, filter_: core.filters.AnyLabel | core.filters.NoLabels, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(lambda operator_: self._stream_operator_usages(operator_, self._stream_label_usages, arguments_), filter_.labels))
+
+    def _stream_ranges_filter_usages(self, filter_: core.filters.AnyRange | core.filters.NoRanges, arguments_: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(lambda operator_: self._stream_operator_usages(operator_, self._stream_range_usages, arguments_), filter_.ranges))
+
+    def _stream_label_usages(self, label: Label, _: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(self._stream_value_usages, self.label_to_values_getter_map[type(label)](label)))
+
+    def _stream_range_usages(self, range_: Range, _: OptionalArguments) -> Iterator[Analyzer.Usage]:
+        return chain.from_iterable(map(self._stream_value_usages, self.range_to_values_getter_map[type(range_)](range_)))
+
+    def _stream_value_usages(self, value: Value) -> Iterator[Analyzer.Usage]:
+        return self.value_to_streamer_map[type(value)](value)
+
+    @dataclass(frozen=True)
+    class Schema:
+        alias_to_argument_types_map: Mapping[str, AbstractSet[Type[Argument]]]  # The argument types switches have cases for
+        alias_to_max_index_map: Mapping[str, int]  # The greatest index variables refer to
+
+        @property
+        def aliases(self) -> AbstractSet[str]:
+            return frozenset(chain(self.alias_to_argument_types_map.keys(), self.alias_to_max_index_map.keys()))
+
+    @dataclass(frozen=True)
+    class Usage:
+        alias: str
+
+    @dataclass(frozen=True)
+    class SwitchUsage(Usage):
+        argument_types: AbstractSet[Type[Argument]]
+
+    @dataclass(frozen=True)
+    class VariableUsage(Usage):
+        index: int
+
+    class InvalidArgumentsException(ValueError):
+        ...
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import IResolver
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+
+Operator = TypeVar('Operator', bound=operators.Operator)
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+Result = TypeVar('Result')
+PartialResult = Tuple[Tuple[Filter, ...], Tuple[Operator, ...]]
+
+
+class CachingResolver(IResolver):
+    """
+    Remembers what another resolver dereferenced, keyed by the operators and the arguments they reference.
+
+    Filters are returned as tuples shared between the calls, so they must not be mutated. Arguments are keyed by their
+    values along with their types, and the ones that can't be hashed bypass the cache. The operators are hashed once per
+    call, and the aliases they reference are remembered for the `max_size` most recently used ones.
+    """
+
+    MAX_SIZE = 1024
+    MISSING = object()
+
+    def __init__(self, resolver: IResolver, max_size: int = MAX_SIZE, ttl: Optional[float] = None, clock: Callable[[], float] = monotonic):
+        self.resolver = resolver
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.key_to_entry_map: OrderedDict[Hashable, CachingResolver.Entry] = OrderedDict()
+        self.operators_to_aliases_map: OrderedDict[CachingResolver.Operators, Tuple[str, ...]] = OrderedDict()
+        self.analyzer = Analyzer()
+        self.counters = self.Counters()
+
+    def dereference_filters(self, operators_, arguments_):
+        operators_ = tuple(operators_)
+        return self._get_or_make('filters', operators_, arguments_, lambda: tuple(self.resolver.dereference_filters(operators_, arguments_)))
+
+    def dereference_filters_partially(self, operators_, arguments_):
+        operators_ = tuple(operators_)
+        return self._get_or_make('filters-partially', operators_, arguments_, lambda: self._dereference_filters_partially(operators_, arguments_))
+
+    def _dereference_filters_partially(self, operators_: Tuple[Operator, ...], arguments_: IResolver.IArguments) -> PartialResult:
+        filters_, operators_ = self.resolver.dereference_filters_partially(operators_, arguments_)
+        return tuple(filters_), tuple(operators_)
+
+    def specialize_filters(self, operators_, arguments_):
+        return self.resolver.specialize_filters(operators_, arguments_)
+
+    def compile(self, operators_):
+        return self.resolver.compile(operators_)
+
+    def clear(self) -> None:
+        self.key_to_entry_map.clear()
+        self.operators_to_aliases_map.clear()
+
+    def _get_or_make(self, kind: str, operators_: Tuple[Operator, ...], arguments_: IResolver.IArguments, make_result: Callable[[], Result]) -> Result:
+        try:
+            hashed_operators = self.Operators(operators_)
+            key = (kind, hashed_operators, self._make_fingerprint(hashed_operators, arguments_))
+            entry = self.key_to_entry_map.get(key)
+        except TypeError:  # Unhashable operators or arguments
+            self.counters.misses_count += 1
+            return make_result()
+
+        now = self.clock()
+        if entry is not None and (entry.expires_at is None or entry.expires_at > now):
+            self.key_to_entry_map.move_to_end(key)
+            self.counters.hits_count += 1
+            return entry.result
+
+        self.counters.misses_count += 1
+        result = make_result()
+        self.key_to_entry_map[key] = self.Entry(result=result, expires_at=None if self.ttl is None else now + self.ttl)
+        self.key_to_entry_map.move_to_end(key)
+        while len(self.key_to_entry_map) > self.max_size:
+            self.key_to_entry_map.popitem(last=False)
+            self.counters.evictions_count += 1
+        return result
+
+    def _make_fingerprint(self, operators_: CachingResolver.Operators, arguments_: IResolver.IArguments) -> Tuple[Any, ...]:
+        aliases = self.operators_to_aliases_map.get(operators_)
+        if aliases is None:
+            aliases = self.operators_to_aliases_map[operators_] = tuple(sorted(set(self.analyzer.stream_aliases(operators_.operators))))
+            if len(self.operators_to_aliases_map) > self.max_size:
+                self.operators_to_aliases_map.popitem(last=False)
+        else:
+            self.operators_to_aliases_map.move_to_end(operators_)
+        make_key = core.interning.Interner.make_component_key  # Tells 1, 1.0 and True apart
+        return tuple(map(lambda alias: make_key(arguments_.get_argument_or(alias, self.MISSING)), aliases))
+
+    class Operators:
+        """
+        Operators keyed by equality, with the hash of the whole operators tree computed once.
+        """
+
+        __slots__ = ('operators', 'hash')
+
+        def __init__(self, operators_: Tuple[Operator, ...]):
+            self.operators = operators_
+            self.hash = hash(operators_)
+
+        def __hash__(self) -> int:
+            return self.hash
+
+        def __eq__(self, other: Any) -> bool:
+            return isinstance(other, CachingResolver.Operators) and self.hash == other.hash and self.operators == other.operators
+
+    @dataclass(frozen=True)
+    class Entry:
+        result: Any
+        expires_at: Optional[float]
+
+    @dataclass
+    class Counters:
+        hits_count: int = 0
+        misses_count: int = 0
+        evictions_count: int = 0
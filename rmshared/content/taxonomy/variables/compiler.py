@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.tools import ensure_map_is_complete
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import values
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import Case
+from rmshared.content.taxonomy.variables.abc import Scalar
+from rmshared.content.taxonomy.variables.abc import IResolver
+
+Operator = TypeVar('Operator', bound=operators.Operator)
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+Label = TypeVar('Label', bound=core.labels.Label)
+Range = TypeVar('Range', bound=core.ranges.Range)
+Value = TypeVar('Value', bound=values.Value)
+Output = TypeVar('Output')
+Func = Callable[[IResolver.IArguments], Output]
+CaseCompiler = Callable[[Case], Func]
+
+
+class Compiler:
+    """
+    Turns operators into closures once, so that resolving them against arguments only looks the arguments up.
+    Operators that don't depend on any argument are resolved at compile time.
+    """
+    MISSING = object()
+
+    def __init__(self):
+        self.no_arguments = self.NoArguments()
+        self.operator_to_compiler_map: Mapping[Type[Operator], Callable[[Operator, CaseCompiler], Func]] = ensure_map_is_complete(operators.Operator, {
+            operators.Switch: self._compile_switch,
+            operators.Return: self._compile_return,
+        })
+        self.filter_to_compiler_map: Mapping[Type[Filter], Callable[[Filter], Func]] = ensure_map_is_complete(core.filters.Filter, {
+            core.filters.AnyLabel: self._compile_labels_filter,
+            core.filters.NoLabels: self._compile_labels_filter,
+            core.filters.AnyRange: self._compile_ranges_filter,
+            core.filters.NoRanges: self._compile_ranges_filter,
+        })
+        self.label_to_compiler_map: Mapping[Type[Label], Callable[[Label], Func]] = ensure_map_is_complete(core.labels.Label, {
+            core.labels.Value: self._compile_value_label,
+            core.labels.Badge: self._compile_constant,
+            core.labels.Empty: self._compile_constant,
+        })
+        self.range_to_compiler_map: Mapping[Type[Range], Callable[[Range], Func]] = ensure_map_is_complete(core.ranges.Range, {
+            core.ranges.Between: self._compile_between_range,
+            core.ranges.LessThan: self._compile_less_than_range,
+            core.ranges.MoreThan: self._compile_more_than_range,
+        })
+        self.value_to_compiler_map: Mapping[Type[Value], Callable[[Value], Func]] = ensure_map_is_complete(values.Value, {
+            values.Variable: self._compile_variable,
+            values.Constant: self._compile_constant_value,
+        })
+
+    def compile_filters(self, operators_: Iterable[operators.Operator[core.filters.Filter]]) -> Compiler.Plan[core.filters.Filter]:
+        return self.Plan(funcs=tuple(map(lambda operator_: self._compile_operator(operator_, self._compile_filter), operators_)))
+
+    def _compile_operator(self, operator_: Operator, compile_case: CaseCompiler) -> Func[Sequence[Case]]:
+        func = self.operator_to_compiler_map[type(operator_)](operator_, compile_case)
+        try:
+            cases = func(self.no_arguments)
+        except IResolver.IArguments.ArgumentNotFoundException:
+            return func
+        else:
+            return lambda _: cases
+
+    def _compile_switch(self, operator_: operators.Switch[Case], compile_case: CaseCompiler) -> Func[Sequence[Case]]:
+        alias = operator_.ref.alias
+        argument_type_to_func_map = {type_: self._compile_operator(case, compile_case) for type_, case in operator_.cases.items()}
+
+        def dereference_switch(arguments_: IResolver.IArguments) -> Sequence[Case]:
+            func = argument_type_to_func_map.get(type(_get_argument(arguments_, alias)))
+            return () if func is None else func(arguments_)
+
+        return dereference_switch
+
+    @staticmethod
+    def _compile_return(operator_: operators.Return[Case], compile_case: CaseCompiler) -> Func[Sequence[Case]]:
+        funcs = tuple(map(compile_case, operator_.cases))
+        return lambda arguments_: tuple(func(arguments_) for func in funcs)
+
+    def _compile_filter(self, filter_: Filter) -> Func[Filter]:
+        return self.filter_to_compiler_map[type(filter_)](filter_)
+
+    def _compile_labels_filter(self, filter_: Filter | core.filters.AnyLabel | core.filters.NoLabels) -> Func[Filter]:
+        type_ = type(filter_)
+        funcs = tuple(map(lambda operator_: self._compile_operator(operator_, self._compile_label), filter_.labels))
+        return lambda arguments_: type_(labels=tuple(chain.from_iterable(func(arguments_) for func in funcs)))
+
+    def _compile_ranges_filter(self, filter_: Filter | core.filters.AnyRange | core.filters.NoRanges) -> Func[Filter]:
+        type_ = type(filter_)
+        funcs = tuple(map(lambda operator_: self._compile_operator(operator_, self._compile_range), filter_.ranges))
+        return lambda arguments_: type_(ranges=tuple(chain.from_iterable(func(arguments_) for func in funcs)))
+
+    def _compile_label(self, label: Label) -> Func[Label]:
+        return self.label_to_compiler_map[type(label)](label)
+
+    def _compile_value_label(self, label: core.labels.Value) -> Func[core.labels.Value]:
+        type_, field = type(label), label.field
+        value_func = self._compile_value(label.value)
+        return lambda arguments_: type_(field=field, value=value_func(arguments_))
+
+    def _compile_range(self, range_: Range) -> Func[Range]:
+        return self.range_to_compiler_map[type(range_)](range_)
+
+    def _compile_between_range(self, range_: core.ranges.Between) -> Func[core.ranges.Between]:
+        type_, field = type(range_), range_.field
+        min_value_func = self._compile_value(range_.min_value)
+        max_value_func = self._compile_value(range_.max_value)
+        return lambda arguments_: type_(field=field, min_value=min_value_func(arguments_), max_value=max_value_func(arguments_))
+
+    def _compile_less_than_range(self, range_: core.ranges.LessThan) -> Func[core.ranges.LessThan]:
+        type_, field = type(range_), range_.field
+        value_func = self._compile_value(range_.value)
+        return lambda arguments_: type_(field=field, value=value_func(arguments_))
+
+    def _compile_more_than_range(self, range_: core.ranges.MoreThan) -> Func[core.ranges.MoreThan]:
+        type_, field = type(range_), range_.field
+        value_func = self._compile_value(range_.value)
+        return lambda arguments_: type_(field=field, value=value_func(arguments_))
+
+    def _compile_value(self, value: Value) -> Func[Scalar]:
+        return self.value_to_compiler_map[type(value)](value)
+
+    @staticmethod
+    def _compile_variable(value: values.Variable) -> Func[Scalar]:
+        alias, index = value.ref.alias, value.index - 1
+
+        def dereference_variable(arguments_: IResolver.IArguments) -> Scalar:
+            argument = _get_argument(arguments_, alias)
+            assert isinstance(argument, arguments.Value), [value, argument]
+            return argument.values[index]
+
+        return dereference_variable
+
+    @staticmethod
+    def _compile_constant_value(value: values.Constant) -> Func[Scalar]:
+        return lambda _: value.value
+
+    @staticmethod
+    def _compile_constant(case: Case) -> Func[Case]:
+        return lambda _: case
+
+    class Plan(IResolver.IPlan[Filter]):
+        def __init__(self, funcs: Tuple[Func[Sequence[Filter]], ...]):
+            self.funcs = funcs
+
+        def resolve(self, arguments_):
+            return chain.from_iterable(map(lambda func: func(arguments_), self.funcs))
+
+    class NoArguments(IResolver.IArguments):
+        def get_argument(self, alias):
+            raise self.ArgumentNotFoundException(alias)
+
+
+def _get_argument(arguments_: IResolver.IArguments, alias: str) -> Argument:
+    """
+    :raise: IResolver.IArguments.ArgumentNotFoundException
+    """
+    argument = arguments_.get_argument_or(alias, Compiler.MISSING)
+    if argument is Compiler.MISSING:
+        return arguments_.get_argument(alias)  # Raises the exception of the arguments for the missing one
+    return argument
@@ -62,6 +62,29 @@ class Fakes:
     def sample_filters(self) -> Iterator[operators.Operator[core.filters.Filter]]:
         return self.faker.stream_random_items(factory_func=self._make_filter_operator, min_size=3, max_size=5)
 
+    def make_nested_filters(self, depth: int, breadth: int) -> operators.Operator[core.filters.Filter]:
+        """
+        Makes `depth` nested switches over value arguments that return `breadth` filters of `breadth` labels or ranges.
+        """
+        if depth == 0:
+            return operators.Return(cases=tuple(map(lambda _: self._make_filter_with_breadth(breadth), range(breadth))))
+        else:
+            return operators.Switch(ref=self._make_reference(), cases=read_only({
+                arguments.Value: self.make_nested_filters(depth - 1, breadth),
+                arguments.Empty: operators.Return(cases=()),
+                arguments.Any: operators.Return(cases=()),
+            }))
+
+    def _make_filter_with_breadth(self, breadth: int) -> core.filters.Filter:
+        def sample_label_operators():
+            yield operators.Return(cases=tuple(map(lambda _: self._make_label(), range(breadth))))
+
+        def sample_range_operators():
+            yield operators.Return(cases=tuple(map(lambda _: self._make_range(), range(breadth))))
+
+        filters_ = self.core.stream_generic_filters(sample_label_operators, sample_range_operators)
+        return self.faker.random_element(elements=frozenset(filters_))
+
     def _make_filter_with_returns(self) -> core.filters.Filter:
         def sample_label_operators():
             yield self._make_return_operator(make_case=self._make_label)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import chain
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import TypeVar
+
+from rmshared.tools import ensure_map_is_complete
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import Case
+from rmshared.content.taxonomy.variables.abc import IResolver
+from rmshared.content.taxonomy.variables.compiler import CaseCompiler
+from rmshared.content.taxonomy.variables.compiler import Compiler
+from rmshared.content.taxonomy.variables.compiler import Func
+
+Operator = TypeVar('Operator', bound=operators.Operator)
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+
+
+class LazyCompiler(Compiler):
+    """
+    Compiles operators into filters whose labels and ranges are views over the compiled cases and the arguments: the
+    cases are resolved one by one while the filter is iterated, so a matcher that stops at the first matching label
+    doesn't build the rest of them. Views compare and hash as the tuples they stand for, and keep them once resolved
+    through, use `materialize_filter` to hold on to the concrete filter.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.filter_to_materializer_map: Mapping[Type[Filter], Callable[[Filter], Filter]] = ensure_map_is_complete(core.filters.Filter, {
+            core.filters.AnyLabel: self._materialize_labels_filter,
+            core.filters.NoLabels: self._materialize_labels_filter,
+            core.filters.AnyRange: self._materialize_ranges_filter,
+            core.filters.NoRanges: self._materialize_ranges_filter,
+        })
+
+    def materialize_filter(self, filter_: Filter) -> Filter:
+        return self.filter_to_materializer_map[type(filter_)](filter_)
+
+    def _compile_operator(self, operator_: Operator, compile_case: CaseCompiler) -> Func[Iterable[Case]]:
+        func = self.operator_to_compiler_map[type(operator_)](operator_, compile_case)
+        try:
+            cases = tuple(map(self._materialize_case, func(self.no_arguments)))
+        except IResolver.IArguments.ArgumentNotFoundException:
+            return func
+        else:
+            return lambda _: cases
+
+    @staticmethod
+    def _compile_return(operator_: operators.Return[Case], compile_case: CaseCompiler) -> Func[Iterable[Case]]:
+        funcs = tuple(map(compile_case, operator_.cases))
+        return lambda arguments_: map(lambda func: func(arguments_), funcs)
+
+    def _compile_labels_filter(self, filter_: Filter | core.filters.AnyLabel | core.filters.NoLabels) -> Func[Filter]:
+        type_ = type(filter_)
+        funcs = tuple(map(lambda operator_: self._compile_operator(operator_, self._compile_label), filter_.labels))
+        return lambda arguments_: type_(labels=self.Cases(funcs, arguments_))
+
+    def _compile_ranges_filter(self, filter_: Filter | core.filters.AnyRange | core.filters.NoRanges) -> Func[Filter]:
+        type_ = type(filter_)
+        funcs = tuple(map(lambda operator_: self._compile_operator(operator_, self._compile_range), filter_.ranges))
+        return lambda arguments_: type_(ranges=self.Cases(funcs, arguments_))
+
+    def _materialize_case(self, case: Case) -> Case:
+        if isinstance(case, core.filters.Filter):
+            return self.materialize_filter(case)
+        else:
+            return case
+
+    @staticmethod
+    def _materialize_labels_filter(filter_: Filter | core.filters.AnyLabel | core.filters.NoLabels) -> Filter:
+        return replace(filter_, labels=tuple(filter_.labels))
+
+    @staticmethod
+    def _materialize_ranges_filter(filter_: Filter | core.filters.AnyRange | core.filters.NoRanges) -> Filter:
+        return replace(filter_, ranges=tuple(filter_.ranges))
+
+    class Cases(Sequence[Case]):
+        """
+        Resolved while iterated, and remembered once iterated through, so that comparing, hashing or indexing them
+        doesn't resolve them again.
+        """
+
+        __slots__ = ('funcs', 'arguments', 'cases')
+
+        def __init__(self, funcs: Tuple[Func[Iterable[Case]], ...], arguments_: IResolver.IArguments):
+            self.funcs = funcs
+            self.arguments = arguments_
+            self.cases: Optional[Tuple[Case, ...]] = None
+
+        def __iter__(self) -> Iterator[Case]:
+            if self.cases is None:
+                return self._resolve_cases()
+            else:
+                return iter(self.cases)
+
+        def __getitem__(self, index):
+            return self._get_cases()[index]
+
+        def __len__(self) -> int:
+            return len(self._get_cases())
+
+        def __eq__(self, other) -> bool:
+            return self._get_cases() == other
+
+        def __hash__(self) -> int:
+            return hash(self._get_cases())
+
+        def __repr__(self) -> str:
+            return repr(self._get_cases())
+
+        def _get_cases(self) -> Tuple[Case, ...]:
+            if self.cases is None:
+                self.cases = tuple(chain.from_iterable(map(lambda func: func(self.arguments), self.funcs)))
+            return self.cases
+
+        def _resolve_cases(self) -> Iterator[Case]:
+            cases = []
+            for case in chain.from_iterable(map(lambda func: func(self.arguments), self.funcs)):
+                cases.append(case)
+                yield case
+            self.cases = tuple(cases)
@@ -1,3 +1,8 @@
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
 from rmshared.content.taxonomy import core
 
 from rmshared.content.taxonomy.variables.protocols import db
@@ -10,31 +15,45 @@ from rmshared.content.taxonomy.variables.protocols.builder import Builder
 
 class Factory:
     @classmethod
-    def make_instance_for_ui(cls) -> 'Factory':
-        return cls(builder=ui.Builder())
+    def make_instance_for_ui(cls, interner: Optional[core.interning.Interner] = None, cache: Optional[core.protocols.caching.Cache] = None) -> 'Factory':
+        return cls(builder=ui.Builder(), interner=interner, cache=cache)
 
     @classmethod
-    def make_instance_for_db(cls) -> 'Factory':
-        return cls(builder=db.Builder())
+    def make_instance_for_db(cls, interner: Optional[core.interning.Interner] = None, cache: Optional[core.protocols.caching.Cache] = None) -> 'Factory':
+        return cls(builder=db.Builder(), interner=interner, cache=cache)
 
-    def __init__(self, builder: IBuilder):
+    def __init__(self, builder: IBuilder, interner: Optional[core.interning.Interner] = None, cache: Optional[core.protocols.caching.Cache] = None):
         self.builder = builder
-        self.delegate = core.protocols.Factory(builder=self._make_builder(builder))
+        self.delegate = core.protocols.Factory(builder=self._make_builder(builder, interner, cache))
 
     @staticmethod
-    def _make_builder(builder: IBuilder) -> core.protocols.IBuilder:
+    def _make_builder(builder: IBuilder, interner: Optional[core.interning.Interner], cache: Optional[core.protocols.caching.Cache]) -> core.protocols.IBuilder:
         delegate = core.protocols.ui.Builder()
         variables = builder.make_variables()
         operators = builder.make_operators(variables)
         values = builder.make_values(variables, delegate=delegate.make_values())
-        return Builder(operators, values, delegate)
+        builder_ = Builder(operators, values, delegate)
+        builder_ = builder_ if cache is None else core.protocols.caching.Builder(builder_, cache)
+        return builder_ if interner is None else core.protocols.interning.Builder(builder_, interner)
 
     def make_composite(self) -> core.protocols.IComposite:
         return self.delegate.make_composite()
 
+    def make_binary(self) -> core.protocols.binary.Protocol:
+        return self.delegate.make_binary()
+
     def make_filters(self) -> core.protocols.IFilters:
         return self.delegate.make_filters()
 
+    def make_dumper(self) -> core.protocols.caching.Dumper:
+        return self.delegate.make_dumper()
+
+    def make_filters_from_bytes(self, buf: bytes | str) -> Iterator[Any]:
+        return self.delegate.make_filters_from_bytes(buf)
+
+    def iter_filters_from_jsonl(self, fileobj: Iterable[bytes | str]) -> Iterator[core.protocols.jsonl.Record]:
+        return self.delegate.iter_filters_from_jsonl(fileobj)
+
     def make_labels(self) -> core.protocols.ILabels:
         return self.delegate.make_labels()
 
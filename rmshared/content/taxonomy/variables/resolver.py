@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from abc import ABCMeta
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import Future
 from dataclasses import replace
 from itertools import chain
+from itertools import islice
 from typing import Callable
+from typing import Deque
 from typing import Generic
 from typing import Iterable
+from typing import Iterator
 from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 
@@ -22,6 +31,11 @@ from rmshared.content.taxonomy.variables import operators
 from rmshared.content.taxonomy.variables.abc import Case
 from rmshared.content.taxonomy.variables.abc import Scalar
 from rmshared.content.taxonomy.variables.abc import IResolver
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.compiler import Compiler
+from rmshared.content.taxonomy.variables.lazy import LazyCompiler
+from rmshared.content.taxonomy.variables.slots import SlottedPlan
+from rmshared.content.taxonomy.variables.specializer import Specializer
 
 InCase = TypeVar('InCase')
 OutCase = TypeVar('OutCase')
@@ -33,12 +47,28 @@ Value = TypeVar('Value', bound=values.Value)
 
 
 class Resolver(IResolver):
-    def __init__(self):
+    MISSING = object()  # Dereferenced instead of anything that needs a missing argument
+    WINDOW_SIZE = 16
+
+    def __init__(self, interner: Optional[core.interning.Interner] = None):
+        self.intern: Callable[[Case], Case] = as_is if interner is None else interner.intern
         self.factory = self.Factory(self)
+        self.analyzer = Analyzer()
+        self.compiler = Compiler()
+        self.lazy_compiler = LazyCompiler()
+        self.specializer = Specializer()
 
     def dereference_filters(self, operators_, arguments_):
         resolver = self.factory.make_filters_resolver(arguments_)
-        return chain.from_iterable(map(resolver.dereference_operator, operators_))
+        return chain.from_iterable(map(lambda operator_: self._dereference_operator(resolver, operator_, arguments_), operators_))
+
+    def _dereference_operator(self, resolver: Resolver.Operators, operator_: operators.Operator, arguments_: IResolver.IArguments) -> Iterable[Case]:
+        filters_ = resolver.dereference_operator(operator_)
+        if filters_ is self.MISSING:
+            for alias in self.analyzer.stream_required_aliases([operator_], arguments_):
+                arguments_.get_argument(alias)  # Raises the exception of the arguments for the missing one
+            raise IResolver.IArguments.ArgumentNotFoundException(operator_)
+        return filters_
 
     def dereference_filters_partially(self, operators_, arguments_):
         constant_filters = []
@@ -46,20 +76,87 @@ class Resolver(IResolver):
 
         resolver = self.factory.make_filters_resolver(arguments_)
         for operator in operators_:
-            try:
-                constant_filters.extend(resolver.dereference_operator(operator))
-            except IResolver.IArguments.ArgumentNotFoundException:
+            filters_ = resolver.dereference_operator(operator)
+            if filters_ is self.MISSING:
                 variable_filters.append(operator)
+            else:
+                constant_filters.extend(filters_)
 
         return constant_filters, variable_filters
 
+    def specialize_filters(self, operators_, arguments_):
+        return self.specializer.specialize_filters(operators_, arguments_)
+
+    def compile(self, operators_):
+        return self.compiler.compile_filters(operators_)
+
+    def compile_lazy(self, operators_: Iterable[operators.Operator[core.filters.Filter]]) -> Compiler.Plan[core.filters.Filter]:
+        """
+        Compiles the operators into filters that resolve their labels and ranges while being iterated, see `LazyCompiler`.
+        """
+        return self.lazy_compiler.compile_filters(operators_)
+
+    def materialize_filters(self, filters_: Iterable[core.filters.Filter]) -> Iterator[core.filters.Filter]:
+        return map(self.lazy_compiler.materialize_filter, filters_)
+
+    @staticmethod
+    def compile_slotted(operators_: Iterable[operators.Operator[core.filters.Filter]]) -> SlottedPlan[core.filters.Filter]:
+        """
+        Compiles the operators against arguments made by the plan itself, see `SlottedPlan.make_arguments`.
+        """
+        return SlottedPlan(operators_)
+
+    def dereference_filters_many(
+            self,
+            operators_: Iterable[operators.Operator[core.filters.Filter]],
+            arguments_iterable: Iterable[IResolver.IArguments],
+            executor: Optional[Executor] = None,
+            chunksize: int = 1,
+            window_size: int = WINDOW_SIZE,
+    ) -> Iterator[Tuple[core.filters.Filter, ...]]:
+        """
+        Dereferences the same operators against every arguments, in the order of the arguments. The operators are
+        compiled once through `compile` and the results are streamed lazily. With an executor the arguments are fanned
+        out to it in chunks of `chunksize`, keeping at most `window_size` chunks submitted ahead of the results read, so
+        the executor must run the compiled plan in this process (e.g. `ThreadPoolExecutor`).
+        """
+        plan = self.compile(operators_)
+        if executor is None:
+            return map(lambda arguments_: tuple(plan.resolve(arguments_)), arguments_iterable)
+        else:
+            return self._dereference_filters_concurrently(plan, iter(arguments_iterable), executor, chunksize, window_size)
+
+    @staticmethod
+    def _dereference_filters_concurrently(
+            plan: IResolver.IPlan[core.filters.Filter],
+            arguments_iterator: Iterator[IResolver.IArguments],
+            executor: Executor,
+            chunksize: int,
+            window_size: int,
+    ) -> Iterator[Tuple[core.filters.Filter, ...]]:
+        futures: Deque[Future[Sequence[Tuple[core.filters.Filter, ...]]]] = deque()
+        try:
+            for chunk in iter(lambda: tuple(islice(arguments_iterator, chunksize)), ()):
+                futures.append(executor.submit(_dereference_filters_chunk, plan, chunk))
+                if len(futures) >= window_size:
+                    yield from futures.popleft().result()
+            while futures:
+                yield from futures.popleft().result()
+        finally:
+            for future in futures:  # Left when the results are not read through
+                future.cancel()
+
     class Factory:
         def __init__(self, resolver: Resolver):
             self.resolver = resolver
+            self.last_arguments_and_filters_resolver: Tuple[Optional[Resolver.IArguments], Optional[Resolver.Operators]] = (None, None)
 
         def make_filters_resolver(self, arguments_: Resolver.IArguments) -> Resolver.Operators[core.filters.Filter]:
-            cases = self._make_filters_cases(arguments_)
-            return self.resolver.Operators(cases, arguments_)
+            last_arguments, filters_resolver = self.last_arguments_and_filters_resolver
+            if last_arguments is not arguments_:  # The resolvers only read the arguments, so they're reused for the same ones
+                filters_resolver = self.resolver.Operators(self._make_filters_cases(arguments_), arguments_)
+                self.last_arguments_and_filters_resolver = (arguments_, filters_resolver)
+            return filters_resolver
 
         def _make_labels_resolver(self, arguments_: Resolver.IArguments) -> Resolver.Operators[core.labels.Label]:
             cases = self._make_labels_cases(arguments_)
@@ -72,42 +169,52 @@ class Resolver(IResolver):
         def _make_filters_cases(self, arguments_: Resolver.IArguments) -> Resolver.Filters:
             labels = self._make_labels_resolver(arguments_)
             ranges = self._make_ranges_resolver(arguments_)
-            return self.resolver.Filters(labels, ranges)
+            return self.resolver.Filters(labels, ranges, self.resolver.intern)
 
         def _make_labels_cases(self, arguments_: Resolver.IArguments) -> Resolver.Labels:
             values_ = self._make_values_cases(arguments_)
-            return self.resolver.Labels(values_)
+            return self.resolver.Labels(values_, self.resolver.intern)
 
         def _make_ranges_cases(self, arguments_: Resolver.IArguments) -> Resolver.Ranges:
             values_ = self._make_values_cases(arguments_)
-            return self.resolver.Ranges(values_)
+            return self.resolver.Ranges(values_, self.resolver.intern)
 
         def _make_values_cases(self, arguments_: Resolver.IArguments) -> Resolver.Values:
             return self.resolver.Values(arguments_)
 
     class Operators(Generic[Case]):
+        """
+        Dereferences operators into sequences of cases, or into `Resolver.MISSING` as soon as an argument they need is
+        missing, without resolving the rest of them.
+        """
+
         def __init__(self, cases: ICases[Case, Case], arguments_: IResolver.IArguments):
             self.cases = cases
             self.arguments = arguments_
-            self.operator_to_dereference_func_map: Mapping[Type[Operator], Callable[[Operator], Iterable[Case]]] = ensure_map_is_complete(operators.Operator, {
+            self.operator_to_dereference_func_map: Mapping[Type[Operator], Callable[[Operator], Sequence[Case]]] = ensure_map_is_complete(operators.Operator, {
                 operators.Switch: self._dereference_switch,
                 operators.Return: self._dereference_return,
             })
 
-        def dereference_operator(self, operator_: operators.Operator[Case]) -> Iterable[Case]:
+        def dereference_operator(self, operator_: operators.Operator[Case]) -> Sequence[Case]:
             return self.operator_to_dereference_func_map[type(operator_)](operator_)
 
-        def _dereference_switch(self, operator_: operators.Switch[Case]) -> Iterable[Case]:
-            argument = self.arguments.get_argument(operator_.ref.alias)
-            try:
-                operator_ = operator_.cases[type(argument)]
-            except LookupError:
-                return iter([])
-            else:
-                return self.dereference_operator(operator_)
+        def _dereference_switch(self, operator_: operators.Switch[Case]) -> Sequence[Case]:
+            argument = self.arguments.get_argument_or(operator_.ref.alias, Resolver.MISSING)
+            if argument is Resolver.MISSING:
+                return Resolver.MISSING
+
+            operator_ = operator_.cases.get(type(argument))
+            return () if operator_ is None else self.dereference_operator(operator_)
 
-        def _dereference_return(self, operator_: operators.Return[Case]) -> Iterable[Case]:
-            return map(self.cases.dereference_case, operator_.cases)
+        def _dereference_return(self, operator_: operators.Return[Case]) -> Sequence[Case]:
+            cases = []
+            for case in operator_.cases:
+                case = self.cases.dereference_case(case)
+                if case is Resolver.MISSING:
+                    return Resolver.MISSING
+                cases.append(case)
+            return cases
 
         class ICases(Generic[InCase, OutCase], metaclass=ABCMeta):
             @abstractmethod
@@ -115,9 +222,10 @@ class Resolver(IResolver):
                 ...
 
     class Filters(Operators.ICases[core.filters.Filter, core.filters.Filter]):
-        def __init__(self, labels: Resolver.Operators[core.filters.Label], ranges: Resolver.Operators[core.filters.Range]):
+        def __init__(self, labels: Resolver.Operators[core.filters.Label], ranges: Resolver.Operators[core.filters.Range], intern: Callable[[Filter], Filter]):
             self.labels = labels
             self.ranges = ranges
+            self.intern = intern
             self.filter_to_dereference_func_map: Mapping[Type[Filter], Callable[[Filter], Filter]] = ensure_map_is_complete(core.filters.Filter, {
                 core.filters.AnyLabel: self._dereference_labels,
                 core.filters.NoLabels: self._dereference_labels,
@@ -126,17 +234,31 @@ class Resolver(IResolver):
             })
 
         def dereference_case(self, case: core.filters.Filter) -> core.filters.Filter:
-            return self.filter_to_dereference_func_map[type(case)](case)
+            case = self.filter_to_dereference_func_map[type(case)](case)
+            return case if case is Resolver.MISSING else self.intern(case)
 
         def _dereference_labels(self, case: Filter | core.filters.AnyLabel | core.filters.NoLabels) -> Filter:
-            return replace(case, labels=tuple(chain.from_iterable(map(self.labels.dereference_operator, case.labels))))
+            labels = self._dereference_operators(self.labels, case.labels)
+            return labels if labels is Resolver.MISSING else replace(case, labels=labels)
 
         def _dereference_ranges(self, case: Filter | core.filters.AnyRange | core.filters.NoRanges) -> Filter:
-            return replace(case, ranges=tuple(chain.from_iterable(map(self.ranges.dereference_operator, case.ranges))))
+            ranges = self._dereference_operators(self.ranges, case.ranges)
+            return ranges if ranges is Resolver.MISSING else replace(case, ranges=ranges)
+
+        @staticmethod
+        def _dereference_operators(resolver: Resolver.Operators[Case], operators_: Iterable[operators.Operator[Case]]) -> Tuple[Case, ...]:
+            cases = []
+            for operator_ in operators_:
+                operator_cases = resolver.dereference_operator(operator_)
+                if operator_cases is Resolver.MISSING:
+                    return Resolver.MISSING
+                cases.extend(operator_cases)
+            return tuple(cases)
 
     class Labels(Operators.ICases[core.labels.Label, core.labels.Label]):
-        def __init__(self, values_: Resolver.Operators.ICases[core.labels.Value, Scalar]):
+        def __init__(self, values_: Resolver.Operators.ICases[core.labels.Value, Scalar], intern: Callable[[Label], Label]):
             self.values = values_
+            self.intern = intern
             self.label_to_dereference_func_map: Mapping[Type[Label], Callable[[Label], Label]] = ensure_map_is_complete(core.labels.Label, {
                 core.labels.Value: self._dereference_value,
                 core.labels.Badge: as_is,
@@ -144,14 +266,17 @@ class Resolver(IResolver):
             })
 
         def dereference_case(self, case: core.labels.Label) -> core.labels.Label:
-            return self.label_to_dereference_func_map[type(case)](case)
+            case = self.label_to_dereference_func_map[type(case)](case)
+            return case if case is Resolver.MISSING else self.intern(case)
 
         def _dereference_value(self, label: core.labels.Value) -> core.labels.Value:
-            return replace(label, value=self.values.dereference_case(label.value))
+            value = self.values.dereference_case(label.value)
+            return value if value is Resolver.MISSING else replace(label, value=value)
 
     class Ranges(Operators.ICases[core.ranges.Range, core.ranges.Range]):
-        def __init__(self, values_: Resolver.Operators.ICases[core.ranges.Value, Scalar]):
+        def __init__(self, values_: Resolver.Operators.ICases[core.ranges.Value, Scalar], intern: Callable[[Range], Range]):
             self.values = values_
+            self.intern = intern
             self.range_to_dereference_func_map: Mapping[Type[Range], Callable[[Range], Range]] = ensure_map_is_complete(core.ranges.Range, {
                 core.ranges.Between: self._dereference_between,
                 core.ranges.LessThan: self._dereference_less_than,
@@ -159,18 +284,25 @@ class Resolver(IResolver):
             })
 
         def dereference_case(self, case: core.ranges.Range) -> core.ranges.Range:
-            return self.range_to_dereference_func_map[type(case)](case)
+            case = self.range_to_dereference_func_map[type(case)](case)
+            return case if case is Resolver.MISSING else self.intern(case)
 
         def _dereference_between(self, case: core.ranges.Between) -> core.ranges.Between:
             min_value = self.values.dereference_case(case.min_value)
+            if min_value is Resolver.MISSING:
+                return Resolver.MISSING
             max_value = self.values.dereference_case(case.max_value)
+            if max_value is Resolver.MISSING:
+                return Resolver.MISSING
             return replace(case, min_value=min_value, max_value=max_value)
 
         def _dereference_less_than(self, case: core.ranges.LessThan) -> core.ranges.LessThan:
-            return replace(case, value=self.values.dereference_case(case.value))
+            value = self.values.dereference_case(case.value)
+            return value if value is Resolver.MISSING else replace(case, value=value)
 
         def _dereference_more_than(self, case: core.ranges.MoreThan) -> core.ranges.MoreThan:
-            return replace(case, value=self.values.dereference_case(case.value))
+            value = self.values.dereference_case(case.value)
+            return value if value is Resolver.MISSING else replace(case, value=value)
 
     class Values(Operators.ICases[values.Value, Scalar]):
         def __init__(self, arguments_: Resolver.IArguments):
@@ -184,10 +316,16 @@ class Resolver(IResolver):
             return self.value_to_dereference_func_map[type(case)](case)
 
         def _dereference_variable(self, case: values.Variable) -> Scalar:
-            argument = self.arguments.get_argument(case.ref.alias)
+            argument = self.arguments.get_argument_or(case.ref.alias, Resolver.MISSING)
+            if argument is Resolver.MISSING:
+                return Resolver.MISSING
             assert isinstance(argument, arguments.Value), [case, argument]
             return argument.values[case.index - 1]
 
         @staticmethod
         def _dereference_constant(case: values.Constant) -> Scalar:
             return case.value
+
+
+def _dereference_filters_chunk(plan: IResolver.IPlan[core.filters.Filter], chunk: Sequence[IResolver.IArguments]) -> Sequence[Tuple[core.filters.Filter, ...]]:
+    return list(map(lambda arguments_: tuple(plan.resolve(arguments_)), chunk))
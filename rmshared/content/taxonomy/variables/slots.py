@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+from rmshared.typings import read_only
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import values
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import Case
+from rmshared.content.taxonomy.variables.abc import Scalar
+from rmshared.content.taxonomy.variables.abc import IResolver
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.compiler import CaseCompiler
+from rmshared.content.taxonomy.variables.compiler import Compiler
+from rmshared.content.taxonomy.variables.compiler import Func
+
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+
+
+class SlottedPlan(IResolver.IPlan[Filter]):
+    """
+    Interns the aliases the operators reference to integer slots, so that switches and variables index tuples instead
+    of looking the arguments up by alias. Arguments are checked against the operators once, when they are made; other
+    arguments are looked up into slots on every resolution.
+    """
+
+    def __init__(self, operators_: Iterable[operators.Operator[Filter]]):
+        self.operators = tuple(operators_)
+        self.analyzer = Analyzer()
+        aliases = dict.fromkeys(self.analyzer.stream_aliases(self.operators)).keys()
+        self.alias_to_slot_map: Mapping[str, int] = read_only({alias: slot for slot, alias in enumerate(aliases)})
+        self.plan = SlottedCompiler(self.alias_to_slot_map).compile_filters(self.operators)
+
+    def make_arguments(self, alias_to_argument_map: Mapping[str, Argument]) -> SlottedArguments:
+        """
+        :raise: Analyzer.InvalidArgumentsException
+        """
+        arguments_ = SlottedArguments(self.alias_to_slot_map, tuple(map(alias_to_argument_map.get, self.alias_to_slot_map.keys())))
+        self.analyzer.validate_arguments(self.operators, arguments_)
+        return arguments_
+
+    def resolve(self, arguments_: IResolver.IArguments):
+        if not isinstance(arguments_, SlottedArguments) or arguments_.alias_to_slot_map is not self.alias_to_slot_map:
+            arguments_ = self._make_slotted_arguments(arguments_)
+        return self.plan.resolve(arguments_)
+
+    def _make_slotted_arguments(self, arguments_: IResolver.IArguments) -> SlottedArguments:
+        slot_to_argument = tuple(map(lambda alias: arguments_.get_argument_or(alias, None), self.alias_to_slot_map.keys()))
+        return SlottedArguments(self.alias_to_slot_map, slot_to_argument)
+
+
+class SlottedArguments(IResolver.IArguments):
+    def __init__(self, alias_to_slot_map: Mapping[str, int], slot_to_argument: Tuple[Optional[Argument], ...]):
+        self.alias_to_slot_map = alias_to_slot_map
+        self.slot_to_argument = slot_to_argument
+        self.slot_to_values: Tuple[Sequence[Scalar], ...] = tuple(map(self._get_values, slot_to_argument))
+
+    def get_argument(self, alias):
+        argument = self.get_argument_or(alias, None)
+        if argument is None:
+            raise self.ArgumentNotFoundException(alias)
+        else:
+            return argument
+
+    def get_argument_or(self, alias, default):
+        slot = self.alias_to_slot_map.get(alias)
+        argument = None if slot is None else self.slot_to_argument[slot]
+        return default if argument is None else argument
+
+    @staticmethod
+    def _get_values(argument: Optional[Argument]) -> Sequence[Scalar]:
+        return argument.values if isinstance(argument, arguments.Value) else ()
+
+
+class SlottedCompiler(Compiler):
+    def __init__(self, alias_to_slot_map: Mapping[str, int]):
+        super().__init__()
+        self.alias_to_slot_map = alias_to_slot_map
+
+    def _compile_switch(self, operator_: operators.Switch[Case], compile_case: CaseCompiler) -> Func[Sequence[Case]]:
+        alias = operator_.ref.alias
+        slot = self.alias_to_slot_map[alias]
+        argument_type_to_func_map = {type_: self._compile_operator(case, compile_case) for type_, case in operator_.cases.items()}
+
+        def dereference_switch(arguments_: SlottedArguments) -> Sequence[Case]:
+            argument = arguments_.slot_to_argument[slot]
+            if argument is None:
+                raise IResolver.IArguments.ArgumentNotFoundException(alias)
+            func = argument_type_to_func_map.get(type(argument))
+            return () if func is None else func(arguments_)
+
+        return dereference_switch
+
+    def _compile_variable(self, value: values.Variable) -> Func[Scalar]:
+        alias = value.ref.alias
+        slot, index = self.alias_to_slot_map[alias], value.index - 1
+
+        def dereference_variable(arguments_: SlottedArguments) -> Scalar:
+            if arguments_.slot_to_argument[slot] is None:
+                raise IResolver.IArguments.ArgumentNotFoundException(alias)
+            return arguments_.slot_to_values[slot][index]
+
+        return dereference_variable
+
+    class NoArguments(Compiler.NoArguments):
+        @property
+        def slot_to_argument(self):
+            raise self.ArgumentNotFoundException()
+
+        @property
+        def slot_to_values(self):
+            raise self.ArgumentNotFoundException()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Type
+from typing import TypeVar
+
+from rmshared.tools import ensure_map_is_complete
+from rmshared.typings import read_only
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import values
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.abc import Case
+from rmshared.content.taxonomy.variables.abc import IResolver
+
+Operator = TypeVar('Operator', bound=operators.Operator)
+Filter = TypeVar('Filter', bound=core.filters.Filter)
+Label = TypeVar('Label', bound=core.labels.Label)
+Range = TypeVar('Range', bound=core.ranges.Range)
+Value = TypeVar('Value', bound=values.Value)
+CaseSpecializer = Callable[[Case, IResolver.IArguments], Case]
+OperatorSpecializer = Callable[[Operator, IResolver.IArguments, CaseSpecializer], Operator]
+
+
+class Specializer:
+    """
+    Substitutes the arguments that are known and leaves the rest of the operators as they are: switches over known
+    arguments are replaced with the chosen case, variables of known arguments become constants.
+    """
+
+    def __init__(self):
+        self.operator_to_specializer_map: Mapping[Type[Operator], OperatorSpecializer] = ensure_map_is_complete(operators.Operator, {
+            operators.Switch: self._specialize_switch,
+            operators.Return: self._specialize_return,
+        })
+        self.filter_to_specializer_map: Mapping[Type[Filter], Callable[[Filter, IResolver.IArguments], Filter]] = ensure_map_is_complete(core.filters.Filter, {
+            core.filters.AnyLabel: self._specialize_labels_filter,
+            core.filters.NoLabels: self._specialize_labels_filter,
+            core.filters.AnyRange: self._specialize_ranges_filter,
+            core.filters.NoRanges: self._specialize_ranges_filter,
+        })
+        self.label_to_specializer_map: Mapping[Type[Label], Callable[[Label, IResolver.IArguments], Label]] = ensure_map_is_complete(core.labels.Label, {
+            core.labels.Value: self._specialize_value_label,
+            core.labels.Badge: lambda label, _: label,
+            core.labels.Empty: lambda label, _: label,
+        })
+        self.range_to_specializer_map: Mapping[Type[Range], Callable[[Range, IResolver.IArguments], Range]] = ensure_map_is_complete(core.ranges.Range, {
+            core.ranges.Between: self._specialize_between_range,
+            core.ranges.LessThan: self._specialize_less_than_range,
+            core.ranges.MoreThan: self._specialize_more_than_range,
+        })
+        self.value_to_specializer_map: Mapping[Type[Value], Callable[[Value, IResolver.IArguments], Value]] = ensure_map_is_complete(values.Value, {
+            values.Variable: self._specialize_variable,
+            values.Constant: lambda value, _: value,
+        })
+
+    def specialize_filters(self, operators_: Iterable[Operator], arguments_: IResolver.IArguments) -> Iterator[Operator]:
+        return map(lambda operator_: self._specialize_operator(operator_, arguments_, self._specialize_filter), operators_)
+
+    def _specialize_operator(self, operator_: Operator, arguments_: IResolver.IArguments, specialize_case: CaseSpecializer) -> Operator:
+        return self.operator_to_specializer_map[type(operator_)](operator_, arguments_, specialize_case)
+
+    def _specialize_switch(self, operator_: operators.Switch, arguments_: IResolver.IArguments, specialize_case: CaseSpecializer) -> Operator:
+        argument = arguments_.get_argument_or(operator_.ref.alias, None)
+        if argument is None:
+            cases = {type_: self._specialize_operator(case, arguments_, specialize_case) for type_, case in operator_.cases.items()}
+            return operators.Switch(ref=operator_.ref, cases=read_only(cases))
+        elif type(argument) in operator_.cases:
+            return self._specialize_operator(operator_.cases[type(argument)], arguments_, specialize_case)
+        else:
+            return operators.Return(cases=())
+
+    @staticmethod
+    def _specialize_return(operator_: operators.Return, arguments_: IResolver.IArguments, specialize_case: CaseSpecializer) -> Operator:
+        return operators.Return(cases=tuple(map(lambda case: specialize_case(case, arguments_), operator_.cases)))
+
+    def _specialize_filter(self, filter_: Filter, arguments_: IResolver.IArguments) -> Filter:
+        return self.filter_to_specializer_map[type(filter_)](filter_, arguments_)
+
+    def _specialize_labels_filter(self, filter_: Filter | core.filters.AnyLabel | core.filters.NoLabels, arguments_: IResolver.IArguments) -> Filter:
+        return type(filter_)(labels=tuple(map(lambda operator_: self._specialize_operator(operator_, arguments_, self._specialize_label), filter_.labels)))
+
+    def _specialize_ranges_filter(self, filter_: Filter | core.filters.AnyRange | core.filters.NoRanges, arguments_: IResolver.IArguments) -> Filter:
+        return type(filter_)(ranges=tuple(map(lambda operator_: self._specialize_operator(operator_, arguments_, self._specialize_range), filter_.ranges)))
+
+    def _specialize_label(self, label: Label, arguments_: IResolver.IArguments) -> Label:
+        return self.label_to_specializer_map[type(label)](label, arguments_)
+
+    def _specialize_value_label(self, label: core.labels.Value, arguments_: IResolver.IArguments) -> core.labels.Value:
+        return type(label)(field=label.field, value=self._specialize_value(label.value, arguments_))
+
+    def _specialize_range(self, range_: Range, arguments_: IResolver.IArguments) -> Range:
+        return self.range_to_specializer_map[type(range_)](range_, arguments_)
+
+    def _specialize_between_range(self, range_: core.ranges.Between, arguments_: IResolver.IArguments) -> core.ranges.Between:
+        min_value = self._specialize_value(range_.min_value, arguments_)
+        max_value = self._specialize_value(range_.max_value, arguments_)
+        return type(range_)(field=range_.field, min_value=min_value, max_value=max_value)
+
+    def _specialize_less_than_range(self, range_: core.ranges.LessThan, arguments_: IResolver.IArguments) -> core.ranges.LessThan:
+        return type(range_)(field=range_.field, value=self._specialize_value(range_.value, arguments_))
+
+    def _specialize_more_than_range(self, range_: core.ranges.MoreThan, arguments_: IResolver.IArguments) -> core.ranges.MoreThan:
+        return type(range_)(field=range_.field, value=self._specialize_value(range_.value, arguments_))
+
+    def _specialize_value(self, value: Value, arguments_: IResolver.IArguments) -> Value:
+        return self.value_to_specializer_map[type(value)](value, arguments_)
+
+    def _specialize_variable(self, value: values.Variable, arguments_: IResolver.IArguments) -> values.Value:
+        argument = arguments_.get_argument_or(value.ref.alias, None)
+        if isinstance(argument, arguments.Value) and 0 < value.index <= len(argument.values):
+            return values.Constant(argument.values[value.index - 1])
+        else:  # Unknown, or known but on a case the switches never choose for it, the resolution decides
+            return value
@@ -0,0 +1,68 @@
+from typing import Mapping
+
+from pytest import fixture
+from pytest import raises
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import IResolver
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.tests import fixtures
+
+
+class TestAnalyzer:
+    @fixture
+    def analyzer(self) -> Analyzer:
+        return Analyzer()
+
+    def test_it_should_stream_aliases(self, analyzer: Analyzer):
+        assert set(analyzer.stream_aliases(iter(fixtures.FILTERS))) == {'variable_1', '$2', '$3', '$4', '$5'}
+
+    def test_it_should_stream_required_aliases(self, analyzer: Analyzer):
+        assert set(analyzer.stream_required_aliases(fixtures.FILTERS, self.Arguments({}))) == {'variable_1', '$2', '$3', '$4', '$5'}
+        assert set(analyzer.stream_required_aliases(fixtures.FILTERS[1:2], self.Arguments({}))) == {'variable_1'}
+        assert set(analyzer.stream_required_aliases(fixtures.FILTERS[1:2], self.Arguments({'variable_1': arguments.Empty()}))) == {'variable_1'}
+        assert list(analyzer.stream_required_aliases(fixtures.FILTERS[1:2], self.Arguments({'variable_1': arguments.Value(values=(1, ))}))) == [
+            'variable_1',
+            'variable_1',
+        ]
+
+    def test_it_should_analyze_operators(self, analyzer: Analyzer):
+        schema = analyzer.analyze(iter(fixtures.FILTERS))
+        assert schema.aliases == {'variable_1', '$2', '$3', '$4', '$5'}
+        assert schema.alias_to_argument_types_map == {
+            'variable_1': {arguments.Empty, arguments.Value},
+            '$2': {arguments.Any, arguments.Empty, arguments.Value},
+            '$3': {arguments.Any, arguments.Empty, arguments.Value},
+            '$4': {arguments.Value},
+            '$5': {arguments.Value},
+        }
+        assert schema.alias_to_max_index_map == {'variable_1': 1, '$3': 2, '$4': 2, '$5': 2}
+
+    def test_it_should_validate_arguments(self, analyzer: Analyzer):
+        alias_to_argument_map = {
+            'variable_1': arguments.Value(values=(567,)),
+            '$2': arguments.Any(),
+            '$3': arguments.Empty(),
+            '$4': arguments.Value(values=(100, 200)),
+            '$5': arguments.Value(values=(300, 400)),
+        }
+        analyzer.validate_arguments(fixtures.FILTERS, self.Arguments(alias_to_argument_map))
+        analyzer.validate_arguments(fixtures.FILTERS, self.Arguments(dict(alias_to_argument_map, variable_1=arguments.Empty())))
+
+        with raises(Analyzer.InvalidArgumentsException):
+            analyzer.validate_arguments(fixtures.FILTERS, self.Arguments(dict(alias_to_argument_map, variable_1=arguments.Value(values=()))))
+        with raises(Analyzer.InvalidArgumentsException):
+            analyzer.validate_arguments(fixtures.FILTERS, self.Arguments(dict(alias_to_argument_map, **{'$4': arguments.Value(values=(100,))})))
+        with raises(Analyzer.InvalidArgumentsException):
+            analyzer.validate_arguments(fixtures.FILTERS, self.Arguments({alias: argument for alias, argument in alias_to_argument_map.items() if alias != '$5'}))
+
+    class Arguments(IResolver.IArguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            self.alias_to_argument_map = alias_to_argument_map
+
+        def get_argument(self, alias):
+            try:
+                return self.alias_to_argument_map[alias]
+            except LookupError as e:
+                raise self.ArgumentNotFoundException(alias) from e
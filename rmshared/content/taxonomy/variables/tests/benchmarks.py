@@ -0,0 +1,196 @@
+"""
+Standalone benchmarks, run them with `python -m rmshared.content.taxonomy.variables.tests.benchmarks`.
+
+Results are printed as JSON lines (or written to `--output`); pass a previous output as `--baseline` to fail when any
+benchmark got slower than `--tolerance` allows.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from dataclasses import asdict
+from dataclasses import dataclass
+from timeit import Timer
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import protocols
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import Operator
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.fakes import Fakes
+from rmshared.content.taxonomy.variables.resolver import Resolver
+
+
+class Benchmarks:
+    TEMPLATES_COUNT = 20
+    REPEAT = 5
+    NUMBER = 10
+    SHAPES = (
+        (1, 2, 5),
+        (1, 16, 5),
+        (3, 4, 10),
+        (5, 8, 50),
+    )
+
+    def __init__(self, shapes: Iterable[Tuple[int, int, int]] = SHAPES):
+        self.resolver = Resolver()
+        self.ui = protocols.Factory.make_instance_for_ui().make_composite()
+        self.db = protocols.Factory.make_instance_for_db().make_composite()
+        self.cases = tuple(map(lambda shape: self.Case.make(Fakes(), *shape, templates_count=self.TEMPLATES_COUNT), shapes))
+
+    def run(self) -> Iterator[Benchmarks.Result]:
+        for case in self.cases:
+            yield self._measure('dereference_filters', case, self._make_dereference_filters(case))
+            yield self._measure('dereference_filters_partially[exceptions]', case, self._make_dereference_filters_partially(case, self.ExceptionalArguments))
+            yield self._measure('dereference_filters_partially[defaults]', case, self._make_dereference_filters_partially(case, self.DefaultingArguments))
+            yield self._measure('dereference_filters_partially[previous]', case, self._make_previous_dereference_filters_partially(case))
+            yield self._measure('compile.resolve', case, self._make_compiled_resolve(case))
+            if case.depth <= 1:  # The protocols only allow returns as the cases of switches
+                yield self._measure('protocols.ui', case, self._make_protocol_round_trip(case, self.ui))
+                yield self._measure('protocols.db', case, self._make_protocol_round_trip(case, self.db))
+
+    def _make_dereference_filters(self, case: Benchmarks.Case) -> Callable[[], None]:
+        arguments_ = self.DefaultingArguments(case.alias_to_argument_map)
+
+        def dereference_templates():
+            for operators_ in case.templates:
+                tuple(self.resolver.dereference_filters(operators_, arguments_))
+
+        return dereference_templates
+
+    def _make_dereference_filters_partially(self, case: Benchmarks.Case, make_arguments: Callable[[Mapping[str, Argument]], Resolver.IArguments]):
+        arguments_ = make_arguments(case.half_alias_to_argument_map)
+
+        def dereference_templates():
+            for operators_ in case.templates:
+                self.resolver.dereference_filters_partially(operators_, arguments_)
+
+        return dereference_templates
+
+    def _make_previous_dereference_filters_partially(self, case: Benchmarks.Case) -> Callable[[], None]:
+        arguments_ = self.ExceptionalArguments(case.half_alias_to_argument_map)
+
+        def dereference_templates():  # As before the single pass, catching an exception per variable operator
+            for operators_ in case.templates:
+                constant_filters = []
+                variable_filters = []
+                for operator in operators_:
+                    try:
+                        constant_filters.extend(self.resolver.dereference_filters([operator], arguments_))
+                    except Resolver.IArguments.ArgumentNotFoundException:
+                        variable_filters.append(operator)
+
+        return dereference_templates
+
+    def _make_compiled_resolve(self, case: Benchmarks.Case) -> Callable[[], None]:
+        arguments_ = self.DefaultingArguments(case.alias_to_argument_map)
+        plans = tuple(map(self.resolver.compile, case.templates))
+
+        def resolve_templates():
+            for plan in plans:
+                tuple(plan.resolve(arguments_))
+
+        return resolve_templates
+
+    @staticmethod
+    def _make_protocol_round_trip(case: Benchmarks.Case, protocol) -> Callable[[], None]:
+        def round_trip_templates():
+            for operators_ in case.templates:
+                for operator_ in operators_:
+                    protocol.make_filter(protocol.jsonify_filter(operator_))
+
+        return round_trip_templates
+
+    def _measure(self, name: str, case: Benchmarks.Case, func: Callable[[], None]) -> Benchmarks.Result:
+        seconds = min(Timer(func).repeat(repeat=self.REPEAT, number=self.NUMBER)) / self.NUMBER / len(case.templates)
+        return self.Result(name=name, depth=case.depth, breadth=case.breadth, values_count=case.values_count, seconds_per_template=seconds)
+
+    @dataclass(frozen=True)
+    class Case:
+        depth: int  # Nested switches
+        breadth: int  # Filters per return and labels or ranges per filter
+        values_count: int  # Values per argument
+        templates: Sequence[Tuple[Operator, ...]]
+        alias_to_argument_map: Mapping[str, Argument]
+        half_alias_to_argument_map: Mapping[str, Argument]
+
+        @classmethod
+        def make(cls, fakes: Fakes, depth: int, breadth: int, values_count: int, templates_count: int) -> Benchmarks.Case:
+            templates = tuple(map(lambda _: (fakes.make_nested_filters(depth, breadth), ), range(templates_count)))
+            aliases = sorted(set(Analyzer().stream_aliases(operator_ for operators_ in templates for operator_ in operators_)))
+            alias_to_argument_map = {alias: arguments.Value(values=tuple(range(values_count))) for alias in aliases}
+            half_alias_to_argument_map = {alias: alias_to_argument_map[alias] for alias in aliases[::2]}
+            return cls(depth, breadth, values_count, templates, alias_to_argument_map, half_alias_to_argument_map)
+
+    @dataclass(frozen=True)
+    class Result:
+        name: str
+        depth: int
+        breadth: int
+        values_count: int
+        seconds_per_template: float
+
+        @property
+        def key(self) -> str:
+            return f'{self.name}[depth={self.depth},breadth={self.breadth},values={self.values_count}]'
+
+    class ExceptionalArguments(Resolver.IArguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            self.alias_to_argument_map = alias_to_argument_map
+
+        def get_argument(self, alias):
+            try:
+                return self.alias_to_argument_map[alias]
+            except LookupError as e:
+                raise self.ArgumentNotFoundException(alias) from e
+
+    class DefaultingArguments(ExceptionalArguments):
+        def get_argument_or(self, alias, default):
+            return self.alias_to_argument_map.get(alias, default)
+
+
+def find_regressions(results: Iterable[Benchmarks.Result], baseline: Iterable[Mapping], tolerance: float) -> Iterator[str]:
+    key_to_seconds_map = {Benchmarks.Result(**data).key: data['seconds_per_template'] for data in baseline}
+    for result in results:
+        seconds = key_to_seconds_map.get(result.key)
+        if seconds is not None and result.seconds_per_template > seconds * (1 + tolerance):
+            yield f'{result.key}: {seconds * 1e6:.1f}us -> {result.seconds_per_template * 1e6:.1f}us'
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = ArgumentParser(description='Benchmarks the resolution of variable filters')
+    parser.add_argument('--output', help='Write the results as JSON lines to this file instead of stdout')
+    parser.add_argument('--baseline', help='JSON lines of previous results to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown against the baseline, 0.2 is 20%%')
+    args = parser.parse_args(argv)
+
+    results = tuple(Benchmarks().run())
+    lines = '\n'.join(map(lambda result: json.dumps(asdict(result)), results)) + '\n'
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(lines)
+    else:
+        sys.stdout.write(lines)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = tuple(map(json.loads, filter(None, map(str.strip, file))))
+        regressions = tuple(find_regressions(results, baseline, args.tolerance))
+        for regression in regressions:
+            print(f'Regression: {regression}', file=sys.stderr)
+        return 1 if regressions else 0
+    else:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
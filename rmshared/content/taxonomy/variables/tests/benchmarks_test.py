@@ -0,0 +1,45 @@
+from dataclasses import asdict
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
+from rmshared.content.taxonomy.variables.fakes import Fakes
+from rmshared.content.taxonomy.variables.tests.benchmarks import Benchmarks
+from rmshared.content.taxonomy.variables.tests.benchmarks import find_regressions
+
+
+class TestBenchmarks:
+    def test_it_should_make_nested_filters(self):
+        operator_ = Fakes().make_nested_filters(depth=2, breadth=3)
+        for _ in range(2):
+            assert isinstance(operator_, operators.Switch)
+            operator_ = operator_.cases[arguments.Value]
+
+        assert isinstance(operator_, operators.Return)
+        assert len(operator_.cases) == 3
+
+    def test_it_should_run_benchmarks(self):
+        benchmarks = self.QuickBenchmarks(shapes=[(1, 2, 5)])
+        results = tuple(benchmarks.run())
+        assert {result.name for result in results} == {
+            'dereference_filters',
+            'dereference_filters_partially[exceptions]',
+            'dereference_filters_partially[defaults]',
+            'dereference_filters_partially[previous]',
+            'compile.resolve',
+            'protocols.ui',
+            'protocols.db',
+        }
+        assert all(result.seconds_per_template > 0 for result in results)
+
+    def test_it_should_find_regressions(self):
+        result = Benchmarks.Result(name='compile.resolve', depth=1, breadth=2, values_count=5, seconds_per_template=0.0001)
+        assert list(find_regressions([result], [asdict(result)], tolerance=0.2)) == []
+        assert list(find_regressions([result], [dict(asdict(result), seconds_per_template=0.00009)], tolerance=0.2)) == []
+        assert list(find_regressions([result], [dict(asdict(result), seconds_per_template=0.00005)], tolerance=0.2)) == [
+            'compile.resolve[depth=1,breadth=2,values=5]: 50.0us -> 100.0us',
+        ]
+
+    class QuickBenchmarks(Benchmarks):
+        TEMPLATES_COUNT = 2
+        REPEAT = 1
+        NUMBER = 1
@@ -0,0 +1,114 @@
+from typing import Mapping
+
+from pytest import fixture
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.caching import CachingResolver
+from rmshared.content.taxonomy.variables.resolver import Resolver
+from rmshared.content.taxonomy.variables.tests import fixtures
+
+
+class TestCachingResolver:
+    @fixture
+    def clock(self) -> 'TestCachingResolver.Clock':
+        return self.Clock()
+
+    @fixture
+    def resolver(self, clock: 'TestCachingResolver.Clock') -> CachingResolver:
+        return CachingResolver(resolver=Resolver(), max_size=2, ttl=60, clock=clock)
+
+    def test_it_should_cache_filters(self, resolver: CachingResolver):
+        filters_1 = resolver.dereference_filters(operators_=iter(fixtures.FILTERS), arguments_=self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1))
+        filters_2 = resolver.dereference_filters(operators_=iter(fixtures.FILTERS), arguments_=self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1))
+        assert filters_1 == tuple(Resolver().dereference_filters(fixtures.FILTERS, self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)))
+        assert filters_2 is filters_1
+        assert resolver.counters == CachingResolver.Counters(hits_count=1, misses_count=1, evictions_count=0)
+
+        filters_3 = resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_2))
+        assert filters_3 == tuple(Resolver().dereference_filters(fixtures.FILTERS, self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_2)))
+        assert resolver.counters == CachingResolver.Counters(hits_count=1, misses_count=2, evictions_count=0)
+
+        alias_to_argument_map = dict(self.ALIAS_TO_ARGUMENT_MAP_1, unused=arguments.Empty())
+        assert resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=self.Arguments(alias_to_argument_map)) is filters_1
+        assert resolver.counters == CachingResolver.Counters(hits_count=2, misses_count=2, evictions_count=0)
+
+    def test_it_should_cache_filters_partially(self, resolver: CachingResolver):
+        arguments_ = self.Arguments({'variable_1': arguments.Value(values=(567,)), '$1': arguments.Value(values=(567,))})
+        filters_1, operators_1 = resolver.dereference_filters_partially(operators_=fixtures.FILTERS, arguments_=arguments_)
+        filters_2, operators_2 = resolver.dereference_filters_partially(operators_=fixtures.FILTERS, arguments_=arguments_)
+        assert (filters_1, operators_1) == (filters_2, operators_2)
+        assert filters_2 is filters_1
+        assert operators_1 == fixtures.FILTERS[2:]
+        assert resolver.counters == CachingResolver.Counters(hits_count=1, misses_count=1, evictions_count=0)
+
+    def test_it_should_evict_entries(self, resolver: CachingResolver, clock: 'TestCachingResolver.Clock'):
+        arguments_1 = self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)
+        arguments_2 = self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_2)
+        resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_1)
+        resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_2)
+        resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_1)
+        resolver.dereference_filters(operators_=fixtures.FILTERS[1:], arguments_=arguments_1)
+        assert resolver.counters == CachingResolver.Counters(hits_count=1, misses_count=3, evictions_count=1)
+
+        resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_1)
+        assert resolver.counters == CachingResolver.Counters(hits_count=2, misses_count=3, evictions_count=1)
+
+        clock.now += 61
+        resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_1)
+        assert resolver.counters == CachingResolver.Counters(hits_count=2, misses_count=4, evictions_count=1)
+
+    def test_it_should_bound_aliases_of_operators(self, resolver: CachingResolver):
+        arguments_ = self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)
+        for index in range(len(fixtures.FILTERS)):
+            resolver.dereference_filters(operators_=fixtures.FILTERS[index:], arguments_=arguments_)
+        assert len(resolver.operators_to_aliases_map) == 2
+        assert CachingResolver.Operators(fixtures.FILTERS[-1:]) in resolver.operators_to_aliases_map
+
+    def test_it_should_bypass_cache_for_unhashable_arguments(self, resolver: CachingResolver):
+        arguments_ = self.Arguments(dict(self.ALIAS_TO_ARGUMENT_MAP_1, **{'$3': arguments.Value(values=['tag-1', 'tag-2'])}))
+        assert resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_) == tuple(Resolver().dereference_filters(fixtures.FILTERS, arguments_))
+        assert resolver.counters == CachingResolver.Counters(hits_count=0, misses_count=1, evictions_count=0)
+        assert len(resolver.key_to_entry_map) == 0
+
+    def test_it_should_tell_apart_arguments_of_different_types(self, resolver: CachingResolver):
+        for value in (1, True, 1.0, 1):
+            arguments_ = self.Arguments(dict(self.ALIAS_TO_ARGUMENT_MAP_1, **{'$3': arguments.Value(values=(value, 'tag-2'))}))
+            filters_ = resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_)
+            assert filters_ == tuple(Resolver().dereference_filters(fixtures.FILTERS, arguments_))
+            assert tuple(map(lambda label: type(label.value), filters_[3].labels)) == (int, type(value), str)
+        assert resolver.counters == CachingResolver.Counters(hits_count=0, misses_count=4, evictions_count=2)
+
+    ALIAS_TO_ARGUMENT_MAP_1 = {
+        'variable_1': arguments.Empty(),
+        '$1': arguments.Empty(),
+        '$2': arguments.Value(values=tuple()),
+        '$3': arguments.Value(values=('tag-1', 'tag-2')),
+        '$4': arguments.Value(values=(100, 200)),
+        '$5': arguments.Value(values=(300, 400)),
+    }
+    ALIAS_TO_ARGUMENT_MAP_2 = {
+        'variable_1': arguments.Value(values=(567,)),
+        '$1': arguments.Value(values=(567,)),
+        '$2': arguments.Any(),
+        '$3': arguments.Empty(),
+        '$4': arguments.Empty(),
+        '$5': arguments.Any(),
+    }
+
+    class Clock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class Arguments(Resolver.IArguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            self.alias_to_argument_map = alias_to_argument_map
+
+        def get_argument(self, alias):
+            try:
+                return self.alias_to_argument_map[alias]
+            except LookupError as e:
+                raise self.ArgumentNotFoundException(alias) from e
@@ -20,6 +20,11 @@ class TestDbProtocol:
         data = tuple(map(protocol.jsonify_filter, fixtures.FILTERS))
         assert data == self.FILTERS_DATA
 
+    def test_it_should_round_trip_binary_filters(self):
+        protocol = protocols.Factory.make_instance_for_db().make_binary()
+        assert tuple(protocol.loads_filters(protocol.dumps_filters(fixtures.FILTERS))) == fixtures.FILTERS
+        assert tuple(map(protocol.loads_filter, map(protocol.dumps_filter, fixtures.FILTERS))) == fixtures.FILTERS
+
     FILTERS_DATA = (
         {'@return': {'@cases': [
             {'any_label': [
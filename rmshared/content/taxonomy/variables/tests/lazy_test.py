@@ -0,0 +1,99 @@
+from sys import maxsize
+from typing import Mapping
+
+from pytest import fixture
+
+from rmshared.content.taxonomy import core
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.resolver import Resolver
+from rmshared.content.taxonomy.variables.tests import fixtures
+
+
+class TestLazyCompiler:
+    ALIAS_TO_ARGUMENT_MAP_1 = {
+        'variable_1': arguments.Empty(),
+        '$2': arguments.Value(values=tuple()),
+        '$3': arguments.Value(values=('tag-1', 'tag-2')),
+        '$4': arguments.Value(values=(100, 200)),
+        '$5': arguments.Value(values=(300, maxsize)),
+    }
+    ALIAS_TO_ARGUMENT_MAP_2 = {
+        'variable_1': arguments.Value(values=(567,)),
+        '$2': arguments.Any(),
+        '$3': arguments.Empty(),
+        '$4': arguments.Empty(),
+        '$5': arguments.Any(),
+    }
+
+    @fixture
+    def resolver(self) -> Resolver:
+        return Resolver()
+
+    def test_it_should_resolve_filters_lazily(self, resolver: Resolver):
+        plan = resolver.compile_lazy(operators_=iter(fixtures.FILTERS))
+        for alias_to_argument_map in (self.ALIAS_TO_ARGUMENT_MAP_1, self.ALIAS_TO_ARGUMENT_MAP_2):
+            arguments_ = self.Arguments(alias_to_argument_map)
+            expected_filters = tuple(resolver.dereference_filters(fixtures.FILTERS, arguments_))
+            filters_ = tuple(plan.resolve(arguments_))
+            assert filters_ == expected_filters
+            assert hash(filters_) == hash(expected_filters)
+
+            materialized_filters = tuple(resolver.materialize_filters(filters_))
+            assert materialized_filters == expected_filters
+            assert all(type(getattr(filter_, 'labels', getattr(filter_, 'ranges', None))) is tuple for filter_ in materialized_filters)
+
+    def test_it_should_resolve_lazy_filters_once(self, resolver: Resolver):
+        arguments_ = self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)
+        filters_ = tuple(resolver.compile_lazy(fixtures.FILTERS).resolve(arguments_))
+        expected_filters = tuple(resolver.dereference_filters(fixtures.FILTERS, self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)))
+        assert filters_ == expected_filters
+        get_argument_calls_count = arguments_.get_argument_calls_count
+
+        for _ in range(2):
+            assert filters_ == expected_filters
+            assert hash(filters_) == hash(expected_filters)
+            assert list(map(len, map(lambda filter_: getattr(filter_, 'labels', getattr(filter_, 'ranges', None)), filters_))) == \
+                list(map(len, map(lambda filter_: getattr(filter_, 'labels', getattr(filter_, 'ranges', None)), expected_filters)))
+        assert arguments_.get_argument_calls_count == get_argument_calls_count
+
+    def test_it_should_match_lazy_filters(self, resolver: Resolver):
+        matcher = core.Matcher()
+        entity = self.Entity({
+            core.fields.System('post-id'): [123],
+            core.fields.System('post-regular-section'): [567],
+            core.fields.System('post-primary-tag'): [],
+        })
+        for alias_to_argument_map in (self.ALIAS_TO_ARGUMENT_MAP_1, self.ALIAS_TO_ARGUMENT_MAP_2):
+            arguments_ = self.Arguments(alias_to_argument_map)
+            filters_ = tuple(resolver.compile_lazy(fixtures.FILTERS).resolve(arguments_))
+            expected_filters = tuple(resolver.dereference_filters(fixtures.FILTERS, arguments_))
+            for filter_, expected_filter in zip(filters_, expected_filters):
+                assert matcher.does_entity_match_filters(entity, [filter_]) == matcher.does_entity_match_filters(entity, [expected_filter])
+
+    def test_it_should_encode_lazy_filters(self, resolver: Resolver):
+        keys = core.encoders.Factory.make_instance_for_keys().make_filters()
+        arguments_ = self.Arguments(self.ALIAS_TO_ARGUMENT_MAP_1)
+        filters_ = resolver.compile_lazy(fixtures.FILTERS).resolve(arguments_)
+        expected_filters = resolver.dereference_filters(fixtures.FILTERS, arguments_)
+        assert list(map(keys.encode_filter, filters_)) == list(map(keys.encode_filter, expected_filters))
+
+    class Arguments(Resolver.IArguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            self.alias_to_argument_map = alias_to_argument_map
+            self.get_argument_calls_count = 0
+
+        def get_argument(self, alias):
+            self.get_argument_calls_count += 1
+            try:
+                return self.alias_to_argument_map[alias]
+            except LookupError as e:
+                raise self.ArgumentNotFoundException(alias) from e
+
+    class Entity(core.IEntity):
+        def __init__(self, field_to_values_map):
+            self.field_to_values_map = field_to_values_map
+
+        def get_values(self, field):
+            return self.field_to_values_map.get(field, [])
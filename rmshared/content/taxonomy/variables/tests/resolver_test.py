@@ -1,3 +1,5 @@
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
 from sys import maxsize
 from typing import Mapping
 
@@ -5,8 +7,11 @@ from pytest import fixture
 
 from rmshared.content.taxonomy import core
 
+from rmshared.content.taxonomy.variables import values
 from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables import operators
 from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.abc import IResolver
 from rmshared.content.taxonomy.variables.resolver import Resolver
 from rmshared.content.taxonomy.variables.tests import fixtures
 
@@ -170,6 +175,183 @@ class TestServerResolver:
         )
         assert tuple(operators_5) == tuple()
 
+    def test_it_should_dereference_filters_partially_without_exceptions(self, resolver: Resolver):
+        arguments_ = self.DefaultingArguments({
+            'variable_1': arguments.Value(values=(567,)),
+            '$1': arguments.Value(values=(567,)),
+            '$3': arguments.Empty(),
+        })
+        filters_, operators_ = resolver.dereference_filters_partially(operators_=fixtures.FILTERS, arguments_=arguments_)
+        assert len(tuple(filters_)) == 3
+        assert tuple(operators_) == (fixtures.FILTERS[2], ) + tuple(fixtures.FILTERS[4:])
+        assert arguments_.exceptions_count == 0
+
+    def test_it_should_get_arguments_or_defaults(self):
+        arguments_ = self.Arguments({'$1': arguments.Empty()})
+        assert arguments_.get_argument_or('$1', None) == arguments.Empty()
+        assert arguments_.get_argument_or('$2', None) is None
+
+    def test_it_should_compile_filters(self, resolver: Resolver):
+        arguments_1 = self.Arguments({
+            'variable_1': arguments.Empty(),
+            '$1': arguments.Empty(),
+            '$2': arguments.Value(values=tuple()),
+            '$3': arguments.Value(values=('tag-1', 'tag-2')),
+            '$4': arguments.Value(values=(100, 200)),
+            '$5': arguments.Value(values=(300, maxsize)),
+        })
+        arguments_2 = self.Arguments({
+            'variable_1': arguments.Value(values=(567,)),
+            '$1': arguments.Value(values=(567,)),
+            '$2': arguments.Any(),
+            '$3': arguments.Empty(),
+            '$4': arguments.Empty(),
+            '$5': arguments.Any(),
+        })
+
+        plan = resolver.compile(operators_=iter(fixtures.FILTERS))
+        for arguments_ in (arguments_1, arguments_2, arguments_1):
+            assert tuple(plan.resolve(arguments_)) == tuple(resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_))
+
+        assert tuple(resolver.compile(operators_=fixtures.FILTERS[:1]).resolve(self.Arguments({}))) == (
+            core.filters.AnyLabel(labels=(
+                core.labels.Value(field=core.fields.System('post-id'), value=123),
+            )),
+        )
+
+    def test_it_should_compile_filters_of_dereferencing_resolvers(self, resolver: Resolver):
+        dereferencing_resolver = self.DereferencingResolver(resolver)
+        arguments_ = self.Arguments({
+            'variable_1': arguments.Value(values=(567,)),
+            '$1': arguments.Value(values=(567,)),
+            '$2': arguments.Any(),
+            '$3': arguments.Empty(),
+            '$4': arguments.Empty(),
+            '$5': arguments.Any(),
+        })
+
+        plan = dereferencing_resolver.compile(operators_=iter(fixtures.FILTERS))
+        assert tuple(plan.resolve(arguments_)) == tuple(plan.resolve(arguments_)) == tuple(resolver.compile(fixtures.FILTERS).resolve(arguments_))
+        assert tuple(dereferencing_resolver.specialize_filters(operators_=iter(fixtures.FILTERS), arguments_=arguments_)) == tuple(fixtures.FILTERS)
+
+    def test_it_should_dereference_filters_many(self, resolver: Resolver):
+        arguments_iterable = [
+            self.Arguments({
+                'variable_1': arguments.Value(values=(index,)),
+                '$1': arguments.Empty(),
+                '$2': arguments.Any(),
+                '$3': arguments.Value(values=(f'tag-{index}', f'tag-{index + 1}')),
+                '$4': arguments.Value(values=(index, index + 100)),
+                '$5': arguments.Value(values=(index + 200, maxsize)),
+            })
+            for index in range(20)
+        ]
+        expected_results = [tuple(resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_)) for arguments_ in arguments_iterable]
+
+        results = resolver.dereference_filters_many(operators_=iter(fixtures.FILTERS), arguments_iterable=iter(arguments_iterable))
+        assert next(results) == expected_results[0]
+        assert list(results) == expected_results[1:]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = resolver.dereference_filters_many(fixtures.FILTERS, arguments_iterable, executor=executor, chunksize=3)
+            assert list(results) == expected_results
+
+            counting_executor = self.CountingExecutor(executor)
+            results = resolver.dereference_filters_many(fixtures.FILTERS, iter(arguments_iterable), executor=counting_executor, chunksize=2, window_size=3)
+            assert next(results) == expected_results[0]
+            assert counting_executor.submits_count == 3
+            assert list(results) == expected_results[1:]
+            assert counting_executor.submits_count == 10
+
+    def test_it_should_intern_filters(self):
+        resolver = Resolver(interner=core.interning.Interner())
+        arguments_ = self.Arguments({
+            'variable_1': arguments.Value(values=(567,)),
+            '$2': arguments.Any(),
+            '$3': arguments.Empty(),
+            '$4': arguments.Empty(),
+            '$5': arguments.Any(),
+        })
+        filters_1 = tuple(resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_))
+        filters_2 = tuple(resolver.dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_))
+        assert filters_1 == tuple(Resolver().dereference_filters(operators_=fixtures.FILTERS, arguments_=arguments_))
+        assert all(filter_1 is filter_2 for filter_1, filter_2 in zip(filters_1, filters_2))
+
+    def test_it_should_intern_nested_scalars_by_type(self):
+        resolver = Resolver(interner=core.interning.Interner())
+        field = core.fields.System('post-id')
+        operators_ = (operators.Return(cases=(core.filters.AnyLabel(labels=(
+            operators.Return(cases=(core.labels.Value(field=field, value=values.Variable(ref=values.Reference(alias='$1'), index=1)), )),
+        )), )), )
+        for value in (1, True, 1.0, True, 1):
+            filter_, = resolver.dereference_filters(operators_, self.Arguments({'$1': arguments.Value(values=(value, ))}))
+            assert type(filter_.labels[0].value) is type(value)
+
+    def test_it_should_specialize_filters(self, resolver: Resolver):
+        alias_to_argument_map = {
+            'variable_1': arguments.Value(values=(567,)),
+            '$1': arguments.Value(values=(567,)),
+            '$2': arguments.Any(),
+            '$3': arguments.Empty(),
+            '$4': arguments.Value(values=(100, 200)),
+            '$5': arguments.Value(values=(300, maxsize)),
+        }
+        site_aliases = {'variable_1', '$2', '$4'}
+        site_arguments = self.Arguments({alias: argument for alias, argument in alias_to_argument_map.items() if alias in site_aliases})
+        request_arguments = self.Arguments({alias: argument for alias, argument in alias_to_argument_map.items() if alias not in site_aliases})
+
+        operators_ = tuple(resolver.specialize_filters(operators_=iter(fixtures.FILTERS), arguments_=site_arguments))
+        assert len(operators_) == len(fixtures.FILTERS)
+        assert operators_[0] == fixtures.FILTERS[0]
+        assert operators_[1] == operators.Return(cases=(
+            core.filters.AnyLabel(labels=(
+                operators.Return(cases=(
+                    core.labels.Value(field=core.fields.System('post-regular-section'), value=values.Constant(567)),
+                )),
+            )),
+        ))
+        assert operators_[2] == operators.Return(cases=())
+        assert operators_[3] == fixtures.FILTERS[3]
+        assert tuple(resolver.dereference_filters(operators_, request_arguments)) == \
+            tuple(resolver.dereference_filters(fixtures.FILTERS, self.Arguments(alias_to_argument_map)))
+
+        assert tuple(resolver.specialize_filters(operators_=fixtures.FILTERS, arguments_=self.Arguments({}))) == fixtures.FILTERS
+        operators_ = tuple(resolver.specialize_filters(operators_=fixtures.FILTERS, arguments_=self.Arguments(alias_to_argument_map)))
+        assert not any(map(lambda operator_: isinstance(operator_, operators.Switch), operators_))
+        assert tuple(resolver.dereference_filters(operators_, self.Arguments({}))) == \
+            tuple(resolver.dereference_filters(fixtures.FILTERS, self.Arguments(alias_to_argument_map)))
+
+    def test_it_should_specialize_variables_of_unchosen_cases(self, resolver: Resolver):
+        label = core.labels.Value(field=core.fields.System('post-id'), value=values.Variable(ref=values.Reference(alias='$2'), index=1))
+        operators_ = (operators.Switch(ref=values.Reference(alias='$1'), cases={
+            arguments.Value: operators.Return(cases=(core.filters.AnyLabel(labels=(operators.Return(cases=(label, )), )), )),
+            arguments.Empty: operators.Return(cases=()),
+        }), )
+        for argument in (arguments.Empty(), arguments.Value(values=())):
+            specialized_operators = tuple(resolver.specialize_filters(operators_, self.Arguments({'$2': argument})))
+            assert specialized_operators == operators_
+            assert tuple(resolver.dereference_filters(specialized_operators, self.Arguments({'$1': arguments.Empty()}))) == \
+                tuple(resolver.dereference_filters(operators_, self.Arguments({'$1': arguments.Empty(), '$2': argument}))) == ()
+
+    class CountingExecutor(Executor):
+        def __init__(self, executor: Executor):
+            self.executor = executor
+            self.submits_count = 0
+
+        def submit(self, fn, /, *args, **kwargs):
+            self.submits_count += 1
+            return self.executor.submit(fn, *args, **kwargs)
+
+    class DereferencingResolver(IResolver):
+        def __init__(self, resolver: IResolver):
+            self.resolver = resolver
+
+        def dereference_filters(self, operators_, arguments_):
+            return self.resolver.dereference_filters(operators_, arguments_)
+
+        def dereference_filters_partially(self, operators_, arguments_):
+            return self.resolver.dereference_filters_partially(operators_, arguments_)
+
     class Arguments(Resolver.IArguments):
         def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
             self.alias_to_argument_map = alias_to_argument_map
@@ -179,3 +361,18 @@ class TestServerResolver:
                 return self.alias_to_argument_map[alias]
             except LookupError as e:
                 raise self.ArgumentNotFoundException(alias) from e
+
+    class DefaultingArguments(Arguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            super().__init__(alias_to_argument_map)
+            self.exceptions_count = 0
+
+        def get_argument(self, alias):
+            try:
+                return super().get_argument(alias)
+            except self.ArgumentNotFoundException:
+                self.exceptions_count += 1
+                raise
+
+        def get_argument_or(self, alias, default):
+            return self.alias_to_argument_map.get(alias, default)
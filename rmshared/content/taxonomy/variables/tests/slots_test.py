@@ -0,0 +1,83 @@
+from sys import maxsize
+from typing import Mapping
+
+from pytest import fixture
+from pytest import raises
+
+from rmshared.content.taxonomy.variables import arguments
+from rmshared.content.taxonomy.variables.abc import Argument
+from rmshared.content.taxonomy.variables.analyzer import Analyzer
+from rmshared.content.taxonomy.variables.resolver import Resolver
+from rmshared.content.taxonomy.variables.slots import SlottedPlan
+from rmshared.content.taxonomy.variables.tests import fixtures
+
+
+class TestSlottedPlan:
+    ALIAS_TO_ARGUMENT_MAP_1 = {
+        'variable_1': arguments.Empty(),
+        '$2': arguments.Value(values=tuple()),
+        '$3': arguments.Value(values=('tag-1', 'tag-2')),
+        '$4': arguments.Value(values=(100, 200)),
+        '$5': arguments.Value(values=(300, maxsize)),
+    }
+    ALIAS_TO_ARGUMENT_MAP_2 = {
+        'variable_1': arguments.Value(values=(567,)),
+        '$1': arguments.Value(values=(567,)),
+        '$2': arguments.Any(),
+        '$3': arguments.Empty(),
+        '$4': arguments.Empty(),
+        '$5': arguments.Any(),
+    }
+
+    @fixture
+    def plan(self) -> SlottedPlan:
+        return Resolver.compile_slotted(operators_=iter(fixtures.FILTERS))
+
+    def test_it_should_intern_aliases(self, plan: SlottedPlan):
+        assert sorted(plan.alias_to_slot_map.values()) == list(range(5))
+        assert set(plan.alias_to_slot_map.keys()) == {'variable_1', '$2', '$3', '$4', '$5'}
+
+    def test_it_should_resolve_filters(self, plan: SlottedPlan):
+        for alias_to_argument_map in (self.ALIAS_TO_ARGUMENT_MAP_1, self.ALIAS_TO_ARGUMENT_MAP_2):
+            arguments_ = plan.make_arguments(alias_to_argument_map)
+            expected_filters = tuple(Resolver().dereference_filters(fixtures.FILTERS, self.Arguments(alias_to_argument_map)))
+            assert tuple(plan.resolve(arguments_)) == expected_filters
+
+    def test_it_should_resolve_filters_with_other_arguments(self, plan: SlottedPlan):
+        for alias_to_argument_map in (self.ALIAS_TO_ARGUMENT_MAP_1, self.ALIAS_TO_ARGUMENT_MAP_2):
+            arguments_ = self.Arguments(alias_to_argument_map)
+            expected_filters = tuple(Resolver().dereference_filters(fixtures.FILTERS, arguments_))
+            assert tuple(plan.resolve(arguments_)) == expected_filters
+            other_plan_arguments = Resolver.compile_slotted(fixtures.FILTERS[::-1]).make_arguments(alias_to_argument_map)
+            assert tuple(plan.resolve(other_plan_arguments)) == expected_filters
+
+    def test_it_should_raise_for_missing_arguments(self, plan: SlottedPlan):
+        for missing_alias in ('$3', '$4'):
+            arguments_ = self.Arguments({alias: argument for alias, argument in self.ALIAS_TO_ARGUMENT_MAP_1.items() if alias != missing_alias})
+            with raises(Resolver.IArguments.ArgumentNotFoundException):
+                tuple(Resolver().dereference_filters(fixtures.FILTERS, arguments_))
+            with raises(Resolver.IArguments.ArgumentNotFoundException):
+                tuple(plan.resolve(arguments_))
+
+    def test_it_should_get_arguments(self, plan: SlottedPlan):
+        arguments_ = plan.make_arguments(self.ALIAS_TO_ARGUMENT_MAP_2)
+        assert arguments_.get_argument('$2') == arguments.Any()
+        assert arguments_.get_argument_or('$1', None) is None  # Not referenced by the operators
+        with raises(arguments_.ArgumentNotFoundException):
+            arguments_.get_argument('$6')
+
+    def test_it_should_validate_arguments_once(self, plan: SlottedPlan):
+        with raises(Analyzer.InvalidArgumentsException):
+            plan.make_arguments(dict(self.ALIAS_TO_ARGUMENT_MAP_1, **{'$3': arguments.Value(values=('tag-1',))}))
+        with raises(Analyzer.InvalidArgumentsException):
+            plan.make_arguments({alias: argument for alias, argument in self.ALIAS_TO_ARGUMENT_MAP_1.items() if alias != '$4'})
+
+    class Arguments(Resolver.IArguments):
+        def __init__(self, alias_to_argument_map: Mapping[str, Argument]):
+            self.alias_to_argument_map = alias_to_argument_map
+
+        def get_argument(self, alias):
+            try:
+                return self.alias_to_argument_map[alias]
+            except LookupError as e:
+                raise self.ArgumentNotFoundException(alias) from e
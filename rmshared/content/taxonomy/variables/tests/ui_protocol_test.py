@@ -1,3 +1,4 @@
+from orjson import orjson
 from pytest import fixture
 
 from rmshared.content.taxonomy import core
@@ -16,6 +17,23 @@ class TestUiProtocol:
         filters_ = tuple(map(protocol.make_filter, self.FILTERS_DATA))
         assert filters_ == fixtures.FILTERS
 
+    def test_it_should_decode_filters_with_fallback(self, protocol: core.protocols.IComposite):
+        decoder = core.protocols.Decoder.make_instance_for_ui(fallback=protocol)
+        assert tuple(decoder.make_filters(self.FILTERS_DATA)) == fixtures.FILTERS
+
+    def test_it_should_make_filters_with_cache(self):
+        cache = core.protocols.caching.Cache()
+        protocol = protocols.Factory.make_instance_for_ui(cache=cache).make_composite()
+        assert tuple(map(protocol.make_filter, self.FILTERS_DATA)) == fixtures.FILTERS
+        assert tuple(map(protocol.make_filter, self.FILTERS_DATA)) == fixtures.FILTERS
+        assert cache.hits >= cache.misses > 0
+
+    def test_it_should_dump_filters_once(self, protocol: core.protocols.IComposite):
+        dumper = protocols.Factory.make_instance_for_ui().make_dumper()
+        buf = orjson.dumps(list(map(protocol.jsonify_filter, fixtures.FILTERS)))
+        assert dumper.dumps_filters(fixtures.FILTERS) == dumper.dumps_filters(fixtures.FILTERS) == buf
+        assert dumper.hits == dumper.misses == len(fixtures.FILTERS)
+
     def test_it_should_jsonify_filters(self, protocol: core.protocols.IComposite):
         data = tuple(map(protocol.jsonify_filter, fixtures.FILTERS))
         assert data == self.FILTERS_DATA